@@ -0,0 +1,69 @@
+"""
+Compare cold and warm agent construction: a cold agent assumes the role, builds the boto3 session,
+the botocore Bedrock client and the tools, a warm agent reuses the process-wide ones.
+STS is replaced by a stub with a simulated round trip, nothing leaves the machine.
+
+Usage:
+    python benchmarks/bench_agent_factory.py [--sts-latency 0.15] [--repeat 20]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from common import best_of
+
+from core.aws import reset_shared_aws_session, setup_aws_conf
+from modules.weather.main import clear_shared_agent_resources, get_agent
+from modules.weather.prompts import SYSTEM_PROMPT
+
+
+class StubSts:
+    """STS client stand-in whose assume_role takes `latency` seconds"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def assume_role(self, **kwargs) -> dict:
+        time.sleep(self.latency)
+        return {
+            'Credentials': {
+                'AccessKeyId': 'ASIAEXAMPLEKEY0001',
+                'SecretAccessKey': 'secret',
+                'SessionToken': 'token',
+                'Expiration': datetime.now(timezone.utc) + timedelta(hours=1),
+            }
+        }
+
+
+def cold_agent():
+    reset_shared_aws_session()
+    clear_shared_agent_resources()
+    return get_agent(SYSTEM_PROMPT, quiet=True)
+
+
+def warm_agent():
+    return get_agent(SYSTEM_PROMPT, quiet=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sts-latency', type=float, default=0.15, help='simulated STS assume_role round trip in seconds')
+    parser.add_argument('--repeat', type=int, default=20, help='rounds per measurement')
+    args = parser.parse_args()
+
+    setup_aws_conf(assume_role='arn:aws:iam::123456789012:role/weather', region='eu-west-1',
+                   access_key_id='AKIAEXAMPLE', secret_access_key='secret')
+    with patch('core.aws.sts_client', return_value=StubSts(args.sts_latency)):
+        cold = best_of(cold_agent, repeat=args.repeat)
+        warm_agent()
+        warm = best_of(warm_agent, repeat=args.repeat)
+
+    print(f"{'':>6} {'ms/agent':>9}")
+    print(f"{'cold':>6} {cold * 1000:>9.2f}")
+    print(f"{'warm':>6} {warm * 1000:>9.2f}")
+    print(f"speedup {cold / warm:.1f}x (STS round trip {args.sts_latency * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare the single-pass columnar Open-Meteo decoder with the legacy per-row parser
+(wall time and retained memory).
+
+Usage:
+    python benchmarks/bench_decoder.py
+"""
+import tracemalloc
+from datetime import datetime
+
+from common import best_of, hourly_payload
+
+from modules.weather.models import (
+    TemperatureReading, HumidityReading, ApparentTemperatureReading,
+    PrecipitationReading, EvapotranspirationReading, SurfacePressureReading, MeteoData)
+from modules.weather.tools import parse_hourly_weather_data
+
+RANGES = [1, 7, 16, 92]
+
+
+def legacy_parse(data: dict) -> MeteoData:
+    """Per-row parser as it was before the columnar decoder (one list scan per value)"""
+    meteo = MeteoData(
+        temperature=[],
+        humidity=[],
+        apparent_temperature=[],
+        precipitation=[],
+        evapotranspiration=[],
+        surface_pressure=[]
+    )
+    for iso in data['hourly']['time']:
+        time = datetime.fromisoformat(iso)
+        meteo.temperature.append(TemperatureReading(
+            time=time,
+            value=data['hourly']['temperature_2m'][data['hourly']['time'].index(iso)]))
+        meteo.humidity.append(HumidityReading(
+            time=time,
+            value=data['hourly']['relative_humidity_2m'][data['hourly']['time'].index(iso)]))
+        meteo.apparent_temperature.append(ApparentTemperatureReading(
+            time=time,
+            value=data['hourly']['apparent_temperature'][data['hourly']['time'].index(iso)]))
+        meteo.precipitation.append(PrecipitationReading(
+            time=time,
+            value=data['hourly']['precipitation'][data['hourly']['time'].index(iso)]))
+        meteo.evapotranspiration.append(EvapotranspirationReading(
+            time=time,
+            value=data['hourly']['evapotranspiration'][data['hourly']['time'].index(iso)]))
+        meteo.surface_pressure.append(SurfacePressureReading(
+            time=time,
+            value=data['hourly']['surface_pressure'][data['hourly']['time'].index(iso)]))
+    return meteo
+
+
+def retained_bytes(func) -> int:
+    """Memory still held by the object returned by `func`"""
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    print(f"{'days':>5} {'rows':>6} {'legacy ms':>10} {'decoder ms':>11} {'speedup':>8} "
+          f"{'legacy KiB':>11} {'decoder KiB':>12} {'ratio':>6}")
+    for days in RANGES:
+        data = hourly_payload(days)
+        # The legacy parser predates the wind variables, both decode the same six
+        data['hourly'] = {key: values for key, values in data['hourly'].items() if not key.startswith('wind_')}
+        assert legacy_parse(data) == parse_hourly_weather_data(data).to_meteo_data()
+        legacy = best_of(lambda: legacy_parse(data))
+        decoder = best_of(lambda: parse_hourly_weather_data(data))
+        legacy_mem = retained_bytes(lambda: legacy_parse(data))
+        decoder_mem = retained_bytes(lambda: parse_hourly_weather_data(data))
+        print(f"{days:>5} {days * 24:>6} {legacy * 1000:>10.2f} {decoder * 1000:>11.2f} {legacy / decoder:>7.1f}x "
+              f"{legacy_mem / 1024:>11.1f} {decoder_mem / 1024:>12.1f} {legacy_mem / decoder_mem:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Throughput of the extreme weather detection (heat waves, tropical nights, heavy precipitation)
+on multi-year hourly series.
+
+Usage:
+    python benchmarks/bench_detection.py
+    python benchmarks/bench_detection.py --years 1 10 50
+"""
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from common import best_of
+
+from modules.weather.detection import detect_extreme_weather
+from modules.weather.models import ColumnarMeteoData
+
+
+def seasonal_data(years: int, seed: int = 0) -> ColumnarMeteoData:
+    """Synthetic hourly series with a yearly and a daily cycle, random anomalies and showers"""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(years * 365 * 24)
+    anomaly = np.repeat(rng.normal(0, 3, len(hours) // 24), 24)
+    temperature = (18 + 9 * np.sin((hours / 24 - 110) / 365 * 2 * np.pi)
+                   + 6 * np.sin((hours % 24 - 9) / 24 * 2 * np.pi) + anomaly).round(1)
+    precipitation = np.where(rng.random(len(hours)) < 0.03, rng.exponential(3, len(hours)), 0).round(1)
+    start = datetime(2000, 1, 1)
+    return ColumnarMeteoData(time=[start + timedelta(hours=int(hour)) for hour in hours], columns={
+        'temperature': temperature.tolist(),
+        'humidity': [60] * len(hours),
+        'apparent_temperature': temperature.tolist(),
+        'precipitation': precipitation.tolist(),
+        'evapotranspiration': [0.1] * len(hours),
+        'surface_pressure': [1013.0] * len(hours),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 5, 10, 30])
+    args = parser.parse_args()
+
+    print(f"{'years':>6} {'hours':>9} {'detect ms':>10} {'Mhours/s':>9} {'episodes':>40}")
+    for years in args.years:
+        data = seasonal_data(years)
+        report = detect_extreme_weather(data)
+        elapsed = best_of(lambda: detect_extreme_weather(data), repeat=5)
+        kinds = ', '.join(f"{kind} {count}" for kind, count in sorted(Counter(e.kind for e in report.episodes).items()))
+        print(f"{years:>6} {len(data):>9} {elapsed * 1000:>10.1f} {len(data) / elapsed / 1e6:>9.2f} {kinds:>40}")
+
+
+if __name__ == '__main__':
+    main()
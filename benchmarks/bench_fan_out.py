@@ -0,0 +1,112 @@
+"""
+Compare the single conversation of `forecast --days` with the fan-out mode (`forecast --fan-out`):
+total input/output tokens, number of model calls and wall time, against a scripted fake Bedrock.
+
+The single conversation follows the tool calls of a real run: current_time, get_hourly_weather_data
+for the whole range, then one file_write per report, every call carrying the whole conversation so far.
+Waits are simulated (see fake_bedrock.py) and divided by --speed, times are reported unscaled.
+
+Usage:
+    python benchmarks/bench_fan_out.py
+    python benchmarks/bench_fan_out.py --days 3 5 7 --report-tokens 1500 --speed 50
+"""
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from strands import Agent, tool
+from strands.handlers import null_callback_handler
+
+from common import hourly_payload
+from fake_bedrock import FakeBedrockModel
+
+from modules.weather.main import ai_fan_out
+from modules.weather.prompts import FORECAST_PROMPT, SYSTEM_PROMPT
+from modules.weather.tools import parse_hourly_weather_data
+
+START = date(2025, 7, 1)
+
+
+def report_text(tokens: int) -> str:
+    return ' '.join(['sunny'] * tokens)
+
+
+def single_script(days: int, report_tokens: int):
+    """Tool calls of the single conversation, one per assistant turn"""
+    files = [f"docs/forecast_{index}.md" for index in range(days)] + ['docs/index.md']
+
+    def script(messages: list[dict]) -> dict:
+        turn = sum(message['role'] == 'assistant' for message in messages)
+        if turn == 0:
+            return {'toolUse': {'name': 'current_time', 'input': {}}}
+        if turn == 1:
+            return {'toolUse': {'name': 'get_hourly_weather_data', 'input': {
+                'from_date': START.isoformat(), 'to_date': (START + timedelta(days=days - 1)).isoformat()}}}
+        if turn - 2 < len(files):
+            return {'toolUse': {'name': 'file_write', 'input': {
+                'path': files[turn - 2], 'content': report_text(report_tokens)}}}
+        return {'text': 'All the reports are saved in the docs folder.'}
+    return script
+
+
+def single_tools(days: int) -> list:
+    data = parse_hourly_weather_data(hourly_payload(days, start=START))
+
+    @tool
+    def current_time() -> str:
+        """Current date and time"""
+        return f"{START.isoformat()}T08:00:00+00:00"
+
+    @tool
+    def get_hourly_weather_data(from_date: date, to_date: date) -> str:
+        """Hourly weather data for a range"""
+        return str(data.encoded('columns'))
+
+    @tool
+    def file_write(path: str, content: str) -> str:
+        """Write a file"""
+        return f"File written: {path}"
+
+    return [current_time, get_hourly_weather_data, file_write]
+
+
+def run_single(days: int, report_tokens: int, speed: float) -> tuple[FakeBedrockModel, float]:
+    model = FakeBedrockModel(single_script(days, report_tokens), speed=speed)
+    agent = Agent(model=model, tools=single_tools(days), system_prompt=SYSTEM_PROMPT,
+                  callback_handler=null_callback_handler)
+    began = time.perf_counter()
+    agent(FORECAST_PROMPT.format(days=days))
+    return model, (time.perf_counter() - began) * speed
+
+
+def run_fan_out(days: int, report_tokens: int, speed: float) -> tuple[FakeBedrockModel, float]:
+    model = FakeBedrockModel(lambda messages: {'text': report_text(report_tokens)}, speed=speed)
+    data = parse_hourly_weather_data(hourly_payload(days, start=START))
+    with tempfile.TemporaryDirectory() as output, \
+            patch('modules.weather.tools.get_hourly_weather_data_tool', return_value=data):
+        usage = ai_fan_out(SYSTEM_PROMPT, days=days, output=Path(output), start=START, bedrock_model=model)
+    return model, usage.seconds * speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, nargs='+', default=[3, 5, 7])
+    parser.add_argument('--report-tokens', type=int, default=1500, help='output tokens of every report')
+    parser.add_argument('--speed', type=float, default=50, help='divide the simulated waits by this factor')
+    args = parser.parse_args()
+
+    print(f"{'days':>5} {'mode':>8} {'calls':>6} {'input tok':>10} {'output tok':>11} {'seconds':>8}")
+    for days in args.days:
+        single, single_seconds = run_single(days, args.report_tokens, args.speed)
+        fan_out, fan_out_seconds = run_fan_out(days, args.report_tokens, args.speed)
+        for mode, model, seconds in [('single', single, single_seconds), ('fan_out', fan_out, fan_out_seconds)]:
+            print(f"{days:>5} {mode:>8} {model.calls:>6} {model.input_tokens:>10} {model.output_tokens:>11} {seconds:>8.1f}")
+        print(f"{'':>5} {'savings':>8} {'':>6} {single.input_tokens / fan_out.input_tokens:>9.1f}x "
+              f"{'':>11} {single_seconds / fan_out_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
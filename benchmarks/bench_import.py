@@ -0,0 +1,68 @@
+"""
+Startup cost of the CLI: wall time of fresh interpreters running `cli.py` commands that stop before any work
+(`--help`), and the slowest imports reported by `python -X importtime`.
+
+Every run is a new process, so the time includes the interpreter start and every import the command triggers,
+what a cron-driven `check_weather` pays before it does anything. The same runs are part of bench_suite.py.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 10 --top 15 --command check_weather --help
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+
+from common import SRC_DIR, best_of
+
+# Command lines measured by default, run from src/ like the CLI
+COMMANDS = {
+    'cli_help': ['--help'],
+    'check_weather_help': ['check_weather', '--help'],
+    'forecast_help': ['forecast', '--help'],
+}
+
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)$')
+
+
+def run_cli(args: list[str], *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, 'cli.py', *args], cwd=SRC_DIR, capture_output=True, text=True,
+                          check=True)
+
+
+def startup_seconds(args: list[str], repeat: int = 5) -> float:
+    return best_of(lambda: run_cli(args), repeat=repeat)
+
+
+def slowest_imports(args: list[str], top: int = 20) -> list[tuple[str, float]]:
+    """Top-level packages by import time (seconds): the self time of all their modules, from `python -X importtime`"""
+    packages: dict[str, float] = {}
+    for line in run_cli(args, '-X', 'importtime').stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            package = match.group(2).split('.')[0]
+            packages[package] = packages.get(package, 0.0) + int(match.group(1)) / 1e6
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per command line, the best one is reported')
+    parser.add_argument('--top', type=int, default=10, help='slowest top-level imports shown per command line')
+    parser.add_argument('--command', nargs=argparse.REMAINDER, help='measure only this command line')
+    args = parser.parse_args()
+
+    commands = {' '.join(args.command): args.command} if args.command else COMMANDS
+    for name, command in commands.items():
+        began = time.perf_counter()
+        seconds = startup_seconds(command, args.repeat)
+        print(f"{name:<24} {seconds * 1000:>8.0f} ms  (cli.py {' '.join(command)})")
+        for package, package_seconds in slowest_imports(command, args.top):
+            print(f"    {package:<28} {package_seconds * 1000:>8.0f} ms")
+        print(f"    measured in {time.perf_counter() - began:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
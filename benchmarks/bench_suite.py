@@ -0,0 +1,277 @@
+"""
+Offline end-to-end benchmark suite: wall time, memory and tokens of the main flows, saved as JSON.
+
+Everything runs locally. A fake Open-Meteo server (fake_open_meteo.py) answers the weather requests,
+the MCP server runs as a subprocess against it, and a scripted FakeBedrockModel (fake_bedrock.py)
+replays the tool-use turns of a real run. Scenarios:
+
+    startup.*             fresh `cli.py ... --help` processes, the import cost of every command (see bench_import.py)
+    tool.hourly_cold      get_hourly_weather_data_tool for --days days with an empty forecast cache
+    tool.hourly_warm      the same range again, served by the forecast cache
+    mcp.hourly            get_hourly_weather_data through the shared MCP client session
+    forecast.single       `forecast`: ai() with current_time, get_hourly_weather_data and one file_write per report
+                          (writer tool profile, like the command)
+    forecast.fan_out      `forecast --fan-out`: ai_fan_out(), one tool-less agent call per report
+    check_weather         `check_weather`: ai_mcp() reading tomorrow's weather from the MCP server (weather tool profile)
+    check_weather.cached  the same question again, answered by the LLM response cache
+
+Every scenario runs --repeat times (median and min wall time), then once more under tracemalloc for the peak
+and the net growth of traced memory, all threads included. The caches of this process are emptied before each
+run unless the scenario is about them, the MCP server keeps its own for the whole suite. Model waits are simulated and divided by --speed: by default there are none,
+so the times measure this code and not a model. bench_tool_profiles.py compares the tool profiles.
+
+Usage:
+    make bench
+    make bench BENCH_BASE=abc1234
+    python benchmarks/bench_suite.py --output benchmarks/results/dev.json --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, NamedTuple
+from unittest.mock import patch
+
+from common import SRC_DIR
+from fake_bedrock import FakeBedrockModel
+from bench_import import COMMANDS, run_cli
+from fake_open_meteo import api_url, serve
+from load_mcp import free_port, start_mcp_server
+
+os.environ.setdefault('BYPASS_TOOL_CONSENT', 'true')
+
+from core.mcp_clients import mcp_clients
+from modules.weather.cache import setup_cache, utc_now
+from modules.weather.llm_cache import setup_llm_cache
+from modules.weather.main import ai, ai_fan_out, ai_mcp, clear_shared_agent_resources
+from modules.weather.prompts import FORECAST_PROMPT, SYSTEM_PROMPT
+from modules.weather.tools import get_hourly_weather_data_tool
+from settings import MY_LATITUDE, MY_LONGITUDE
+
+# Metrics compared by --compare, lower is better for all of them
+COMPARED = ['seconds_median', 'peak_kib', 'input_tokens', 'http_requests']
+
+
+class Scenario(NamedTuple):
+    name: str
+    run: Callable[[], dict]
+    prepare: Callable[[], None] = lambda: None
+
+
+class Upstream:
+    """Fake Open-Meteo server and MCP server shared by the scenarios"""
+
+    def __init__(self, latency: float, cache_dir: str):
+        self.weather = serve(latency=latency)
+        self.mcp_port = free_port()
+        self.mcp = start_mcp_server(self.mcp_port, api_url(self.weather), os.path.join(cache_dir, 'weather.sqlite3'))
+
+    @property
+    def mcp_url(self) -> str:
+        return f"http://127.0.0.1:{self.mcp_port}/mcp/"
+
+    @property
+    def requests(self) -> int:
+        return self.weather.RequestHandlerClass.requests
+
+    def close(self):
+        mcp_clients.close()
+        self.mcp.terminate()
+        self.mcp.wait()
+        self.weather.shutdown()
+
+
+def reset_caches():
+    setup_cache(path=':memory:')
+    setup_llm_cache(path=':memory:')
+    clear_shared_agent_resources()
+
+
+def model_counters(model: FakeBedrockModel) -> dict:
+    return {'model_calls': model.calls, 'input_tokens': model.input_tokens, 'output_tokens': model.output_tokens}
+
+
+def forecast_script(days: int, start: date, output: Path):
+    """Tool calls of a real `forecast` run, one per assistant turn"""
+    files = [output.joinpath(f"forecast_{index}.md") for index in range(days)] + [output.joinpath('index.md')]
+
+    def script(messages: list[dict]) -> dict:
+        turn = sum(message['role'] == 'assistant' for message in messages)
+        if turn == 0:
+            return {'toolUse': {'name': 'current_time', 'input': {}}}
+        if turn == 1:
+            return {'toolUse': {'name': 'get_hourly_weather_data', 'input': {
+                'from_date': start.isoformat(), 'to_date': (start + timedelta(days=days - 1)).isoformat()}}}
+        if turn - 2 < len(files):
+            return {'toolUse': {'name': 'file_write', 'input': {
+                'path': str(files[turn - 2]), 'content': ' '.join(['sunny'] * 300)}}}
+        return {'text': 'All the reports are saved in the docs folder.'}
+    return script
+
+
+def check_weather_script(tomorrow: date):
+    """Tool calls of a real `check_weather` run: tomorrow's hourly data, then the answer"""
+
+    def script(messages: list[dict]) -> dict:
+        if sum(message['role'] == 'assistant' for message in messages) == 0:
+            return {'toolUse': {'name': 'get_hourly_weather_data', 'input': {
+                'from_date': tomorrow.isoformat(), 'to_date': tomorrow.isoformat()}}}
+        return {'text': 'Tomorrow will be sunny, with a high of 28 degrees and no rain.'}
+    return script
+
+
+def startup(command: list[str]):
+    def run():
+        run_cli(command)
+        return {}
+    return run
+
+
+def scenarios(upstream: Upstream, days: int, speed: float, output: Path) -> list[Scenario]:
+    today = utc_now().date()
+    tomorrow = today + timedelta(days=1)
+    forecast_range = (today, today + timedelta(days=days - 1))
+    question = "What will the weather be like tomorrow?"
+
+    def hourly():
+        get_hourly_weather_data_tool(MY_LATITUDE, MY_LONGITUDE, *forecast_range)
+        return {}
+
+    def mcp_hourly():
+        tool = next(tool for tool in mcp_clients.list_tools(upstream.mcp_url) if tool.tool_name == 'get_hourly_weather_data')
+        result = mcp_clients.get_client(upstream.mcp_url).call_tool_sync(
+            'mcp-bench', tool.mcp_tool.name, {'from_date': forecast_range[0].isoformat(), 'to_date': forecast_range[1].isoformat()})
+        assert result['status'] == 'success', result
+        return {}
+
+    def forecast_single():
+        model = FakeBedrockModel(forecast_script(days, today, output), speed=speed)
+        ai(SYSTEM_PROMPT, FORECAST_PROMPT.format(days=days), bedrock_model=model, quiet=True, use_cache=False,
+           tool_profile='writer')
+        return model_counters(model)
+
+    def forecast_fan_out():
+        model = FakeBedrockModel(lambda messages: {'text': ' '.join(['sunny'] * 300)}, speed=speed)
+        ai_fan_out(SYSTEM_PROMPT, days=days, output=output, bedrock_model=model)
+        return model_counters(model)
+
+    def check_weather(use_cache: bool):
+        def run():
+            model = FakeBedrockModel(check_weather_script(tomorrow), speed=speed)
+            ai_mcp(SYSTEM_PROMPT, question, url=upstream.mcp_url, bedrock_model=model, quiet=True, use_cache=use_cache,
+                   tool_profile='weather')
+            return model_counters(model)
+        return run
+
+    return [
+        *(Scenario(f'startup.{name}', startup(command)) for name, command in COMMANDS.items()),
+        Scenario('tool.hourly_cold', hourly, prepare=reset_caches),
+        Scenario('tool.hourly_warm', hourly, prepare=hourly),
+        Scenario('mcp.hourly', mcp_hourly, prepare=mcp_hourly),
+        Scenario('forecast.single', forecast_single, prepare=reset_caches),
+        Scenario('forecast.fan_out', forecast_fan_out, prepare=reset_caches),
+        Scenario('check_weather', check_weather(use_cache=False), prepare=reset_caches),
+        Scenario('check_weather.cached', check_weather(use_cache=True), prepare=check_weather(use_cache=True)),
+    ]
+
+
+def measure(scenario: Scenario, upstream: Upstream, repeat: int) -> dict:
+    seconds = []
+    for _ in range(repeat):
+        scenario.prepare()
+        requests = upstream.requests
+        began = time.perf_counter()
+        counters = scenario.run()
+        seconds.append(time.perf_counter() - began)
+        counters['http_requests'] = upstream.requests - requests
+
+    scenario.prepare()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    scenario.run()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds_median': round(statistics.median(seconds), 6),
+        'seconds_min': round(min(seconds), 6),
+        'peak_kib': round((peak - before) / 1024, 1),
+        'net_kib': round((after - before) / 1024, 1),
+        **counters,
+    }
+
+
+def git_commit() -> str:
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=SRC_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f"{commit}-dirty" if git('status', '--porcelain', '--untracked-files=no') else commit
+
+
+def compare(current: dict, base: dict) -> str:
+    rows = [f"{'scenario':<26} {'metric':<16} {base['commit']:>14} {current['commit']:>14} {'change':>8}"]
+    for name, metrics in current['scenarios'].items():
+        for metric in COMPARED:
+            before = base['scenarios'].get(name, {}).get(metric)
+            after = metrics.get(metric)
+            if before is None or after is None:
+                continue
+            change = f"{(after - before) / before * 100:+.1f}%" if before else ''
+            rows.append(f"{name:<26} {metric:<16} {before:>14} {after:>14} {change:>8}")
+    return '\n'.join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=5, help='forecast days of the forecast and tool scenarios')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs of every scenario')
+    parser.add_argument('--speed', type=float, default=float('inf'), help='divide the simulated model waits by this factor')
+    parser.add_argument('--latency', type=float, default=0.0, help='fake Open-Meteo latency in seconds')
+    parser.add_argument('--only', nargs='+', help='run only the scenarios starting with these names')
+    parser.add_argument('--output', type=Path, help='write the results to this JSON file')
+    parser.add_argument('--compare', type=Path, help='JSON results of another commit to compare with')
+    args = parser.parse_args()
+
+    results = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'params': {'days': args.days, 'repeat': args.repeat, 'speed': None if math.isinf(args.speed) else args.speed,
+                   'latency': args.latency},
+        'scenarios': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        upstream = Upstream(args.latency, tmp)
+        try:
+            with patch('modules.weather.tools.WEATHER_API_URL', api_url(upstream.weather)):
+                for scenario in scenarios(upstream, args.days, args.speed, Path(tmp, 'docs')):
+                    if args.only and not scenario.name.startswith(tuple(args.only)):
+                        continue
+                    results['scenarios'][scenario.name] = metrics = measure(scenario, upstream, args.repeat)
+                    print(f"{scenario.name:<26} {metrics['seconds_median'] * 1000:>9.1f} ms "
+                          f"{metrics['peak_kib']:>9.1f} KiB peak {metrics.get('input_tokens', 0):>7} input tok "
+                          f"{metrics['http_requests']:>3} http", file=sys.stderr)
+        finally:
+            upstream.close()
+
+    text = json.dumps(results, indent=2, default=str)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+    if args.compare:
+        print(compare(results, json.loads(args.compare.read_text(encoding='utf-8'))))
+
+
+if __name__ == '__main__':
+    main()
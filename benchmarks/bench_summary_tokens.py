@@ -0,0 +1,40 @@
+"""
+Compare the LLM input of the FORECAST_PROMPT flow when the agent reads the hourly data
+or the daily summary (serialized size, estimated tokens and aggregation time).
+
+Tokens are estimated offline by splitting words, numbers and punctuation, which tracks
+the BPE tokenizers closely for JSON; use the ratios rather than the absolute values.
+
+Usage:
+    python benchmarks/bench_summary_tokens.py
+"""
+from datetime import date
+
+from common import best_of, estimate_tokens, hourly_payload
+
+from modules.weather.prompts import FORECAST_PROMPT, SYSTEM_PROMPT
+from modules.weather.summary import daily_summary
+from modules.weather.tools import parse_hourly_weather_data
+
+RANGES = [1, 3, 5, 7, 16]
+
+
+def main():
+    prompt_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(FORECAST_PROMPT)
+    print(f"prompt (system + FORECAST_PROMPT) ~{prompt_tokens} tokens\n")
+    print(f"{'days':>5} {'hourly KiB':>11} {'summary KiB':>12} {'hourly tok':>11} {'summary tok':>12} "
+          f"{'flow tok':>18} {'reduction':>10} {'summary ms':>11}")
+    for days in RANGES:
+        data = parse_hourly_weather_data(hourly_payload(days, start=date(2025, 7, 1)))
+        summary = daily_summary(data)
+        hourly_text, summary_text = str(data), str(summary)
+        hourly_tokens, summary_tokens = estimate_tokens(hourly_text), estimate_tokens(summary_text)
+        flow_hourly, flow_summary = prompt_tokens + hourly_tokens, prompt_tokens + summary_tokens
+        elapsed = best_of(lambda: daily_summary(data), repeat=5, number=10)
+        print(f"{days:>5} {len(hourly_text) / 1024:>11.1f} {len(summary_text) / 1024:>12.1f} "
+              f"{hourly_tokens:>11} {summary_tokens:>12} {f'{flow_hourly} -> {flow_summary}':>18} "
+              f"{flow_hourly / flow_summary:>9.1f}x {elapsed * 1000:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
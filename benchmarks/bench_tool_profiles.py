@@ -0,0 +1,118 @@
+"""
+Input tokens and agent turns of the `check_weather` and `forecast` flows with every tool profile (TOOL_PROFILES).
+
+The spec of every tool of the agent is sent on every model call, so a smaller profile saves its spec tokens
+once per turn. Offline (default) the flows replay the scripted turns of bench_suite.py against a FakeBedrockModel
+and the fake Open-Meteo server: the turns are the same for every profile and the difference is the tool specs alone.
+With --live the flows run on Bedrock (AWS credentials from the environment) and real Open-Meteo, which also shows
+the turns the model spends on tools the profile takes away (python_repl, think); the reports go to a temporary folder.
+
+A flow is skipped for the profiles missing a tool its script calls (the scripted forecast saves its reports with
+file_write).
+
+Usage:
+    python benchmarks/bench_tool_profiles.py
+    python benchmarks/bench_tool_profiles.py --live --days 3 --profiles full weather
+"""
+import argparse
+import json
+import os
+import tempfile
+from contextlib import chdir, nullcontext
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, NamedTuple
+from unittest.mock import patch
+
+from common import estimate_tokens
+from bench_suite import check_weather_script, forecast_script
+from fake_bedrock import FakeBedrockModel
+from fake_open_meteo import api_url, serve
+
+os.environ.setdefault('BYPASS_TOOL_CONSENT', 'true')
+
+from core.aws import setup_aws_conf
+from modules.weather.cache import setup_cache, utc_now
+from modules.weather.main import ai, clear_shared_agent_resources, get_agent
+from modules.weather.profiles import TOOL_PROFILES
+from modules.weather.prompts import FORECAST_PROMPT, SYSTEM_PROMPT
+from settings import (
+    AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_CREDENTIALS_REFRESH_MARGIN)
+
+
+class Flow(NamedTuple):
+    name: str
+    user_prompt: str
+    script: Callable[[list[dict]], dict]
+    tools: frozenset[str]
+
+
+def flows(days: int, output: Path) -> list[Flow]:
+    today = utc_now().date()
+    return [
+        Flow('check_weather', "What will the weather be like tomorrow?", check_weather_script(today + timedelta(days=1)),
+             frozenset({'get_hourly_weather_data'})),
+        Flow('forecast', FORECAST_PROMPT.format(days=days), forecast_script(days, today, output),
+             frozenset({'current_time', 'get_hourly_weather_data', 'file_write'})),
+    ]
+
+
+def tool_spec_tokens(profile: str) -> tuple[int, int]:
+    """Number of tools of the profile and estimated tokens of their specs, sent on every model call"""
+    agent = get_agent(SYSTEM_PROMPT, bedrock_model=FakeBedrockModel(lambda messages: {}), quiet=True, tool_profile=profile)
+    specs = agent.tool_registry.get_all_tool_specs()
+    return len(specs), estimate_tokens(json.dumps(specs))
+
+
+def run_flow(flow: Flow, profile: str, live: bool) -> dict:
+    setup_cache(path=':memory:')
+    model = None if live else FakeBedrockModel(flow.script, speed=float('inf'))
+    result = ai(SYSTEM_PROMPT, flow.user_prompt, bedrock_model=model, quiet=True, use_cache=False, tool_profile=profile)
+    return {
+        'turns': result.metrics.cycle_count,
+        'tool_calls': {name: metrics.call_count for name, metrics in result.metrics.tool_metrics.items()},
+        'input_tokens': result.metrics.accumulated_usage['inputTokens'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=5, help='forecast days of the forecast flow')
+    parser.add_argument('--profiles', nargs='+', choices=list(TOOL_PROFILES), default=list(TOOL_PROFILES))
+    parser.add_argument('--live', action='store_true', help='run on Bedrock and Open-Meteo instead of the fakes')
+    args = parser.parse_args()
+    if args.live:
+        setup_aws_conf(
+            assume_role=AWS_ASSUME_ROLE,
+            region=AWS_REGION,
+            profile_name=AWS_PROFILE_NAME,
+            access_key_id=AWS_ACCESS_KEY_ID,
+            secret_access_key=AWS_SECRET_ACCESS_KEY,
+            credentials_refresh_margin=AWS_CREDENTIALS_REFRESH_MARGIN
+        )
+
+    print(f"{'profile':<10} {'tools':>6} {'spec tok':>9}")
+    for profile in args.profiles:
+        tools, tokens = tool_spec_tokens(profile)
+        print(f"{profile:<10} {tools:>6} {tokens:>9}")
+
+    weather = None if args.live else serve()
+    with tempfile.TemporaryDirectory() as tmp, chdir(tmp), \
+            (nullcontext() if args.live else patch('modules.weather.tools.WEATHER_API_URL', api_url(weather))):
+        print(f"\n{'flow':<14} {'profile':<10} {'turns':>6} {'input tok':>10}  tool calls")
+        for flow in flows(args.days, Path(tmp, 'docs')):
+            for profile in args.profiles:
+                available = TOOL_PROFILES[profile].tools
+                if not args.live and available is not None and not flow.tools <= available:
+                    print(f"{flow.name:<14} {profile:<10} skipped, the script calls {', '.join(sorted(flow.tools - available))}")
+                    continue
+                clear_shared_agent_resources()
+                usage = run_flow(flow, profile, args.live)
+                calls = ', '.join(f"{name}={count}" for name, count in sorted(usage['tool_calls'].items()))
+                print(f"{flow.name:<14} {profile:<10} {usage['turns']:>6} {usage['input_tokens']:>10}  {calls}")
+    if weather is not None:
+        weather.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Shared helpers for the benchmark scripts"""
+import math
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent.joinpath('src')
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Offline token estimate: words, numbers and punctuation marks, close to BPE tokenizers on JSON and CSV
+TOKEN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(TOKEN.findall(text))
+
+
+def hourly_payload(days: int, start: date = date(2025, 7, 1)) -> dict:
+    """Build a synthetic Open-Meteo `hourly` response covering `days` days"""
+    return hourly_rows(datetime.combine(start, datetime.min.time()), days * 24)
+
+
+def hourly_rows(first: datetime, count: int) -> dict:
+    """Build a synthetic Open-Meteo `hourly` response with `count` hours starting at `first`"""
+    hours = range(count)
+    return {
+        'hourly': {
+            'time': [(first + timedelta(hours=h)).strftime('%Y-%m-%dT%H:%M') for h in hours],
+            'temperature_2m': [round(20 + 8 * math.sin(h / 24 * 2 * math.pi), 1) for h in hours],
+            'relative_humidity_2m': [60 + (h % 30) for h in hours],
+            'apparent_temperature': [round(21 + 9 * math.sin(h / 24 * 2 * math.pi), 1) for h in hours],
+            'precipitation': [round((h % 7) * 0.1, 1) for h in hours],
+            'evapotranspiration': [round((h % 12) * 0.05, 2) for h in hours],
+            'surface_pressure': [round(1013 + (h % 10) * 0.3, 1) for h in hours],
+            'wind_speed_10m': [round(10 + (h % 8) * 1.5, 1) for h in hours],
+            'wind_direction_10m': [h * 15 % 360 for h in hours],
+        }
+    }
+
+
+def best_of(func, repeat: int = 5, number: int = 1) -> float:
+    """Return the best wall time (seconds) per call of `func` over `repeat` rounds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
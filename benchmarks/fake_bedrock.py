@@ -0,0 +1,87 @@
+"""
+Offline stand-in for BedrockModel, for benchmarks of the agent flows.
+
+The model answers from a script and waits like a real model would: a time to first token,
+plus prefill time per input token and generation time per output token. Input tokens are
+estimated from the whole request (system prompt, tool specs and conversation), so the
+growth of a conversation shows in the token counts exactly as it would on Bedrock.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, Callable
+
+from strands.models import Model
+
+from common import estimate_tokens
+
+# Response of one model call: {'text': ...} or {'toolUse': {'name': ..., 'input': {...}}}
+Script = Callable[[list[dict]], dict]
+
+
+class FakeBedrockModel(Model):
+    """Scripted model with simulated latency, `speed` divides every wait"""
+
+    def __init__(self,
+                 script: Script,
+                 first_token: float = 0.6,
+                 prefill_rate: float = 8000,
+                 output_rate: float = 60,
+                 speed: float = 1.0):
+        self.script = script
+        self.first_token = first_token
+        self.prefill_rate = prefill_rate
+        self.output_rate = output_rate
+        self.speed = speed
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config: Any):
+        pass
+
+    def get_config(self) -> dict:
+        return {'model_id': 'fake'}
+
+    def latency(self, input_tokens: int, output_tokens: int) -> float:
+        return self.first_token + input_tokens / self.prefill_rate + output_tokens / self.output_rate
+
+    async def answer(self, messages, tool_specs=None, system_prompt=None) -> tuple[dict, int, int]:
+        """Scripted response to `messages` with its token counts, after the simulated latency"""
+        request = json.dumps({'system': system_prompt, 'tools': tool_specs, 'messages': messages}, default=str)
+        input_tokens = estimate_tokens(request)
+        response = self.script(messages)
+        output_tokens = estimate_tokens(json.dumps(response))
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+        await asyncio.sleep(self.latency(input_tokens, output_tokens) / self.speed)
+        return response, input_tokens, output_tokens
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        """Validate the scripted response with `output_model`: the input of a tool use or JSON text"""
+        response, _, _ = await self.answer(prompt, system_prompt=system_prompt)
+        data = response['toolUse']['input'] if 'toolUse' in response else json.loads(response['text'])
+        yield {'output': output_model.model_validate(data)}
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        response, input_tokens, output_tokens = await self.answer(messages, tool_specs, system_prompt)
+
+        yield {'messageStart': {'role': 'assistant'}}
+        if 'toolUse' in response:
+            tool_use = response['toolUse']
+            tool_use_id = f"tooluse_{sum(message['role'] == 'assistant' for message in messages)}"
+            yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': tool_use_id, 'name': tool_use['name']}}}}
+            yield {'contentBlockDelta': {'delta': {'toolUse': {'input': json.dumps(tool_use['input'])}}}}
+            yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use'}}
+        else:
+            yield {'contentBlockDelta': {'delta': {'text': response['text']}}}
+            yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'end_turn'}}
+        yield {'metadata': {
+            'usage': {'inputTokens': input_tokens, 'outputTokens': output_tokens,
+                      'totalTokens': input_tokens + output_tokens},
+            'metrics': {'latencyMs': int(self.latency(input_tokens, output_tokens) * 1000)}}}
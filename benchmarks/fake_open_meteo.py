@@ -0,0 +1,72 @@
+"""
+Local fake of the Open-Meteo forecast endpoint for offline benchmarks and load tests.
+
+Usage:
+    python benchmarks/fake_open_meteo.py --port 8999 --latency 0.05
+    WEATHER_API_URL=http://127.0.0.1:8999/v1/forecast python src/mcp_server.py
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from common import hourly_rows
+
+
+class FakeOpenMeteoHandler(BaseHTTPRequestHandler):
+    """Answers /v1/forecast with one synthetic row per requested hour after `latency` seconds"""
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    requests = 0
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        if 'start_hour' in params:
+            first = datetime.fromisoformat(params['start_hour'])
+            last = datetime.fromisoformat(params['end_hour'])
+        else:
+            first = datetime.fromisoformat(params['start_date'])
+            last = datetime.fromisoformat(params['end_date']) + timedelta(hours=23)
+        count = int((last - first) / timedelta(hours=1)) + 1
+        rows = hourly_rows(first, count)
+        rows['hourly'] = {key: rows['hourly'].get(key, [0.0] * count) for key in ['time', *params['hourly'].split(',')]}
+
+        locations = len(params['latitude'].split(','))
+        body = json.dumps(rows if locations == 1 else [rows] * locations).encode()
+        time.sleep(self.latency)
+        type(self).requests += 1
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Start the fake server in a daemon thread. Its URL is http://127.0.0.1:{server.server_port}/v1/forecast"""
+    handler = type('Handler', (FakeOpenMeteoHandler,), {'latency': latency, 'requests': 0})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def api_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_port}/v1/forecast"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8999)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    args = parser.parse_args()
+    fake = serve(args.port, args.latency)
+    print(f"Fake Open-Meteo listening on {api_url(fake)}")
+    threading.Event().wait()
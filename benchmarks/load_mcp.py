@@ -0,0 +1,107 @@
+"""
+Load test for the FastMCP weather server.
+
+Starts a fake Open-Meteo endpoint and the MCP server (streamable-http) on local ports, then drives
+N concurrent MCP clients calling `get_hourly_weather_data` and reports p50/p99 latency.
+Calls are sent as raw `tools/call` requests: the client-side JSON schema validation of the
+result is skipped, so the numbers reflect the server and not the load generator.
+
+Usage:
+    python benchmarks/load_mcp.py --clients 20 --requests 10 --latency 0.1
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from statistics import quantiles
+
+from common import SRC_DIR
+from fake_open_meteo import api_url, serve
+
+from fastmcp import Client
+from mcp import types
+
+SERVER = ("import sys, mcp_server; "
+          "mcp_server.mcp.run(transport='streamable-http', host='127.0.0.1', port=int(sys.argv[1]), path='/mcp', "
+          "show_banner=False, log_level='warning')")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"MCP server did not start on port {port}")
+
+
+def start_mcp_server(port: int, weather_api_url: str, cache_path: str) -> subprocess.Popen:
+    env = {**os.environ, 'WEATHER_API_URL': weather_api_url, 'WEATHER_CACHE_PATH': cache_path}
+    process = subprocess.Popen([sys.executable, '-c', SERVER, str(port)], cwd=SRC_DIR, env=env)
+    wait_for_port(port)
+    return process
+
+
+async def run_client(url: str, client_id: int, requests: int, distinct: bool) -> list[float]:
+    latencies = []
+    async with Client(url) as client:
+        for index in range(requests):
+            offset = client_id * requests + index if distinct else 0
+            from_date = date(2025, 1, 1) + timedelta(days=7 * offset)
+            request = types.ClientRequest(types.CallToolRequest(params=types.CallToolRequestParams(
+                name='get_hourly_weather_data',
+                arguments={'from_date': from_date.isoformat(), 'to_date': (from_date + timedelta(days=6)).isoformat()})))
+            start = time.perf_counter()
+            result = await client.session.send_request(request, types.CallToolResult)
+            latencies.append(time.perf_counter() - start)
+            assert not result.isError, result.content
+    return latencies
+
+
+async def load(url: str, clients: int, requests: int, distinct: bool) -> tuple[list[float], float]:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client(url, i, requests, distinct) for i in range(clients)))
+    return sorted(latency for result in results for latency in result), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=20, help='concurrent MCP clients')
+    parser.add_argument('--requests', type=int, default=10, help='tool calls per client')
+    parser.add_argument('--latency', type=float, default=0.1, help='fake Open-Meteo latency in seconds')
+    parser.add_argument('--cached', action='store_true', help='every client asks for the same range')
+    args = parser.parse_args()
+
+    fake = serve(latency=args.latency)
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_mcp_server(port, api_url(fake), os.path.join(tmp, 'weather.sqlite3'))
+        try:
+            latencies, elapsed = asyncio.run(
+                load(f"http://127.0.0.1:{port}/mcp/", args.clients, args.requests, not args.cached))
+        finally:
+            server.terminate()
+            server.wait()
+            fake.shutdown()
+
+    percentiles = quantiles(latencies, n=100, method='inclusive')
+    print(f"clients={args.clients} requests={len(latencies)} upstream_latency={args.latency * 1000:.0f}ms "
+          f"upstream_calls={fake.RequestHandlerClass.requests}")
+    print(f"p50={percentiles[49] * 1000:.1f}ms p99={percentiles[98] * 1000:.1f}ms "
+          f"max={latencies[-1] * 1000:.1f}ms throughput={len(latencies) / elapsed:.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,10 @@ import logging
 
 from commands import setup_commands
 from core.cli import cli
+from settings import TRACING, TRACE_EXPORTER, TRACE_PATH
 
 setup_commands(cli)
+cli.context_settings['default_map'] = {'trace': TRACING, 'trace_exporter': TRACE_EXPORTER, 'trace_path': TRACE_PATH}
 
 logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
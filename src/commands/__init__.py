@@ -1,7 +1,4 @@
-from .check_weather import run as check_weather
-from .forecast import run as forecast
-
-
 def setup_commands(cli):
-    cli.add_command(cmd=check_weather, name='check_weather')
-    cli.add_command(cmd=forecast, name='forecast')
+    cli.add_lazy_command('commands.check_weather:run', name='check_weather')
+    cli.add_lazy_command('commands.forecast:run', name='forecast')
+    cli.add_lazy_command('commands.forecast_batch:run', name='forecast_batch')
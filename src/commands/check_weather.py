@@ -1,26 +1,43 @@
 import logging
+import time
 
 import click
 
 from core.aws import setup_aws_conf
-from modules.weather.main import ai, ai_mcp
+from modules.weather.main import ai_mcp
+from modules.weather.profiles import TOOL_PROFILES
 from modules.weather.prompts import SYSTEM_PROMPT
-from settings import AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY
+from settings import (
+    AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_CREDENTIALS_REFRESH_MARGIN,
+    LLM_CACHE)
 
 logger = logging.getLogger(__name__)
 
 
 @click.command()
-def run():
+@click.option('--interval', default=0, type=click.IntRange(min=0),
+              help='keep running and check again every INTERVAL seconds (0 checks once)')
+@click.option('--cache/--no-cache', default=LLM_CACHE,
+              help='answer from the LLM response cache when the question and the weather data are unchanged')
+@click.option('--tool-profile', default='weather', type=click.Choice(list(TOOL_PROFILES)),
+              help='tools given to the agent (weather: the weather tools and current_time)')
+def run(interval, cache, tool_profile):
     setup_aws_conf(
         assume_role=AWS_ASSUME_ROLE,
         region=AWS_REGION,
         profile_name=AWS_PROFILE_NAME,
         access_key_id=AWS_ACCESS_KEY_ID,
-        secret_access_key=AWS_SECRET_ACCESS_KEY
+        secret_access_key=AWS_SECRET_ACCESS_KEY,
+        credentials_refresh_margin=AWS_CREDENTIALS_REFRESH_MARGIN
     )
-    logger.info(f"Check agent weather.")
+    while True:
+        logger.info(f"Check agent weather.")
 
-    _ = ai_mcp(
-        system_prompt=SYSTEM_PROMPT,
-        user_prompt="What will the weather be like tomorrow?")
+        _ = ai_mcp(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt="What will the weather be like tomorrow?",
+            use_cache=cache,
+            tool_profile=tool_profile)
+        if not interval:
+            break
+        time.sleep(interval)
@@ -1,28 +1,70 @@
 import logging
+import time
+from pathlib import Path
 
 import click
 
 from core.aws import setup_aws_conf
-from modules.weather.main import ai
-from modules.weather.prompts import FORECAST_PROMPT, SYSTEM_PROMPT
-from settings import AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY
+from modules.weather.main import ai, ai_fan_out, ai_stream
+from modules.weather.profiles import TOOL_PROFILES
+from modules.weather.prompts import FORECAST_PROMPT, FORECAST_STREAM_PROMPT, SYSTEM_PROMPT
+from modules.weather.streaming import ReportWriter
+from modules.weather.usage import CacheUsageHandler, CallUsage, RunUsage
+from settings import (
+    AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_CREDENTIALS_REFRESH_MARGIN)
 
 logger = logging.getLogger(__name__)
 
 
 @click.command()
 @click.option('--days', required=True, default=5, type=int, help='forecast days to process')
-def run(days):
+@click.option('--stream/--no-stream', default=False,
+              help='print the answer as it is generated and write each report to --output as soon as it is complete')
+@click.option('--fan-out/--no-fan-out', default=False,
+              help='write each report with its own agent call, all in parallel, and report the token usage')
+@click.option('--output', default='docs', type=click.Path(file_okay=False), help='folder for the streamed or fanned out reports')
+@click.option('--tool-profile', type=click.Choice(list(TOOL_PROFILES)),
+              help='tools given to the agent [default: writer, weather with --stream, none with --fan-out]')
+def run(days, stream, fan_out, output, tool_profile):
+    if stream and fan_out:
+        raise click.UsageError('--stream and --fan-out cannot be combined')
+    if fan_out and tool_profile:
+        raise click.UsageError('--fan-out agents have no tools, --tool-profile does not apply')
     setup_aws_conf(
         assume_role=AWS_ASSUME_ROLE,
         region=AWS_REGION,
         profile_name=AWS_PROFILE_NAME,
         access_key_id=AWS_ACCESS_KEY_ID,
-        secret_access_key=AWS_SECRET_ACCESS_KEY
+        secret_access_key=AWS_SECRET_ACCESS_KEY,
+        credentials_refresh_margin=AWS_CREDENTIALS_REFRESH_MARGIN
     )
     logger.info(f"Processing weather for the next {days} days.")
 
+    if fan_out:
+        usage = ai_fan_out(system_prompt=SYSTEM_PROMPT, days=days, output=Path(output))
+        print(usage.table())
+        return
+
+    cache_usage = CacheUsageHandler()
+    began = time.perf_counter()
+    if stream:
+        response = ai_stream(
+            system_prompt=SYSTEM_PROMPT,
+            user_prompt=FORECAST_STREAM_PROMPT.format(days=days),
+            writer=ReportWriter(Path(output)),
+            cache_usage=cache_usage,
+            tool_profile=tool_profile or 'weather', )
+        seconds = time.perf_counter() - began
+        print(RunUsage(mode='stream', calls=[CallUsage.from_result('forecast', response, seconds, cache_usage)],
+                       seconds=seconds).table())
+        return
+
     response = ai(
         system_prompt=SYSTEM_PROMPT,
-        user_prompt=FORECAST_PROMPT.format(days=days), )
+        user_prompt=FORECAST_PROMPT.format(days=days),
+        cache_usage=cache_usage,
+        tool_profile=tool_profile or 'writer', )
+    seconds = time.perf_counter() - began
     print(response)
+    print(RunUsage(mode='single', calls=[CallUsage.from_result('forecast', response, seconds, cache_usage)],
+                   seconds=seconds).table())
@@ -0,0 +1,47 @@
+import logging
+from functools import partial
+
+import click
+
+from core.aws import setup_aws_conf
+from modules.weather.batch import forecast_site, forecast_sites, prefetch_weather, read_locations
+from modules.weather.main import get_shared_bedrock_model
+from modules.weather.profiles import TOOL_PROFILES
+from settings import (
+    AWS_ASSUME_ROLE, AWS_REGION, AWS_PROFILE_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_CREDENTIALS_REFRESH_MARGIN)
+
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--locations', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='CSV file with name, latitude and longitude columns')
+@click.option('--days', default=5, type=int, help='forecast days to process')
+@click.option('--concurrency', default=10, type=click.IntRange(min=1), help='sites processed at the same time')
+@click.option('--output', default='docs/sites', type=click.Path(file_okay=False), help='folder for the reports')
+@click.option('--tool-profile', default='weather', type=click.Choice(list(TOOL_PROFILES)),
+              help='tools given to the agent of every site (weather: the weather tools and current_time)')
+def run(locations, days, concurrency, output, tool_profile):
+    setup_aws_conf(
+        assume_role=AWS_ASSUME_ROLE,
+        region=AWS_REGION,
+        profile_name=AWS_PROFILE_NAME,
+        access_key_id=AWS_ACCESS_KEY_ID,
+        secret_access_key=AWS_SECRET_ACCESS_KEY,
+        credentials_refresh_margin=AWS_CREDENTIALS_REFRESH_MARGIN
+    )
+    sites = read_locations(locations)
+    logger.info(f"Processing weather for {len(sites)} sites and the next {days} days ({concurrency} at a time).")
+
+    prefetch_weather(sites, days)
+    bedrock_model = get_shared_bedrock_model(max_pool_connections=concurrency)
+    results = forecast_sites(
+        sites,
+        forecast=partial(forecast_site, days=days, bedrock_model=bedrock_model, tool_profile=tool_profile),
+        output=output,
+        concurrency=concurrency)
+
+    failed = [location for location, result in results.items() if isinstance(result, Exception)]
+    print(f"{len(results) - len(failed)} reports written to {output}, {len(failed)} failed.")
+    if failed:
+        raise SystemExit(1)
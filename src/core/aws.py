@@ -1,6 +1,16 @@
+import logging
+import threading
+from datetime import datetime, timezone
+
 import boto3
+import botocore.session
+from botocore.credentials import CredentialProvider, RefreshableCredentials
+from opentelemetry import trace
 from pydantic import BaseModel, ConfigDict
 
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
 
 class Conf(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -10,6 +20,7 @@ class Conf(BaseModel):
     AWS_PROFILE_NAME: str = None
     AWS_ACCESS_KEY_ID: str = None
     AWS_SECRET_ACCESS_KEY: str = None
+    AWS_CREDENTIALS_REFRESH_MARGIN: int = 300
     session: boto3.Session = None
 
 
@@ -17,7 +28,8 @@ def get_aws_conf(assume_role=None,
                  region=None,
                  profile_name=None,
                  access_key_id=None,
-                 secret_access_key=None):
+                 secret_access_key=None,
+                 credentials_refresh_margin=None):
     aws_conf = Conf()
     if assume_role is not None:
         aws_conf.AWS_ASSUME_ROLE = assume_role
@@ -29,6 +41,8 @@ def get_aws_conf(assume_role=None,
         aws_conf.AWS_ACCESS_KEY_ID = access_key_id
     if secret_access_key is not None:
         aws_conf.AWS_SECRET_ACCESS_KEY = secret_access_key
+    if credentials_refresh_margin is not None:
+        aws_conf.AWS_CREDENTIALS_REFRESH_MARGIN = credentials_refresh_margin
     return aws_conf
 
 
@@ -36,7 +50,8 @@ def setup_aws_conf(assume_role=None,
                    region=None,
                    profile_name=None,
                    access_key_id=None,
-                   secret_access_key=None):
+                   secret_access_key=None,
+                   credentials_refresh_margin=None):
     if assume_role is not None:
         conf.AWS_ASSUME_ROLE = assume_role
     if region is not None:
@@ -47,22 +62,142 @@ def setup_aws_conf(assume_role=None,
         conf.AWS_ACCESS_KEY_ID = access_key_id
     if secret_access_key is not None:
         conf.AWS_SECRET_ACCESS_KEY = secret_access_key
+    if credentials_refresh_margin is not None:
+        conf.AWS_CREDENTIALS_REFRESH_MARGIN = credentials_refresh_margin
+    reset_shared_aws_session()
+
+
+def sts_client(aws_conf=None):
+    aws_conf = conf if aws_conf is None else aws_conf
+    return boto3.client('sts',
+                        aws_access_key_id=aws_conf.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=aws_conf.AWS_SECRET_ACCESS_KEY)
+
+
+class AssumeRoleCredentialProvider(CredentialProvider):
+    """
+    Auto-refreshing credentials for an assumed role.
+    Notes:
+        - A botocore credential provider: sessions get it in front of their credential chain (see get_aws_session)
+          and `load()` hands them the shared RefreshableCredentials.
+        - The role is assumed once, then a daemon thread assumes it again `refresh_margin` seconds before
+          the credentials expire (never sooner than half their lifetime), so STS stays off the request path.
+        - botocore swaps the prefetched credentials in `refresh_margin / 2` seconds before expiry, it only
+          calls STS itself when the background refresh has not delivered them yet.
+        - Thread-safe: botocore serializes the refreshes and the prefetched credentials are guarded by a lock.
+    """
+
+    METHOD = 'assume-role-refreshing'
+    CANONICAL_NAME = 'AssumeRoleRefreshing'
+    RETRY_DELAY = 30
+
+    def __init__(self,
+                 role_arn: str,
+                 sts_client,
+                 refresh_margin: int = 300,
+                 role_session_name: str = 'AssumeRoleSession'):
+        super().__init__()
+        self.role_arn = role_arn
+        self.sts_client = sts_client
+        self.refresh_margin = refresh_margin
+        self.role_session_name = role_session_name
+        self.assumed = 0
+        self._credentials: RefreshableCredentials | None = None
+        self._prefetched: dict | None = None
+        self._expiry: datetime | None = None
+        self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _assume_role(self) -> dict:
+        with tracer.start_as_current_span('aws.sts.assume_role'):
+            response = self.sts_client.assume_role(
+                RoleArn=self.role_arn,
+                RoleSessionName=self.role_session_name)['Credentials']
+        with self._lock:
+            self.assumed += 1
+            self._expiry = response['Expiration'] if self._expiry is None else max(self._expiry, response['Expiration'])
+        return {
+            'access_key': response['AccessKeyId'],
+            'secret_key': response['SecretAccessKey'],
+            'token': response['SessionToken'],
+            'expiry_time': response['Expiration'].isoformat(),
+        }
+
+    def _refresh(self) -> dict:
+        with self._lock:
+            metadata, self._prefetched = self._prefetched, None
+        if metadata is None:
+            logger.warning(f"[AssumeRoleCredentialProvider] No prefetched credentials for {self.role_arn}, calling STS.")
+            metadata = self._assume_role()
+        return metadata
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                remaining = (self._expiry - datetime.now(timezone.utc)).total_seconds()
+            if self._stop.wait(max(remaining - self.refresh_margin, remaining / 2, 0)):
+                break
+            try:
+                metadata = self._assume_role()
+            except Exception as e:
+                logger.warning(f"[AssumeRoleCredentialProvider] Background refresh of {self.role_arn} failed: {e}")
+                self._stop.wait(self.RETRY_DELAY)
+                continue
+            with self._lock:
+                self._prefetched = metadata
+            logger.debug(f"[AssumeRoleCredentialProvider] Prefetched credentials for {self.role_arn} "
+                         f"expiring at {metadata['expiry_time']}.")
+
+    def get_credentials(self) -> RefreshableCredentials:
+        if self._credentials is None:
+            with self._init_lock:
+                if self._credentials is None:
+                    self._credentials = RefreshableCredentials.create_from_metadata(
+                        self._assume_role(),
+                        refresh_using=self._refresh,
+                        method='assume-role',
+                        advisory_timeout=self.refresh_margin / 2,
+                        mandatory_timeout=self.refresh_margin / 4)
+                    self._thread = threading.Thread(
+                        target=self._run, name='aws-credentials-refresh', daemon=True)
+                    self._thread.start()
+        return self._credentials
+
+    def load(self) -> RefreshableCredentials:
+        return self.get_credentials()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_providers: dict[tuple, AssumeRoleCredentialProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_credential_provider(aws_conf=None) -> AssumeRoleCredentialProvider:
+    """Process-wide credential provider for the role (and root credentials) of `aws_conf`"""
+    aws_conf = conf if aws_conf is None else aws_conf
+    key = (aws_conf.AWS_ASSUME_ROLE, aws_conf.AWS_ACCESS_KEY_ID, aws_conf.AWS_SECRET_ACCESS_KEY,
+           aws_conf.AWS_CREDENTIALS_REFRESH_MARGIN)
+    with _providers_lock:
+        if key not in _providers:
+            _providers[key] = AssumeRoleCredentialProvider(
+                aws_conf.AWS_ASSUME_ROLE, sts_client(aws_conf), refresh_margin=aws_conf.AWS_CREDENTIALS_REFRESH_MARGIN)
+        return _providers[key]
 
 
+@tracer.start_as_current_span('aws.session')
 def get_aws_session(aws_conf=None) -> boto3.Session:
     aws_conf = conf if aws_conf is None else aws_conf
     if aws_conf.AWS_ASSUME_ROLE:
-        session_root_account = boto3.client('sts',
-                                            aws_access_key_id=aws_conf.AWS_ACCESS_KEY_ID,
-                                            aws_secret_access_key=aws_conf.AWS_SECRET_ACCESS_KEY)
-        assume_role_response = session_root_account.assume_role(
-            RoleArn=aws_conf.AWS_ASSUME_ROLE,
-            RoleSessionName='AssumeRoleSession')['Credentials']
-
-        session = boto3.Session(aws_access_key_id=assume_role_response['AccessKeyId'],
-                                aws_secret_access_key=assume_role_response['SecretAccessKey'],
-                                aws_session_token=assume_role_response['SessionToken'],
-                                region_name=aws_conf.AWS_REGION)
+        botocore_session = botocore.session.get_session()
+        botocore_session.get_component('credential_provider').insert_before(
+            'env', get_credential_provider(aws_conf))
+        session = boto3.Session(botocore_session=botocore_session, region_name=aws_conf.AWS_REGION)
     elif aws_conf.AWS_PROFILE_NAME:
         session = boto3.Session(profile_name=aws_conf.AWS_PROFILE_NAME, region_name=aws_conf.AWS_REGION)
     else:
@@ -80,6 +215,36 @@ def get_conf():
     return conf
 
 
+_shared_session: boto3.Session | None = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_aws_session() -> boto3.Session:
+    """
+    Process-wide session for `conf`, built once and reused by every caller.
+    Notes:
+        - Assumed-role credentials refresh themselves, see AssumeRoleCredentialProvider.
+        - `setup_aws_conf` drops the shared session, callers holding clients of the previous one should rebuild them.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = get_aws_session(conf)
+        return _shared_session
+
+
+def reset_shared_aws_session():
+    """Drop the shared session and stop the background refresh of every credential provider"""
+    global _shared_session
+    with _shared_session_lock:
+        _shared_session = None
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for provider in providers:
+        provider.stop()
+
+
 def aws_get_service(service_name, aws_conf=None):
     session = get_aws_session(conf if aws_conf is None else aws_conf)
     return session.client(service_name)
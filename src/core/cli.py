@@ -1,6 +1,58 @@
+import importlib
+
 import click
 
 
-@click.group()
-def cli():
-    pass
+class LazyGroup(click.Group):
+    """
+    Click group importing the module of a command only when that command is invoked.
+    Notes:
+        - Commands are registered with `add_lazy_command` as 'module:attribute' import paths.
+        - The command list of `--help` is built from the registered names, without importing any command.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: dict[str, str] = {}
+
+    def add_lazy_command(self, import_path: str, name: str):
+        self.lazy_commands[name] = import_path
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module, attribute = self.lazy_commands[cmd_name].split(':')
+            self.add_command(getattr(importlib.import_module(module), attribute), name=cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter):
+        rows = [(name, self.commands[name].get_short_help_str() if name in self.commands else '')
+                for name in self.list_commands(ctx)]
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+
+# The application sets the defaults of the tracing options with `context_settings['default_map']`
+@click.group(cls=LazyGroup)
+@click.option('--trace/--no-trace', default=False,
+              help='trace the command and print where the time and the tokens went when it ends')
+@click.option('--trace-exporter', default='none', type=click.Choice(['none', 'console', 'file']),
+              help='also export the spans: none, console (stdout) or file (JSON lines appended to --trace-path)')
+@click.option('--trace-path', default=None, type=click.Path(dir_okay=False), help='file of the file exporter')
+@click.pass_context
+def cli(ctx, trace, trace_exporter, trace_path):
+    if not trace:
+        return
+    from core.tracing import flush_tracing, setup_tracing, tracer
+    summary = setup_tracing(trace_exporter, trace_path)
+
+    def print_summary():
+        flush_tracing()
+        if len(summary.rows()) > 1:
+            print(summary.table())
+
+    ctx.call_on_close(print_summary)
+    ctx.with_resource(tracer.start_as_current_span(ctx.invoked_subcommand))
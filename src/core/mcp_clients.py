@@ -0,0 +1,134 @@
+import atexit
+import logging
+import threading
+from typing import Callable
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import ServerNotification, ToolListChangedNotification
+from opentelemetry import trace
+from strands.tools.mcp import MCPAgentTool, MCPTransport
+from strands.tools.mcp.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class NotifyingMCPClient(MCPClient):
+    """
+    MCPClient that forwards server notifications to `on_notification`.
+    Notes:
+        - strands does not expose the ClientSession message handler, the background coroutine is MCPClient's
+          one with the handler plugged in.
+        - `on_notification` runs on the background event loop, it must not block.
+    """
+
+    def __init__(self, transport_callable: Callable[[], MCPTransport],
+                 on_notification: Callable[[ServerNotification], None]):
+        super().__init__(transport_callable)
+        self._on_notification = on_notification
+
+    async def _message_handler(self, message) -> None:
+        if isinstance(message, ServerNotification):
+            self._on_notification(message)
+
+    async def _async_background_thread(self) -> None:
+        try:
+            async with self._transport_callable() as (read_stream, write_stream, *_):
+                async with ClientSession(read_stream, write_stream, message_handler=self._message_handler) as session:
+                    await session.initialize()
+                    self._background_thread_session = session
+                    self._init_future.set_result(None)
+                    await self._close_event.wait()
+        except Exception as e:
+            if not self._init_future.done():
+                self._init_future.set_exception(e)
+            else:
+                logger.warning(f"[NotifyingMCPClient] MCP session closed: {e}")
+
+    def is_active(self) -> bool:
+        return self._is_session_active()
+
+
+def streamable_http_transport(url: str) -> Callable[[], MCPTransport]:
+    return lambda: streamablehttp_client(url)
+
+
+class MCPClientManager:
+    """
+    Long-lived MCP client sessions shared by every agent of the process, one per server URL.
+    Notes:
+        - The handshake runs once per URL, later calls reuse the open session.
+        - The tool listing is cached and dropped when the server sends notifications/tools/list_changed.
+        - A session whose background thread has died is opened again on next use.
+    """
+
+    def __init__(self, transport_factory: Callable[[str], Callable[[], MCPTransport]] = streamable_http_transport):
+        self.transport_factory = transport_factory
+        self.handshakes = 0
+        self.tool_listings = 0
+        self._clients: dict[str, NotifyingMCPClient] = {}
+        self._tools: dict[str, list[MCPAgentTool]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._tools_lock = threading.Lock()
+
+    def get_client(self, url: str) -> MCPClient:
+        with self._lock:
+            client = self._clients.get(url)
+            if client is None or not client.is_active():
+                self._invalidate(url)
+                client = NotifyingMCPClient(
+                    self.transport_factory(url),
+                    on_notification=lambda notification: self._on_notification(url, notification))
+                with tracer.start_as_current_span('mcp.connect', attributes={'url.full': url}):
+                    client.start()
+                self._clients[url] = client
+                self.handshakes += 1
+                logger.info(f"[MCPClientManager] Connected to {url}.")
+            return client
+
+    def list_tools(self, url: str) -> list[MCPAgentTool]:
+        client = self.get_client(url)
+        with self._tools_lock:
+            tools = self._tools.get(url)
+            generation = self._generations.get(url, 0)
+        if tools is None:
+            with tracer.start_as_current_span('mcp.list_tools', attributes={'url.full': url}):
+                tools = client.list_tools_sync()
+            with self._tools_lock:
+                self.tool_listings += 1
+                if self._generations.get(url, 0) == generation:
+                    self._tools[url] = tools
+            logger.info(f"[MCPClientManager] Available MCP tools: {[tool.tool_name for tool in tools]}")
+        return list(tools)
+
+    def _invalidate(self, url: str):
+        with self._tools_lock:
+            self._tools.pop(url, None)
+            self._generations[url] = self._generations.get(url, 0) + 1
+
+    def _on_notification(self, url: str, notification: ServerNotification):
+        if isinstance(notification.root, ToolListChangedNotification):
+            logger.info(f"[MCPClientManager] Tool list of {url} changed.")
+            self._invalidate(url)
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for url, client in clients.items():
+            self._invalidate(url)
+            if client.is_active():
+                client.stop(None, None, None)
+
+    def stats(self) -> dict:
+        with self._tools_lock:
+            return {
+                'sessions': len(self._clients),
+                'handshakes': self.handshakes,
+                'tool_listings': self.tool_listings,
+            }
+
+
+mcp_clients = MCPClientManager()
+atexit.register(mcp_clients.close)
@@ -0,0 +1,186 @@
+import logging
+import re
+import threading
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+from opentelemetry import context, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Spans of this project, strands adds its own (agent, cycles, model calls and tool calls) to the same traces
+tracer = trace.get_tracer('ai_weather')
+
+# Parts of span names that change on every call, e.g. the event loop cycle id of "Cycle 1b2c..."
+VOLATILE = re.compile(r'^(Cycle) \S+$')
+
+
+class SpanRecord(BaseModel):
+    span_id: int
+    parent_id: int | None
+    name: str
+    start: int
+    end: int
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @classmethod
+    def from_span(cls, span: ReadableSpan) -> 'SpanRecord':
+        attributes = span.attributes or {}
+        return cls(
+            span_id=span.context.span_id,
+            parent_id=span.parent.span_id if span.parent else None,
+            name=VOLATILE.sub(r'\1', span.name),
+            start=span.start_time,
+            end=span.end_time,
+            input_tokens=attributes.get('gen_ai.usage.input_tokens', 0),
+            output_tokens=attributes.get('gen_ai.usage.output_tokens', 0))
+
+
+class SpanRow(BaseModel):
+    """Spans with the same path of names from the root, added up"""
+    path: tuple[str, ...]
+    first_start: int
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class SpanSummary(SpanProcessor):
+    """
+    Span processor keeping every finished span of the process, for the summary table printed by the CLI.
+    Notes:
+        - Spans are grouped by their path of names from the root span, so the table nests like the traces.
+        - A span named like its parent (strands recursive event loop cycles) is merged into the parent's row.
+        - Token counts come from the gen_ai.usage.* attributes strands sets on agent and model spans.
+        - strands does not make its tool spans current, spans started inside a tool (Open-Meteo requests, parsing)
+          nest under the enclosing span of this project instead, e.g. the command.
+    """
+
+    def __init__(self):
+        self.records: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def on_end(self, span: ReadableSpan):
+        record = SpanRecord.from_span(span)
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def rows(self) -> list[SpanRow]:
+        with self._lock:
+            records = {record.span_id: record for record in self.records}
+
+        paths = {}
+
+        def path(record: SpanRecord) -> tuple[str, ...]:
+            if record.span_id not in paths:
+                parent = records.get(record.parent_id)
+                parent_path = path(parent) if parent else ()
+                paths[record.span_id] = parent_path if parent_path[-1:] == (record.name,) else parent_path + (record.name,)
+            return paths[record.span_id]
+
+        rows: dict[tuple[str, ...], SpanRow] = {}
+        for record in sorted(records.values(), key=lambda record: record.start):
+            row = rows.setdefault(path(record), SpanRow(path=path(record), first_start=record.start))
+            seconds = (record.end - record.start) / 1e9
+            row.calls += 1
+            row.seconds += seconds
+            row.max_seconds = max(row.max_seconds, seconds)
+            row.input_tokens += record.input_tokens
+            row.output_tokens += record.output_tokens
+
+        def order(row: SpanRow) -> tuple:
+            return tuple(rows[row.path[:depth]].first_start for depth in range(1, len(row.path) + 1))
+
+        return sorted(rows.values(), key=order)
+
+    def table(self) -> str:
+        rows = [f"{'span':<48} {'calls':>6} {'seconds':>8} {'max':>7} {'input tok':>10} {'output tok':>11}"]
+        for row in self.rows():
+            name = '  ' * (len(row.path) - 1) + row.path[-1]
+            rows.append(f"{name[:48]:<48} {row.calls:>6} {row.seconds:>8.2f} {row.max_seconds:>7.2f} "
+                        f"{row.input_tokens:>10} {row.output_tokens:>11}")
+        return '\n'.join(rows)
+
+
+class FileSpanExporter(ConsoleSpanExporter):
+    """
+    Exporter appending one JSON line per span to `path`.
+    Notes:
+        - The file stays open while the provider runs and is closed on shutdown, after the last batch is written.
+          TracerProvider shuts down at exit, so the spans still queued when the process ends reach the file.
+    """
+
+    def __init__(self, path: str | Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+        super().__init__(out=self.file, formatter=lambda span: span.to_json(indent=None) + '\n')
+
+    def shutdown(self):
+        super().shutdown()
+        self.file.close()
+
+
+summary = SpanSummary()
+_provider: TracerProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def setup_tracing(exporter: str = 'none', path: str | Path | None = None, collect: bool = True) -> SpanSummary:
+    """
+    Install the process tracer provider, collecting spans in `summary` and exporting them with `exporter`.
+    Notes:
+        - `collect=False` only exports, for long-running processes (MCP server) where `summary` would grow forever.
+        - `exporter`: 'none', 'console' (one JSON document per span on stdout) or 'file' (one JSON line per span
+          appended to `path`, required for this exporter).
+        - OpenTelemetry only accepts one global provider per process, later calls only clear `summary`.
+        - Without this call every span is a no-op.
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = TracerProvider(resource=Resource.create({'service.name': 'ai_weather'}))
+            if collect:
+                _provider.add_span_processor(summary)
+            if exporter == 'console':
+                _provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+            elif exporter == 'file':
+                if path is None:
+                    raise ValueError("The 'file' trace exporter needs a path")
+                _provider.add_span_processor(BatchSpanProcessor(FileSpanExporter(path)))
+            elif exporter != 'none':
+                raise ValueError(f"Unknown trace exporter {exporter!r}, use 'none', 'console' or 'file'")
+            trace.set_tracer_provider(_provider)
+            logger.debug(f"[setup_tracing] Tracing enabled, exporter: {exporter}")
+    summary.clear()
+    return summary
+
+
+def in_current_context(func: Callable) -> Callable:
+    """Wrap `func` to run in the trace context of the caller, so spans started in a thread pool nest under it"""
+    parent = context.get_current()
+
+    @wraps(func)
+    def run(*args, **kwargs):
+        token = context.attach(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            context.detach(token)
+    return run
+
+
+def flush_tracing():
+    if _provider is not None:
+        _provider.force_flush()
@@ -1,21 +1,133 @@
+import asyncio
 from datetime import date
+from typing import Annotated
+from urllib.parse import urlparse
 
 from fastmcp import FastMCP
-from modules.weather.tools import get_hourly_weather_data_tool
-from modules.weather.models import MeteoData
-from settings import MY_LATITUDE, MY_LONGITUDE
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from pydantic import Field
+
+from core.tracing import setup_tracing, tracer
+from modules.weather.cache import get_cache, utc_now
+from modules.weather.client import async_client
+from modules.weather.response_cache import CachedResponse, ResponseCache
+from modules.weather.singleflight import AsyncSingleFlight
+from modules.weather.tools import (
+    get_daily_weather_summary_tool_async, get_extreme_weather_tool_async, get_hourly_weather_data_tool_async,
+    get_hourly_weather_data_batch_tool, async_weather_flight, weather_flight)
+from modules.weather.models import Encoding, HourlyVariable, Location, MeteoDataBatch
+from settings import MY_LATITUDE, MY_LONGITUDE, MCP_SERVER_URL, TRACE_EXPORTER, TRACE_PATH, WEATHER_TOOL_ENCODING
 
 mcp = FastMCP("FastMCP Weather Agent", version="1.0.0")
 
+response_cache = ResponseCache()
+response_flight = AsyncSingleFlight()
+
+
+async def cached_response(name: str, compute, from_date: date, to_date: date, encoding: Encoding,
+                          if_none_match: str | None = None, **params) -> ToolResult:
+    """
+    Serve a tool response from the response cache, computing and encoding it once on a miss.
+    Notes:
+        - The etag of the body is returned in `_meta`. A client sending it back as `if_none_match` gets a short
+          not-modified note instead of the body while the data is unchanged.
+    """
+    key = (name, MY_LATITUDE, MY_LONGITUDE, from_date, to_date, encoding, *sorted(params.items()))
+
+    async def serialize() -> CachedResponse:
+        data = await compute(
+            latitude=MY_LATITUDE, longitude=MY_LONGITUDE, from_date=from_date, to_date=to_date, **params)
+        return response_cache.put(key, body=data.encode(encoding), immutable=to_date < utc_now().date())
+
+    with tracer.start_as_current_span('mcp.tool', attributes={'gen_ai.tool.name': name}) as span:
+        response = response_cache.get(key)
+        span.set_attribute('weather.response_cache.hit', response is not None)
+        response = response or await response_flight.do(key, serialize)
+        span.set_attribute('weather.response.not_modified', response.etag == if_none_match)
+    if response.etag == if_none_match:
+        return ToolResult(content=[TextContent(type='text', text=NOT_MODIFIED.format(etag=response.etag))],
+                          meta={'etag': response.etag, 'not_modified': True})
+    return ToolResult(content=[TextContent(type='text', text=response.body)], meta={'etag': response.etag})
+
+
+ENCODING_DESCRIPTION = ("'columns' (a time index plus one array per variable), 'csv' (one row per entry) "
+                        "or 'json' (one object per reading)")
+VARIABLES_DESCRIPTION = "Variables to return, ask only for the ones the answer needs (all of them when omitted)"
+IF_NONE_MATCH_DESCRIPTION = ("Etag (_meta.etag) of a previous response with the same arguments, the data is only sent "
+                             "again when it changed")
+NOT_MODIFIED = "Not modified: the data is unchanged since the response with etag {etag}."
+
 
-@mcp.tool(description="Get hourly weather data for a given date range.")
-def get_hourly_weather_data(from_date: date, to_date: date) -> MeteoData:
-    return get_hourly_weather_data_tool(
-        latitude=MY_LATITUDE,
-        longitude=MY_LONGITUDE,
+@mcp.tool(description="Get hourly weather data (temperature, humidity, apparent temperature, precipitation, "
+                      "evapotranspiration, surface pressure, wind speed and wind direction) for a given date range.")
+async def get_hourly_weather_data(
+        from_date: date,
+        to_date: date,
+        variables: Annotated[list[HourlyVariable] | None, Field(description=VARIABLES_DESCRIPTION)] = None,
+        encoding: Annotated[Encoding, Field(description=ENCODING_DESCRIPTION)] = WEATHER_TOOL_ENCODING,
+        if_none_match: Annotated[str | None, Field(description=IF_NONE_MATCH_DESCRIPTION)] = None) -> ToolResult:
+    return await cached_response(
+        'get_hourly_weather_data', get_hourly_weather_data_tool_async, from_date, to_date, encoding, if_none_match,
+        variables=tuple(sorted(set(variables))) if variables else None)
+
+
+@mcp.tool(description="Get daily weather aggregates (temperature extremes, humidity, precipitation) and "
+                      "precomputed extreme heat and heat wave flags for a given date range.")
+async def get_daily_weather_summary(
+        from_date: date,
+        to_date: date,
+        encoding: Annotated[Encoding, Field(description=ENCODING_DESCRIPTION)] = WEATHER_TOOL_ENCODING,
+        if_none_match: Annotated[str | None, Field(description=IF_NONE_MATCH_DESCRIPTION)] = None) -> ToolResult:
+    return await cached_response(
+        'get_daily_weather_summary', get_daily_weather_summary_tool_async, from_date, to_date, encoding,
+        if_none_match)
+
+
+@mcp.tool(description="Get the extreme weather episodes (heat waves, tropical nights, heavy precipitation) "
+                      "detected with local thresholds for a given date range.")
+async def get_extreme_weather(
+        from_date: date,
+        to_date: date,
+        encoding: Annotated[Encoding, Field(description=ENCODING_DESCRIPTION)] = WEATHER_TOOL_ENCODING,
+        if_none_match: Annotated[str | None, Field(description=IF_NONE_MATCH_DESCRIPTION)] = None) -> ToolResult:
+    return await cached_response(
+        'get_extreme_weather', get_extreme_weather_tool_async, from_date, to_date, encoding, if_none_match)
+
+
+@mcp.tool(description="Get hourly weather data for several locations and a given date range.")
+async def get_hourly_weather_data_batch(
+        locations: list[Location],
+        from_date: date,
+        to_date: date,
+        variables: Annotated[list[HourlyVariable] | None, Field(description=VARIABLES_DESCRIPTION)] = None,
+        encoding: Annotated[Encoding, Field(description=ENCODING_DESCRIPTION)] = WEATHER_TOOL_ENCODING) -> ToolResult:
+    batch = MeteoDataBatch.from_mapping(await asyncio.to_thread(
+        get_hourly_weather_data_batch_tool,
+        locations=locations,
         from_date=from_date,
-        to_date=to_date)
+        to_date=to_date,
+        variables=variables))
+    return ToolResult(content=[TextContent(type='text', text=batch.encode(encoding))])
+
+
+@mcp.resource("weather://stats", description="Response cache, forecast cache, coalesced calls and Open-Meteo client "
+                                            "statistics.")
+def weather_stats() -> dict:
+    return {
+        'responses': response_cache.stats(),
+        'forecasts': get_cache().stats(),
+        'open_meteo': async_client.stats(),
+        'single_flight': {
+            'responses': response_flight.stats(),
+            'forecasts': async_weather_flight.stats(),
+            'forecasts_sync': weather_flight.stats(),
+        },
+    }
 
 
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http", host="127.0.0.1", port=8888, path="/mcp")
+    if TRACE_EXPORTER != 'none':
+        setup_tracing(TRACE_EXPORTER, TRACE_PATH, collect=False)
+    url = urlparse(MCP_SERVER_URL)
+    mcp.run(transport="streamable-http", host=url.hostname, port=url.port, path=url.path.rstrip('/'))
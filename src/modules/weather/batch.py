@@ -0,0 +1,117 @@
+import csv
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+
+from strands.models import BedrockModel
+
+from core.tracing import in_current_context, tracer
+from modules.weather.cache import utc_now
+from modules.weather.main import ai
+from modules.weather.models import Location
+from modules.weather.prompts import SITE_FORECAST_PROMPT, SYSTEM_PROMPT
+from modules.weather.tools import get_hourly_weather_data_batch_tool
+
+logger = logging.getLogger(__name__)
+
+
+def read_locations(path: str | Path) -> list[Location]:
+    """
+    Read sites from a CSV file with `name`, `latitude` and `longitude` columns.
+    Notes:
+        - A site repeated in another row (same name and coordinates) is rejected, it would get a single report.
+    """
+    locations: dict[Location, int] = {}
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            location = Location(name=row.get('name') or None, latitude=row['latitude'], longitude=row['longitude'])
+            if location in locations:
+                raise ValueError(f"Duplicate site {location} in lines {locations[location]} and {reader.line_num} of {path}")
+            locations[location] = reader.line_num
+    return list(locations)
+
+
+def report_path(output: str | Path, location: Location) -> Path:
+    name = location.name or f"{location.latitude}_{location.longitude}"
+    return Path(output) / f"{re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')}.md"
+
+
+def report_paths(output: str | Path, locations: list[Location]) -> dict[Location, Path]:
+    """
+    Report file of every site.
+    Notes:
+        - Sites whose names give the same file name ("Sant Joan" and "Sant-Joan") are told apart by their position
+          in `locations`, the first one keeps the plain name. A suffixed name can also be taken ("x-3" in row 2
+          and "X" in row 3), the suffix is then repeated until the name is free.
+    """
+    paths = {}
+    taken = set()
+    for index, location in enumerate(locations, start=1):
+        path = report_path(output, location)
+        while path in taken:
+            path = path.with_stem(f"{path.stem}-{index}")
+        taken.add(path)
+        paths[location] = path
+    return paths
+
+
+def prefetch_weather(locations: list[Location], days: int):
+    """
+    Warm the forecast cache for every site with batched Open-Meteo requests before the agents start.
+    Notes:
+        - A failed prefetch is only logged: the agents then fetch the weather of their own site.
+    """
+    today = utc_now().date()
+    try:
+        get_hourly_weather_data_batch_tool(locations, today, today + timedelta(days=days - 1))
+    except Exception as e:
+        logger.warning(f"[prefetch_weather] Prefetch of {len(locations)} sites failed, sites will fetch their own data: {e}")
+
+
+def forecast_site(location: Location, days: int, bedrock_model: BedrockModel, tool_profile: str = 'weather') -> str:
+    response = ai(
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=SITE_FORECAST_PROMPT.format(
+            days=days, site=location.name or 'requested', latitude=location.latitude, longitude=location.longitude),
+        latitude=location.latitude,
+        longitude=location.longitude,
+        bedrock_model=bedrock_model,
+        quiet=True,
+        tool_profile=tool_profile)
+    return str(response)
+
+
+def forecast_sites(locations: list[Location],
+                   forecast: Callable[[Location], str],
+                   output: str | Path,
+                   concurrency: int) -> dict[Location, Path | Exception]:
+    """
+    Run `forecast` for every site on a bounded thread pool.
+    Notes:
+        - Each report is written to `output` as soon as its site finishes, not when the whole batch ends.
+        - A failing site is logged and reported in the result, it does not stop the others.
+        - Every site gets its own report file, see report_paths.
+    """
+    Path(output).mkdir(parents=True, exist_ok=True)
+    paths = report_paths(output, locations)
+    results: dict[Location, Path | Exception] = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='forecast') as pool:
+        futures = {pool.submit(in_current_context(forecast), location): location for location in locations}
+        for future in as_completed(futures):
+            location = futures[future]
+            try:
+                path = paths[location]
+                with tracer.start_as_current_span('weather.write_report', attributes={'weather.report': path.name}):
+                    path.write_text(future.result())
+                results[location] = path
+                logger.info(f"[forecast_sites] {path} written after {time.perf_counter() - start:.1f}s.")
+            except Exception as e:
+                results[location] = e
+                logger.error(f"[forecast_sites] Forecast for {location} failed: {e}")
+    return results
@@ -0,0 +1,208 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Sequence
+
+from pydantic import BaseModel
+
+from settings import WEATHER_CACHE_PATH, WEATHER_CACHE_MAX_BYTES, WEATHER_CACHE_FUTURE_TTL
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    variables TEXT NOT NULL,
+    start_hour TEXT NOT NULL,
+    end_hour TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (latitude, longitude, variables, start_hour, end_hour)
+)
+"""
+
+
+HOUR = timedelta(hours=1)
+
+
+def utc_now() -> datetime:
+    """Current time as a naive UTC datetime (Open-Meteo returns GMT timestamps by default)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Segment(BaseModel):
+    """Contiguous hour range [start, end] of a lookup, served from `data` or missing when data is None"""
+    start: datetime
+    end: datetime
+    data: dict | None = None
+
+
+def plan_segments(covered: list[tuple[datetime, datetime, dict]], start: datetime, end: datetime) -> list[Segment]:
+    """
+    Split [start, end] into ordered, disjoint segments at hour granularity.
+    Notes:
+        - Each hour is served by the covering entry that reaches furthest, uncovered hours become gaps.
+        - Coverage comes from the declared entry ranges, not from the returned timestamps, so days with
+          a missing or repeated local hour (DST) are not fetched again.
+    """
+    segments = []
+    cursor = start
+    while cursor <= end:
+        covering = [entry for entry in covered if entry[0] <= cursor <= entry[1]]
+        if covering:
+            entry_end, data = max(((entry[1], entry[2]) for entry in covering), key=lambda entry: entry[0])
+            segments.append(Segment(start=cursor, end=min(entry_end, end), data=data))
+        else:
+            next_starts = [entry[0] for entry in covered if cursor < entry[0] <= end]
+            segments.append(Segment(start=cursor, end=min(next_starts) - HOUR if next_starts else end))
+        cursor = segments[-1].end + HOUR
+    return segments
+
+
+def merge_segments(segments: list[Segment], variables: Sequence[str]) -> dict:
+    """Concatenate the rows of every segment (clipped to the segment range) into one ordered response of `variables`"""
+    hourly = {'time': [], **{variable: [] for variable in variables}}
+    for segment in segments:
+        first, last = segment.start.isoformat(timespec='minutes'), segment.end.isoformat(timespec='minutes')
+        rows = segment.data['hourly']
+        for index, iso in enumerate(rows['time']):
+            if first <= iso <= last:
+                hourly['time'].append(iso)
+                for variable in variables:
+                    hourly[variable].append(rows[variable][index])
+    return {'hourly': hourly}
+
+
+class ForecastCache:
+    """
+    SQLite-backed cache of Open-Meteo responses keyed by (latitude, longitude, variables, hour range).
+    Notes:
+        - Ranges that end in the past are immutable and never expire.
+        - Ranges that reach into the future expire after `future_ttl` seconds.
+        - The total payload size is bounded by `max_bytes`, least recently used entries are evicted first.
+        - Use path=':memory:' for a process-local stand-in (tests).
+    """
+
+    def __init__(self,
+                 path: str | Path = WEATHER_CACHE_PATH,
+                 max_bytes: int = WEATHER_CACHE_MAX_BYTES,
+                 future_ttl: int = WEATHER_CACHE_FUTURE_TTL):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.future_ttl = future_ttl
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+
+    @staticmethod
+    def _key(latitude: float, longitude: float, variables: Sequence[str], start: datetime, end: datetime) -> tuple:
+        return latitude, longitude, ','.join(variables), start.isoformat(timespec='minutes'), end.isoformat(timespec='minutes')
+
+    def lookup(self, latitude: float, longitude: float, variables: Sequence[str], start: datetime, end: datetime) -> list[Segment]:
+        """
+        Return the ordered segments of [start, end], cached ones carry their data and gaps have none.
+        Notes:
+            - Entries holding more variables than requested serve the lookup too (see merge_segments).
+            - Expired entries of the location are dropped.
+        """
+        first, last = start.isoformat(timespec='minutes'), end.isoformat(timespec='minutes')
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM forecasts WHERE latitude=? AND longitude=? AND expires_at IS NOT NULL AND expires_at<=?",
+                (latitude, longitude, now))
+            rows = [row[:4] for row in self._db.execute(
+                "SELECT rowid, start_hour, end_hour, payload, variables FROM forecasts "
+                "WHERE latitude=? AND longitude=? AND start_hour<=? AND end_hour>=?",
+                (latitude, longitude, last, first)).fetchall()
+                if set(variables) <= set(row[4].split(','))]
+            for rowid, *_ in rows:
+                self._db.execute("UPDATE forecasts SET accessed_at=? WHERE rowid=?", (now, rowid))
+        segments = plan_segments(
+            [(datetime.fromisoformat(row[1]), datetime.fromisoformat(row[2]), json.loads(row[3])) for row in rows],
+            start, end)
+
+        gaps = sum(segment.data is None for segment in segments)
+        with self._lock:
+            if gaps == 0:
+                self.hits += 1
+            elif gaps == len(segments):
+                self.misses += 1
+            else:
+                self.partial_hits += 1
+        return segments
+
+    def put(self, latitude: float, longitude: float, variables: Sequence[str], start: datetime, end: datetime, data: dict):
+        key = self._key(latitude, longitude, variables, start, end)
+        payload = json.dumps(data, separators=(',', ':')).encode()
+        now = time.time()
+        expires_at = None if end < utc_now() else now + self.future_ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO forecasts "
+                "(latitude, longitude, variables, start_hour, end_hour, payload, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (*key, payload, len(payload), expires_at, now))
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._db.execute("DELETE FROM forecasts WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM forecasts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for rowid, size in self._db.execute("SELECT rowid, size FROM forecasts ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM forecasts WHERE rowid=?", (rowid,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM forecasts")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM forecasts").fetchone()
+        return {
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+
+_cache: ForecastCache | None = None
+_cache_lock = threading.Lock()
+
+
+def setup_cache(path: str | Path = WEATHER_CACHE_PATH,
+                max_bytes: int = WEATHER_CACHE_MAX_BYTES,
+                future_ttl: int = WEATHER_CACHE_FUTURE_TTL) -> ForecastCache:
+    global _cache
+    _cache = ForecastCache(path=path, max_bytes=max_bytes, future_ttl=future_ttl)
+    return _cache
+
+
+def get_cache() -> ForecastCache:
+    with _cache_lock:
+        if _cache is None:
+            setup_cache()
+    return _cache
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from statistics import quantiles
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.tracing import tracer
+from settings import (
+    WEATHER_READ_TIMEOUT, WEATHER_CONNECT_TIMEOUT, WEATHER_MAX_ATTEMPTS, WEATHER_POOL_SIZE, )
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+BACKOFF_FACTOR = 0.5
+
+
+class BaseClient:
+    """Request counters and latency percentiles shared by the sync and async clients"""
+
+    def __init__(self, max_attempts: int):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=1024)
+        self._lock = threading.Lock()
+
+    def _record(self, url: str, elapsed: float, failed: bool):
+        with self._lock:
+            self.requests += 1
+            self.errors += failed
+            self.latencies.append(elapsed)
+        logger.debug(f"[{type(self).__name__}] GET {url} took {elapsed * 1000:.1f} ms")
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            requests_count, errors = self.requests, self.errors
+        if len(latencies) > 1:
+            percentiles = quantiles(latencies, n=100, method='inclusive')
+            p50, p99 = percentiles[49], percentiles[98]
+        else:
+            p50 = p99 = latencies[0] if latencies else 0.0
+        return {
+            'requests': requests_count,
+            'errors': errors,
+            'p50_ms': p50 * 1000,
+            'p99_ms': p99 * 1000,
+            'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+
+class OpenMeteoClient(BaseClient):
+    """
+    HTTP client for the Open-Meteo API.
+    Notes:
+        - Owns a pooled keep-alive requests.Session, so repeated calls reuse TCP/TLS connections.
+        - Connection errors and 429/5xx responses are retried with exponential backoff.
+        - Per-request latency is recorded, see `stats()`.
+    """
+
+    def __init__(self,
+                 read_timeout: int = WEATHER_READ_TIMEOUT,
+                 connect_timeout: int = WEATHER_CONNECT_TIMEOUT,
+                 max_attempts: int = WEATHER_MAX_ATTEMPTS,
+                 pool_size: int = WEATHER_POOL_SIZE):
+        super().__init__(max_attempts)
+        self.timeout = (connect_timeout, read_timeout)
+        retries = Retry(
+            total=max_attempts - 1,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str) -> requests.Response:
+        start = time.perf_counter()
+        failed = True
+        with tracer.start_as_current_span('open_meteo.get', attributes={'url.full': url}) as span:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if span.is_recording():
+                    span.set_attributes({'http.response.status_code': response.status_code,
+                                         'http.response.body.size': len(response.content)})
+                response.raise_for_status()
+                failed = False
+                return response
+            finally:
+                self._record(url, time.perf_counter() - start, failed)
+
+
+class AsyncOpenMeteoClient(BaseClient):
+    """
+    Asyncio HTTP client for the Open-Meteo API, used by the FastMCP server.
+    Notes:
+        - Same timeouts, attempts and pool size as OpenMeteoClient, backed by a pooled httpx.AsyncClient.
+        - Transport errors and 429/5xx responses share one budget of `max_attempts`, with exponential backoff.
+        - The httpx client is created on first use, inside the running event loop.
+    """
+
+    def __init__(self,
+                 read_timeout: int = WEATHER_READ_TIMEOUT,
+                 connect_timeout: int = WEATHER_CONNECT_TIMEOUT,
+                 max_attempts: int = WEATHER_MAX_ATTEMPTS,
+                 pool_size: int = WEATHER_POOL_SIZE):
+        super().__init__(max_attempts)
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._http: httpx.AsyncClient | None = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            transport = httpx.AsyncHTTPTransport(limits=self.limits)
+            self._http = httpx.AsyncClient(timeout=self.timeout, transport=transport)
+        return self._http
+
+    async def get(self, url: str) -> httpx.Response:
+        start = time.perf_counter()
+        failed = True
+        with tracer.start_as_current_span('open_meteo.get', attributes={'url.full': url}) as span:
+            try:
+                for attempt in range(self.max_attempts):
+                    last_attempt = attempt == self.max_attempts - 1
+                    try:
+                        response = await self.http.get(url)
+                    except httpx.TransportError as e:
+                        if last_attempt:
+                            raise
+                        logger.warning(f"[AsyncOpenMeteoClient] GET {url} failed, retrying: {e}")
+                    else:
+                        if response.status_code not in RETRY_STATUSES or last_attempt:
+                            break
+                    await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+                if span.is_recording():
+                    span.set_attributes({'http.response.status_code': response.status_code,
+                                         'http.response.body.size': len(response.content),
+                                         'http.request.resend_count': attempt})
+                response.raise_for_status()
+                failed = False
+                return response
+            finally:
+                self._record(url, time.perf_counter() - start, failed)
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+client = OpenMeteoClient()
+async_client = AsyncOpenMeteoClient()
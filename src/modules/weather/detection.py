@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from core.tracing import tracer
+from modules.weather.models import ColumnarMeteoData, ExtremeWeatherReport, ExtremeWeatherThresholds, WeatherEpisode
+from modules.weather.summary import runs, to_frame
+from settings import (
+    HEAT_MAX_TEMPERATURE, HEAT_MIN_TEMPERATURE, HEAT_WAVE_MIN_DAYS, TROPICAL_NIGHT_TEMPERATURE,
+    HEAVY_PRECIPITATION_DAILY, HEAVY_PRECIPITATION_HOURLY)
+
+NIGHT_START_HOUR = 20
+NIGHT_HOURS = 12
+
+DEFAULT_THRESHOLDS = ExtremeWeatherThresholds(
+    heat_max_temperature=HEAT_MAX_TEMPERATURE,
+    heat_min_temperature=HEAT_MIN_TEMPERATURE,
+    heat_wave_min_days=HEAT_WAVE_MIN_DAYS,
+    tropical_night_temperature=TROPICAL_NIGHT_TEMPERATURE,
+    heavy_precipitation_daily=HEAVY_PRECIPITATION_DAILY,
+    heavy_precipitation_hourly=HEAVY_PRECIPITATION_HOURLY,
+)
+
+
+def daily_indicators(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily maximum/minimum temperature, precipitation totals and night minimum of an hourly frame.
+    Notes:
+        - The index has every calendar day of the range, days without readings are NaN and never match a threshold.
+        - The night of a day runs from 20:00 to 08:00 the next morning, nights with missing hours are NaN.
+    """
+    daily = frame.groupby(frame.index.normalize()).agg(
+        temperature_max=('temperature', 'max'),
+        temperature_min=('temperature', 'min'),
+        precipitation=('precipitation', 'sum'),
+        precipitation_max_hourly=('precipitation', 'max'),
+    ).asfreq('D')
+
+    evening = frame.index - pd.Timedelta(hours=NIGHT_START_HOUR)
+    at_night = evening.hour < NIGHT_HOURS
+    nights = frame['temperature'][at_night].groupby(evening[at_night].normalize()).agg(['min', 'size'])
+    daily['night_temperature_min'] = nights['min'].where(nights['size'] == NIGHT_HOURS).reindex(daily.index)
+    return daily
+
+
+def episodes(daily: pd.DataFrame, flags: pd.Series, min_days: int, kind: str) -> list[WeatherEpisode]:
+    """Aggregate every run of at least `min_days` flagged days into a WeatherEpisode"""
+    ids = runs(flags, min_days)
+    if ids.empty:
+        return []
+    # A missing night minimum wins the min() so that partial nights surface as None
+    selected = daily.loc[ids.index].assign(
+        day=ids.index, night_temperature_min=daily['night_temperature_min'].loc[ids.index].fillna(-np.inf))
+    table = selected.groupby(ids).agg(
+        start=('day', 'min'),
+        end=('day', 'max'),
+        days=('day', 'size'),
+        temperature_max=('temperature_max', 'max'),
+        night_temperature_min=('night_temperature_min', 'min'),
+        precipitation=('precipitation', 'sum'),
+    ).round(1)
+    return [
+        WeatherEpisode(
+            kind=kind,
+            start=row['start'].date(),
+            end=row['end'].date(),
+            days=row['days'],
+            temperature_max=row['temperature_max'],
+            night_temperature_min=None if np.isinf(row['night_temperature_min']) else row['night_temperature_min'],
+            precipitation=row['precipitation'])
+        for row in table.to_dict('records')
+    ]
+
+
+@tracer.start_as_current_span('weather.detect_extreme_weather')
+def detect_extreme_weather(data: ColumnarMeteoData,
+                           thresholds: ExtremeWeatherThresholds = DEFAULT_THRESHOLDS) -> ExtremeWeatherReport:
+    """
+    Detect heat waves, tropical nights and heavy precipitation episodes in the hourly readings.
+    Notes:
+        - Heat wave: at least `heat_wave_min_days` consecutive days whose maximum reaches `heat_max_temperature`
+          and whose minimum reaches `heat_min_temperature` (the extreme_heat flag of daily_summary).
+        - Tropical nights: consecutive nights whose minimum (20:00-08:00) reaches `tropical_night_temperature`.
+        - Heavy precipitation: consecutive days whose total reaches `heavy_precipitation_daily` or with an hour
+          reaching `heavy_precipitation_hourly`.
+        - Everything is computed on daily aggregates with vectorized pandas operations, no Python loop over hours.
+
+    Returns:
+        ExtremeWeatherReport: The thresholds and the detected episodes, sorted by start day
+    """
+    if not len(data):
+        return ExtremeWeatherReport(thresholds=thresholds, episodes=[])
+
+    daily = daily_indicators(to_frame(data))
+    extreme_heat = ((daily['temperature_max'] >= thresholds.heat_max_temperature) &
+                    (daily['temperature_min'] >= thresholds.heat_min_temperature))
+    tropical_night = daily['night_temperature_min'] >= thresholds.tropical_night_temperature
+    heavy_precipitation = ((daily['precipitation'] >= thresholds.heavy_precipitation_daily) |
+                           (daily['precipitation_max_hourly'] >= thresholds.heavy_precipitation_hourly))
+
+    found = [
+        *episodes(daily, extreme_heat, thresholds.heat_wave_min_days, 'heat_wave'),
+        *episodes(daily, tropical_night, 1, 'tropical_nights'),
+        *episodes(daily, heavy_precipitation, 1, 'heavy_precipitation'),
+    ]
+    return ExtremeWeatherReport(thresholds=thresholds, episodes=sorted(found, key=lambda episode: episode.start))
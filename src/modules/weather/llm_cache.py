@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any, Coroutine, Iterable, Mapping
+
+from pydantic import BaseModel
+from strands.agent import AgentResult
+from strands.telemetry.metrics import EventLoopMetrics
+from strands.types.tools import AgentTool
+
+from settings import LLM_CACHE_PATH, LLM_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    message TEXT NOT NULL,
+    tools TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+# Tools whose effect a cached answer would not reproduce
+SIDE_EFFECT_TOOLS = frozenset({'file_write', 'python_repl'})
+
+
+class ToolFingerprint(BaseModel):
+    """Tool call of a cached run and the digest of the result the model read"""
+    name: str
+    input: dict[str, Any]
+    digest: str
+
+
+class CachedAnswer(BaseModel):
+    """Final message of a cached run and the tool results it was based on"""
+    message: dict[str, Any]
+    tools: list[ToolFingerprint]
+    created_at: float
+
+    def to_result(self) -> AgentResult:
+        """AgentResult with the cached message (str() gives the same text) and empty metrics: no model was called"""
+        return AgentResult(stop_reason='end_turn', message=self.message, metrics=EventLoopMetrics(), state={})
+
+
+def request_key(model_config: Mapping[str, Any], system_prompt: str, user_prompt: str, day: date,
+                tool_names: Iterable[str] = ()) -> str:
+    """Digest of everything the answer depends on before any tool is called (the day covers relative dates)"""
+    request = {
+        'model_id': model_config.get('model_id'),
+        'temperature': model_config.get('temperature'),
+        'system_prompt': system_prompt,
+        'user_prompt': user_prompt,
+        'day': day.isoformat(),
+        'tools': sorted(tool_names),
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+def content_digest(content: list[dict]) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def called_tools(messages: list[dict]) -> set[str]:
+    return {block['toolUse']['name'] for message in messages for block in message.get('content', []) if 'toolUse' in block}
+
+
+def tool_fingerprints(messages: list[dict], tool_names: set[str]) -> list[ToolFingerprint]:
+    """Fingerprint the successful calls of `tool_names` found in an agent conversation"""
+    calls = {}
+    fingerprints = []
+    for message in messages:
+        for block in message.get('content', []):
+            if 'toolUse' in block and block['toolUse']['name'] in tool_names:
+                calls[block['toolUse']['toolUseId']] = block['toolUse']
+            elif 'toolResult' in block and block['toolResult']['toolUseId'] in calls:
+                result = block['toolResult']
+                if result.get('status') == 'success':
+                    tool_use = calls[result['toolUseId']]
+                    fingerprints.append(ToolFingerprint(
+                        name=tool_use['name'], input=tool_use['input'], digest=content_digest(result['content'])))
+    return fingerprints
+
+
+async def replay_digest(tool: AgentTool, tool_input: dict) -> str | None:
+    """Call `tool` again as the agent would and digest its result, None when it fails"""
+    result = None
+    async for event in tool.stream({'toolUseId': 'llm-cache-replay', 'name': tool.tool_name, 'input': tool_input}, {}):
+        result = event
+    if not result or result.get('status') != 'success':
+        return None
+    return content_digest(result['content'])
+
+
+async def replay_digests(tools: Mapping[str, AgentTool], fingerprints: list[ToolFingerprint]) -> list[str | None]:
+    return [await replay_digest(tools[fingerprint.name], fingerprint.input) for fingerprint in fingerprints]
+
+
+def run_coroutine(coroutine: Coroutine):
+    """Run `coroutine` to completion on a new event loop, in a worker thread when this thread already runs one"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of agent answers keyed by request_key.
+    Notes:
+        - Entries expire `ttl` seconds after they are stored.
+        - An entry also records the data tools the agent called. On lookup those calls are replayed (they are cheap,
+          served by the forecast cache) and the entry is only used when every result is identical to the one the
+          model read. Other tools (python_repl, file_write, ...) are not replayed.
+        - The calls of an entry are replayed on one event loop, also when lookup is called from a running one.
+          A call that fails counts as a miss and keeps the entry, the answer may still be valid.
+        - Use path=':memory:' for a process-local stand-in (tests).
+    """
+
+    def __init__(self, path: str | Path = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL):
+        self.path = str(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+
+    def get(self, key: str) -> CachedAnswer | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT message, tools, created_at FROM responses WHERE key=? AND expires_at>?",
+                (key, time.time())).fetchone()
+        if row is None:
+            return None
+        return CachedAnswer(message=json.loads(row[0]), tools=json.loads(row[1]), created_at=row[2])
+
+    def lookup(self, key: str, tools: Mapping[str, AgentTool]) -> CachedAnswer | None:
+        """Return the answer stored for `key` if its tool results are unchanged, replaying them with `tools`"""
+        answer = self.get(key)
+        if answer is None:
+            return self._miss()
+        missing = [fingerprint.name for fingerprint in answer.tools if fingerprint.name not in tools]
+        if missing:
+            return self._stale(key, missing[0])
+        if answer.tools:
+            try:
+                digests = run_coroutine(replay_digests(tools, answer.tools))
+            except Exception as e:
+                logger.warning(f"[LLMResponseCache] Replay of the tools of a cached answer failed: {e}")
+                return self._miss()
+            if None in digests:
+                logger.warning(f"[LLMResponseCache] {answer.tools[digests.index(None)].name} failed on replay")
+                return self._miss()
+            changed = [fingerprint.name for fingerprint, digest in zip(answer.tools, digests) if digest != fingerprint.digest]
+            if changed:
+                return self._stale(key, changed[0])
+        with self._lock:
+            self.hits += 1
+        return answer
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _stale(self, key: str, tool_name: str) -> None:
+        logger.info(f"[LLMResponseCache] {tool_name} result changed, the cached answer is stale")
+        with self._lock:
+            self.stale += 1
+            self._db.execute("DELETE FROM responses WHERE key=?", (key,))
+        return None
+
+    def put(self, key: str, message: dict, tools: list[ToolFingerprint]):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, message, tools, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(message), json.dumps([tool.model_dump() for tool in tools]), now, now + self.ttl))
+            self._db.execute("DELETE FROM responses WHERE expires_at<=?", (now,))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale, 'entries': entries}
+
+
+_llm_cache: LLMResponseCache | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def setup_llm_cache(path: str | Path = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL) -> LLMResponseCache:
+    global _llm_cache
+    _llm_cache = LLMResponseCache(path=path, ttl=ttl)
+    return _llm_cache
+
+
+def get_llm_cache() -> LLMResponseCache:
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            setup_llm_cache()
+    return _llm_cache
@@ -1,103 +1,394 @@
+import asyncio
 import logging
-from typing import Callable
-
-from botocore.config import Config
-from mcp.client.streamable_http import streamablehttp_client
-from strands import Agent
-from strands.tools.mcp import MCPTransport
-from strands.tools.mcp.mcp_client import MCPClient
-from strands.agent import AgentResult
-from strands.models import BedrockModel
-from strands_tools import calculator, file_write, current_time, think, python_repl
-
-from core.aws import get_aws_session
-from modules.weather.tools import Tools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from modules.weather.cache import utc_now
+from modules.weather.models import DailyWeatherSummary
+from modules.weather.profiles import get_tool_profile
+from modules.weather.prompts import DAY_FORECAST_PROMPT, INDEX_FORECAST_PROMPT
 from settings import (
     IA_MODEL, IA_TEMPERATURE, LLM_READ_TIMEOUT, LLM_CONNECT_TIMEOUT,
-    LLM_MAX_ATTEMPTS, MY_LATITUDE, MY_LONGITUDE, )
+    LLM_CACHE, LLM_MAX_ATTEMPTS, LLM_PROMPT_CACHE, MY_LATITUDE, MY_LONGITUDE, MCP_SERVER_URL, )
+
+if TYPE_CHECKING:
+    import boto3
+    from strands import Agent
+    from strands.agent import AgentResult
+    from strands.models import BedrockModel
+    from strands.types.tools import AgentTool
+
+    from modules.weather.streaming import ReportWriter
+    from modules.weather.usage import CacheUsageHandler, RunUsage
 
 logger = logging.getLogger(__name__)
 
+# strands, boto3, the tracing SDK and the modules built on them (llm_cache, streaming, usage) are imported by the
+# functions that use them, importing this module (every command does) does not load the agent stack
+
+CACHE_POINT = {'cachePoint': {'type': 'default'}}
+
 
 def get_bedrock_model(
         read_timeout: int = LLM_READ_TIMEOUT,
         connect_timeout: int = LLM_CONNECT_TIMEOUT,
-        max_attempts: int = LLM_MAX_ATTEMPTS) -> BedrockModel:
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+        max_pool_connections: int = 10,
+        session: 'boto3.Session | None' = None,
+        prompt_cache: bool = LLM_PROMPT_CACHE) -> 'BedrockModel':
+    """
+    BedrockModel for IA_MODEL.
+    Notes:
+        - With `prompt_cache` a cache checkpoint follows the tool specs and another one the system prompt, so Bedrock
+          reuses the processed prefix on every cycle of the agent loop and on repeated runs within the cache window.
+    """
+    from botocore.config import Config
+    from strands.models import BedrockModel
+
+    from core.aws import get_aws_session
+
     config = Config(
         read_timeout=read_timeout,
         connect_timeout=connect_timeout,
-        retries={'max_attempts': max_attempts}
+        retries={'max_attempts': max_attempts},
+        max_pool_connections=max_pool_connections,
     )
-    session = get_aws_session()
+    session = get_aws_session() if session is None else session
 
+    cache = {'cache_tools': 'default', 'cache_prompt': 'default'} if prompt_cache else {}
     return BedrockModel(
         model_id=IA_MODEL,
         temperature=IA_TEMPERATURE,
         boto_session=session,
         boto_client_config=config,
+        **cache,
     )
 
+
+def user_message(user_prompt: str, prompt_cache: bool = LLM_PROMPT_CACHE) -> str | list[dict]:
+    """The user prompt, followed by a cache checkpoint when prompt caching is enabled (static prompts like FORECAST_PROMPT)"""
+    return [{'text': user_prompt}, CACHE_POINT] if prompt_cache else user_prompt
+
+
+_shared_models: dict[tuple, tuple['boto3.Session', 'BedrockModel']] = {}
+_shared_models_lock = threading.Lock()
+
+
+def get_shared_bedrock_model(
+        read_timeout: int = LLM_READ_TIMEOUT,
+        connect_timeout: int = LLM_CONNECT_TIMEOUT,
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+        max_pool_connections: int = 10,
+        prompt_cache: bool = LLM_PROMPT_CACHE) -> 'BedrockModel':
+    """
+    Process-wide BedrockModel (and botocore client) for a client configuration.
+    Notes:
+        - Built on the shared AWS session, and built again when that session is renewed.
+        - BedrockModel keeps no per-conversation state, one instance can serve many agents and threads.
+    """
+    from core.aws import get_shared_aws_session
+
+    session = get_shared_aws_session()
+    key = (read_timeout, connect_timeout, max_attempts, max_pool_connections, prompt_cache)
+    with _shared_models_lock:
+        cached = _shared_models.get(key)
+        if cached is None or cached[0] is not session:
+            model = get_bedrock_model(
+                read_timeout=read_timeout,
+                connect_timeout=connect_timeout,
+                max_attempts=max_attempts,
+                max_pool_connections=max_pool_connections,
+                session=session,
+                prompt_cache=prompt_cache)
+            cached = _shared_models[key] = (session, model)
+        return cached[1]
+
+
+@lru_cache(maxsize=1)
+def get_base_tools() -> tuple:
+    """
+    General purpose tools of every agent.
+    Notes:
+        - Imported on first use, not with this module: calculator alone pulls in sympy, which commands that
+          never build a tool-using agent (forecast --fan-out) should not pay for at startup.
+    """
+    from strands_tools import calculator, current_time, file_write, python_repl, think
+    return calculator, think, python_repl, file_write, current_time
+
+
+@lru_cache(maxsize=128)
+def get_weather_tools(latitude: float, longitude: float) -> tuple:
+    """Weather tools bound to a location, built once per location"""
+    from modules.weather.tools import Tools
+    return tuple(Tools(latitude=latitude, longitude=longitude).get_tools())
+
+
+def clear_shared_agent_resources():
+    with _shared_models_lock:
+        _shared_models.clear()
+    get_weather_tools.cache_clear()
+
+
+def profile_tools(tool_profile: str, data_tools: Sequence['AgentTool']) -> list:
+    """The general purpose tools and `data_tools` (local or MCP weather tools) of the `tool_profile` profile"""
+    return get_tool_profile(tool_profile).select([*get_base_tools(), *data_tools])
+
+
 def get_agent(
         system_prompt: str,
         read_timeout: int = LLM_READ_TIMEOUT,
         connect_timeout: int = LLM_CONNECT_TIMEOUT,
-        max_attempts: int = LLM_MAX_ATTEMPTS) -> Agent:
-    base_tools = [calculator, think, python_repl, file_write, current_time]
-    custom_tools = Tools(latitude=MY_LATITUDE, longitude=MY_LONGITUDE).get_tools()
-    all_tools = base_tools + custom_tools
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+        latitude: float = MY_LATITUDE,
+        longitude: float = MY_LONGITUDE,
+        bedrock_model: 'BedrockModel | None' = None,
+        quiet: bool = False,
+        cache_usage: 'CacheUsageHandler | None' = None,
+        tool_profile: str = 'full') -> 'Agent':
+    """
+    Build the forecast agent for one location.
+    Notes:
+        - Uses the process-wide BedrockModel and tool list, only the Agent (the conversation) is new.
+        - Pass `bedrock_model` to use a specific model instead of the shared one.
+        - With `quiet=True` the streamed output is not printed, useful when several agents run concurrently.
+        - `cache_usage` collects the prompt cache tokens of the agent's model calls.
+        - `tool_profile` names the TOOL_PROFILES entry with the tools the agent is given.
+    """
+    from strands import Agent
+    from strands.handlers import CompositeCallbackHandler, PrintingCallbackHandler, null_callback_handler
 
-    bedrock_model = get_bedrock_model(
-        read_timeout=read_timeout,
-        connect_timeout=connect_timeout,
-        max_attempts=max_attempts
-    )
+    tools = profile_tools(tool_profile, get_weather_tools(latitude, longitude))
+
+    if bedrock_model is None:
+        bedrock_model = get_shared_bedrock_model(
+            read_timeout=read_timeout,
+            connect_timeout=connect_timeout,
+            max_attempts=max_attempts
+        )
+    callback_handler = null_callback_handler if quiet else PrintingCallbackHandler()
+    if cache_usage is not None:
+        callback_handler = CompositeCallbackHandler(callback_handler, cache_usage)
     return Agent(
         model=bedrock_model,
-        tools=all_tools,
-        system_prompt=system_prompt
+        tools=tools,
+        system_prompt=system_prompt,
+        callback_handler=callback_handler,
     )
 
+def run_cached(agent: 'Agent', system_prompt: str, user_prompt: str,
+               data_tools: Sequence['AgentTool'], use_cache: bool = LLM_CACHE) -> 'AgentResult':
+    """
+    Invoke `agent` with `user_prompt`, answering from the LLM response cache when nothing changed.
+    Notes:
+        - The key covers the model id and temperature, both prompts, the tools of the agent and the current (UTC) day.
+        - The calls to `data_tools` are fingerprinted, a cached answer is only returned if replaying them gives the
+          same results, so new weather data always reaches the model.
+        - A cached answer is returned without any model call, its AgentResult has empty metrics.
+        - Runs that called a tool in SIDE_EFFECT_TOOLS (e.g. the forecast writing its reports) are not stored,
+          serving them from the cache would skip the side effect.
+        - `use_cache=False` bypasses the cache (no lookup, nothing stored).
+    """
+    from core.tracing import tracer
+    from modules.weather.llm_cache import (
+        SIDE_EFFECT_TOOLS, called_tools, get_llm_cache, request_key, tool_fingerprints)
+
+    if not use_cache:
+        return agent(user_message(user_prompt))
+
+    cache = get_llm_cache()
+    tools = {tool.tool_name: tool for tool in data_tools}
+    key = request_key(agent.model.get_config(), system_prompt, user_prompt, utc_now().date(), agent.tool_names)
+    with tracer.start_as_current_span('weather.llm_cache.lookup') as span:
+        answer = cache.lookup(key, tools)
+        span.set_attribute('weather.llm_cache.hit', answer is not None)
+    if answer is not None:
+        logger.info(f"[run_cached] Answer served from the LLM response cache ({len(answer.tools)} tool results checked)")
+        return answer.to_result()
+
+    result = agent(user_message(user_prompt))
+    side_effects = called_tools(agent.messages) & SIDE_EFFECT_TOOLS
+    if side_effects:
+        logger.info(f"[run_cached] Answer not cached, a cached answer would skip {', '.join(sorted(side_effects))}")
+    elif result.stop_reason == 'end_turn':
+        cache.put(key, result.message, tool_fingerprints(agent.messages, set(tools)))
+    return result
+
+
 def ai_mcp(
         system_prompt: str,
         user_prompt: str,
         read_timeout: int = 300,
         connect_timeout: int = 60,
-        max_attempts: int = 5) -> AgentResult:
-
-    def create_streamable_http_transport():
-        return streamablehttp_client("http://localhost:8888/mcp/")
-
-    streamable_http_mcp_client = MCPClient(create_streamable_http_transport)
+        max_attempts: int = 5,
+        url: str = MCP_SERVER_URL,
+        bedrock_model: 'BedrockModel | None' = None,
+        quiet: bool = False,
+        use_cache: bool = LLM_CACHE,
+        tool_profile: str = 'full') -> 'AgentResult':
+    from strands import Agent
+    from strands.handlers import PrintingCallbackHandler, null_callback_handler
 
-    with streamable_http_mcp_client:
-        base_tools = [calculator, think, python_repl, file_write, current_time]
-        mcp_tools = streamable_http_mcp_client.list_tools_sync()
-        logger.info(f"Available MCP tools: {[tool.tool_name for tool in mcp_tools]}")
-        all_tools = base_tools + mcp_tools
+    from core.mcp_clients import mcp_clients
+    mcp_tools = mcp_clients.list_tools(url)
+    tools = profile_tools(tool_profile, mcp_tools)
 
-        bedrock_model = get_bedrock_model(
+    if bedrock_model is None:
+        bedrock_model = get_shared_bedrock_model(
             read_timeout=read_timeout,
             connect_timeout=connect_timeout,
             max_attempts=max_attempts
         )
 
-        agent = Agent(
-            model=bedrock_model,
-            tools=all_tools,
-            system_prompt=system_prompt
-        )
-        return agent(user_prompt)
+    agent = Agent(
+        model=bedrock_model,
+        tools=tools,
+        system_prompt=system_prompt,
+        callback_handler=null_callback_handler if quiet else PrintingCallbackHandler()
+    )
+    return run_cached(agent, system_prompt, user_prompt, mcp_tools, use_cache)
 
 def ai(
         system_prompt: str,
         user_prompt: str,
         read_timeout: int = 300,
         connect_timeout: int = 60,
-        max_attempts: int = 5) -> AgentResult:
+        max_attempts: int = 5,
+        latitude: float = MY_LATITUDE,
+        longitude: float = MY_LONGITUDE,
+        bedrock_model: 'BedrockModel | None' = None,
+        quiet: bool = False,
+        cache_usage: 'CacheUsageHandler | None' = None,
+        use_cache: bool = LLM_CACHE,
+        tool_profile: str = 'full') -> 'AgentResult':
     agent = get_agent(
         system_prompt=system_prompt,
         read_timeout=read_timeout,
         connect_timeout=connect_timeout,
-        max_attempts=max_attempts)
+        max_attempts=max_attempts,
+        latitude=latitude,
+        longitude=longitude,
+        bedrock_model=bedrock_model,
+        quiet=quiet,
+        cache_usage=cache_usage,
+        tool_profile=tool_profile)
+
+    return run_cached(agent, system_prompt, user_prompt, get_weather_tools(latitude, longitude), use_cache)
+
+
+def ai_stream(
+        system_prompt: str,
+        user_prompt: str,
+        writer: 'ReportWriter',
+        read_timeout: int = 300,
+        connect_timeout: int = 60,
+        max_attempts: int = 5,
+        latitude: float = MY_LATITUDE,
+        longitude: float = MY_LONGITUDE,
+        cache_usage: 'CacheUsageHandler | None' = None,
+        tool_profile: str = 'full') -> 'AgentResult':
+    """Like ai(), but the text is printed as it arrives and the reports are written by `writer` as they complete"""
+    from modules.weather.streaming import stream_reports
+
+    agent = get_agent(
+        system_prompt=system_prompt,
+        read_timeout=read_timeout,
+        connect_timeout=connect_timeout,
+        max_attempts=max_attempts,
+        latitude=latitude,
+        longitude=longitude,
+        quiet=True,
+        cache_usage=cache_usage,
+        tool_profile=tool_profile)
+
+    return asyncio.run(stream_reports(agent, user_message(user_prompt), writer))
+
+
+def fan_out_prompts(days: int, start: date, latitude: float, longitude: float) -> dict[str, str]:
+    """
+    Prompt of every report of a fanned out forecast, keyed by report file name.
+    Notes:
+        - The weather data is fetched once, each daily prompt only embeds the data of its day (CSV encoded).
+        - index.md is written from the daily summaries, not from the daily reports, so it does not wait for them.
+    """
+    from core.tracing import tracer
+    from modules.weather.detection import detect_extreme_weather
+    from modules.weather.summary import daily_summary
+    from modules.weather.tools import get_hourly_weather_data_tool
+
+    with tracer.start_as_current_span('weather.fan_out_prompts'):
+        hourly = get_hourly_weather_data_tool(latitude, longitude, start, start + timedelta(days=days - 1))
+        summary = daily_summary(hourly)
+        episodes = detect_extreme_weather(hourly).encode('csv')
+
+    prompts = {
+        f"forecast_{index}.md": DAY_FORECAST_PROMPT.format(
+            day=day.day.isoformat(),
+            index=index,
+            summary=DailyWeatherSummary(days=[day]).encode('csv'),
+            hourly=hourly.for_day(day.day).encode('csv'),
+            episodes=episodes)
+        for index, day in enumerate(summary.days)
+    }
+    prompts['index.md'] = INDEX_FORECAST_PROMPT.format(days=days, summary=summary.encode('csv'), episodes=episodes)
+    return prompts
+
+
+def ai_fan_out(
+        system_prompt: str,
+        days: int,
+        output: Path,
+        start: date | None = None,
+        latitude: float = MY_LATITUDE,
+        longitude: float = MY_LONGITUDE,
+        concurrency: int | None = None,
+        bedrock_model: 'BedrockModel | None' = None) -> 'RunUsage':
+    """
+    Write forecast_0..N.md and index.md with one small, independent agent call per report, run in parallel.
+    Notes:
+        - Unlike the single conversation of FORECAST_PROMPT, no call carries the data or the reports of the others,
+          and the agents have no tools: the data is in the prompt, the report is the answer.
+        - All calls run at once by default (`concurrency` = days + 1), on the shared BedrockModel.
+
+    Returns:
+        RunUsage: Tokens and wall time of every call and of the whole run
+    """
+    from strands import Agent
+
+    from core.tracing import in_current_context, tracer
+    from modules.weather.usage import CacheUsageHandler, CallUsage, RunUsage
+
+    began = time.perf_counter()
+    start = utc_now().date() if start is None else start
+    prompts = fan_out_prompts(days, start, latitude, longitude)
+    concurrency = concurrency or len(prompts)
+    if bedrock_model is None:
+        bedrock_model = get_shared_bedrock_model(max_pool_connections=concurrency)
+    output.mkdir(parents=True, exist_ok=True)
+
+    @in_current_context
+    def report(name: str, prompt: str) -> CallUsage:
+        cache_usage = CacheUsageHandler()
+        agent = Agent(
+            model=bedrock_model,
+            tools=[],
+            system_prompt=system_prompt,
+            callback_handler=cache_usage,
+        )
+        call_began = time.perf_counter()
+        with tracer.start_as_current_span('weather.report', attributes={'weather.report': name}):
+            result = agent(prompt)
+            usage = CallUsage.from_result(name, result, time.perf_counter() - call_began, cache_usage)
+            with tracer.start_as_current_span('weather.write_report', attributes={'weather.report': name}):
+                output.joinpath(name).write_text(str(result).strip() + '\n', encoding='utf-8')
+        logger.info(f"[ai_fan_out] Wrote {name} in {usage.seconds:.1f}s ({usage.input_tokens} input tokens)")
+        return usage
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        calls = list(executor.map(report, prompts.keys(), prompts.values()))
 
-    return agent(user_prompt)
+    return RunUsage(mode='fan_out', calls=calls, seconds=time.perf_counter() - began)
@@ -1,6 +1,42 @@
-from datetime import datetime
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, timedelta
+from itertools import repeat
+from typing import Literal, Self, get_args
 
-from pydantic import BaseModel, Field
+from annotated_types import Ge, Gt, Le, Lt
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_serializer, model_validator
+
+# Tool output encodings: 'json' is the MeteoData shape (one object per reading), 'columns' a shared time
+# index plus one array per variable, 'csv' one row per hour
+Encoding = Literal['json', 'columns', 'csv']
+
+
+class EncodedModel(BaseModel, ABC):
+    """
+    Tool output with compact encodings.
+    Notes:
+        - Subclasses render every Encoding in `encode`.
+        - `encoded` returns a copy whose str() (what a Strands tool sends to the model) uses one of them.
+    """
+    _encoding: Encoding = PrivateAttr(default='json')
+
+    def __str__(self) -> str:
+        return self.encode(self._encoding)
+
+    def encoded(self, encoding: Encoding) -> Self:
+        copy = self.model_copy()
+        copy._encoding = encoding
+        return copy
+
+    @abstractmethod
+    def encode(self, encoding: Encoding = 'json') -> str:
+        ...
 
 
 class TemperatureReading(BaseModel):
@@ -39,11 +75,332 @@ class SurfacePressureReading(BaseModel):
     value: float = Field(..., gt=0, description="Surface pressure in hPa")
 
 
+class WindSpeedReading(BaseModel):
+    """Wind speed reading at 10 meters"""
+    time: datetime = Field(..., description="Timestamp")
+    value: float = Field(..., ge=0, description="Wind speed in km/h")
+
+
+class WindDirectionReading(BaseModel):
+    """Wind direction reading at 10 meters"""
+    time: datetime = Field(..., description="Timestamp")
+    value: int = Field(..., ge=0, le=360, description="Direction the wind blows from in degrees (0 is north)")
+
+
 class MeteoData(BaseModel):
-    """Model to store meteorological data"""
-    temperature: list[TemperatureReading] = Field(..., description="List of temperature readings")
-    humidity: list[HumidityReading] = Field(..., description="List of humidity readings")
-    apparent_temperature: list[ApparentTemperatureReading] = Field(..., description="List of apparent temperature readings")
-    precipitation: list[PrecipitationReading] = Field(..., description="List of precipitation readings")
-    evapotranspiration: list[EvapotranspirationReading] = Field(..., description="List of evapotranspiration readings")
-    surface_pressure: list[SurfacePressureReading] = Field(..., description="List of surface pressure readings")
+    """Model to store meteorological data, only the requested variables are present"""
+    temperature: list[TemperatureReading] | None = Field(default=None, description="List of temperature readings")
+    humidity: list[HumidityReading] | None = Field(default=None, description="List of humidity readings")
+    apparent_temperature: list[ApparentTemperatureReading] | None = Field(
+        default=None, description="List of apparent temperature readings")
+    precipitation: list[PrecipitationReading] | None = Field(default=None, description="List of precipitation readings")
+    evapotranspiration: list[EvapotranspirationReading] | None = Field(
+        default=None, description="List of evapotranspiration readings")
+    surface_pressure: list[SurfacePressureReading] | None = Field(
+        default=None, description="List of surface pressure readings")
+    wind_speed: list[WindSpeedReading] | None = Field(default=None, description="List of wind speed readings")
+    wind_direction: list[WindDirectionReading] | None = Field(default=None, description="List of wind direction readings")
+
+
+# Hourly variables a weather tool can be asked for, the MeteoData fields
+HourlyVariable = Literal['temperature', 'humidity', 'apparent_temperature', 'precipitation', 'evapotranspiration',
+                         'surface_pressure', 'wind_speed', 'wind_direction']
+
+# MeteoData field -> reading model
+READINGS: dict[str, type[BaseModel]] = {
+    name: get_args(get_args(field.annotation)[0])[0] for name, field in MeteoData.model_fields.items()
+}
+
+
+class ReadingsView(Sequence):
+    """Read-only sequence over one column of a ColumnarMeteoData. Readings are built on access."""
+
+    def __init__(self, reading: type[BaseModel], time: list[datetime], values: array):
+        self._reading = reading
+        self._time = time
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._reading.model_construct(time=self._time[index], value=self._values[index])
+
+
+def _column_typecode(reading: type[BaseModel]) -> str:
+    return 'l' if reading.model_fields['value'].annotation is int else 'd'
+
+
+def _csv(header: list[str], rows: Iterable[Sequence]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _check_bounds(name: str, reading: type[BaseModel], values: array):
+    if not values:
+        return
+    low, high = min(values), max(values)
+    for constraint in reading.model_fields['value'].metadata:
+        if isinstance(constraint, Ge) and low < constraint.ge:
+            raise ValueError(f"{name} values must be greater than or equal to {constraint.ge}")
+        if isinstance(constraint, Gt) and low <= constraint.gt:
+            raise ValueError(f"{name} values must be greater than {constraint.gt}")
+        if isinstance(constraint, Le) and high > constraint.le:
+            raise ValueError(f"{name} values must be less than or equal to {constraint.le}")
+        if isinstance(constraint, Lt) and high >= constraint.lt:
+            raise ValueError(f"{name} values must be less than {constraint.lt}")
+
+
+class ColumnarMeteoData(EncodedModel):
+    """
+    Columnar variant of MeteoData: one shared time axis plus one compact array per variable.
+    Notes:
+        - Each MeteoData field (`temperature`, `humidity`, ...) is exposed as a ReadingsView, or None when the
+          variable was not requested. Columns are kept in the MeteoData field order.
+        - Serializes to the same JSON (and JSON schema) as MeteoData, without the variables not requested.
+        - Renders the compact encodings of EncodedModel.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    time: list[datetime] = Field(..., description="Shared time axis")
+    columns: dict[str, array] = Field(..., description="Value column per MeteoData field")
+
+    @field_validator('columns', mode='before')
+    @classmethod
+    def _to_arrays(cls, columns: dict) -> dict[str, array]:
+        unknown = set(columns) - set(READINGS)
+        if unknown:
+            raise ValueError(f"unknown columns {sorted(unknown)}, expected some of {list(READINGS)}")
+        arrays = {}
+        for name, values in sorted(columns.items(), key=lambda column: list(READINGS).index(column[0])):
+            typecode = _column_typecode(READINGS[name])
+            if isinstance(values, array) and values.typecode == typecode:
+                arrays[name] = values
+                continue
+            try:
+                arrays[name] = array(typecode, values)
+            except TypeError:
+                if typecode != 'l':
+                    raise ValueError(f"{name} values must be numbers")
+                # Integral floats are accepted, as they are by the reading models
+                if any(not isinstance(v, (int, float)) or v != int(v) for v in values):
+                    raise ValueError(f"{name} values must be integers")
+                arrays[name] = array(typecode, map(int, values))
+        return arrays
+
+    @model_validator(mode='after')
+    def _check_columns(self) -> 'ColumnarMeteoData':
+        for name, values in self.columns.items():
+            if len(values) != len(self.time):
+                raise ValueError(f"{name} has {len(values)} values for {len(self.time)} timestamps")
+            _check_bounds(name, READINGS[name], values)
+        return self
+
+    @model_serializer(mode='plain')
+    def _serialize(self) -> dict:
+        return {
+            name: [{'time': time, 'value': value} for time, value in zip(self.time, values)]
+            for name, values in self.columns.items()
+        }
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, core_schema, handler):
+        if handler.mode == 'serialization':
+            return handler(MeteoData.__pydantic_core_schema__)
+        return handler(core_schema)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def for_day(self, day: date) -> 'ColumnarMeteoData':
+        """Readings of one day (the time axis is sorted)"""
+        first = bisect_left(self.time, datetime.combine(day, datetime.min.time()))
+        last = bisect_left(self.time, datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        return ColumnarMeteoData(
+            time=self.time[first:last], columns={name: values[first:last] for name, values in self.columns.items()})
+
+    def time_index(self) -> list[str]:
+        return [time.isoformat(timespec='minutes') for time in self.time]
+
+    def to_columns(self) -> dict:
+        return {'time': self.time_index(), **{name: values.tolist() for name, values in self.columns.items()}}
+
+    def encode(self, encoding: Encoding = 'json') -> str:
+        if encoding == 'json':
+            return self.model_dump_json()
+        if encoding == 'columns':
+            return json.dumps(self.to_columns(), separators=(',', ':'))
+        if encoding == 'csv':
+            return _csv(['time', *self.columns], zip(self.time_index(), *self.columns.values()))
+        raise ValueError(f"Unknown encoding {encoding}")
+
+    def readings(self, name: str) -> ReadingsView | None:
+        if name not in self.columns:
+            return None
+        return ReadingsView(READINGS[name], self.time, self.columns[name])
+
+    @property
+    def temperature(self) -> ReadingsView | None:
+        return self.readings('temperature')
+
+    @property
+    def humidity(self) -> ReadingsView | None:
+        return self.readings('humidity')
+
+    @property
+    def apparent_temperature(self) -> ReadingsView | None:
+        return self.readings('apparent_temperature')
+
+    @property
+    def precipitation(self) -> ReadingsView | None:
+        return self.readings('precipitation')
+
+    @property
+    def evapotranspiration(self) -> ReadingsView | None:
+        return self.readings('evapotranspiration')
+
+    @property
+    def surface_pressure(self) -> ReadingsView | None:
+        return self.readings('surface_pressure')
+
+    @property
+    def wind_speed(self) -> ReadingsView | None:
+        return self.readings('wind_speed')
+
+    @property
+    def wind_direction(self) -> ReadingsView | None:
+        return self.readings('wind_direction')
+
+    @classmethod
+    def from_meteo_data(cls, meteo: MeteoData) -> 'ColumnarMeteoData':
+        readings = {name: getattr(meteo, name) for name in READINGS if getattr(meteo, name) is not None}
+        return cls(
+            time=[reading.time for reading in next(iter(readings.values()), [])],
+            columns={name: [reading.value for reading in values] for name, values in readings.items()})
+
+    def to_meteo_data(self) -> MeteoData:
+        return MeteoData.model_validate(self.model_dump())
+
+
+class Location(BaseModel):
+    """Geographic point to fetch weather data for"""
+    model_config = ConfigDict(frozen=True)
+
+    latitude: float = Field(..., ge=-90, le=90, description="Latitude in degrees")
+    longitude: float = Field(..., ge=-180, le=180, description="Longitude in degrees")
+    name: str | None = Field(default=None, description="Optional site name")
+
+
+class LocationMeteoData(BaseModel):
+    """Weather data of one location in a batch"""
+    location: Location = Field(..., description="Location of the readings")
+    data: ColumnarMeteoData = Field(..., description="Weather readings for the location")
+
+
+class MeteoDataBatch(EncodedModel):
+    """Weather data for several locations, encoded like ColumnarMeteoData (CSV rows start with the location)"""
+    items: list[LocationMeteoData] = Field(..., description="Weather data per location")
+
+    def encode(self, encoding: Encoding = 'json') -> str:
+        if encoding == 'json':
+            return self.model_dump_json()
+        if encoding == 'columns':
+            return json.dumps({'items': [
+                {'location': item.location.model_dump(), 'data': item.data.to_columns()} for item in self.items
+            ]}, separators=(',', ':'))
+        if encoding == 'csv':
+            names = [name for name in READINGS if any(name in item.data.columns for item in self.items)]
+            return _csv(['name', 'latitude', 'longitude', 'time', *names], (
+                (item.location.name or '', item.location.latitude, item.location.longitude, *row)
+                for item in self.items
+                for row in zip(item.data.time_index(),
+                               *(item.data.columns.get(name, repeat('')) for name in names))))
+        raise ValueError(f"Unknown encoding {encoding}")
+
+    @classmethod
+    def from_mapping(cls, data: dict[Location, ColumnarMeteoData]) -> 'MeteoDataBatch':
+        return cls(items=[LocationMeteoData(location=location, data=meteo) for location, meteo in data.items()])
+
+
+class DailySummary(BaseModel):
+    """Weather of one day (GMT) aggregated from the hourly readings"""
+    day: date = Field(..., description="Day")
+    hours: int = Field(..., description="Hourly readings aggregated, less than 24 for partial days")
+    temperature_max: float = Field(..., description="Maximum temperature in °C")
+    temperature_min: float = Field(..., description="Minimum temperature in °C")
+    temperature_mean: float = Field(..., description="Mean temperature in °C")
+    apparent_temperature_max: float = Field(..., description="Maximum apparent temperature in °C")
+    humidity_min: int = Field(..., ge=0, le=100, description="Minimum relative humidity in %")
+    humidity_max: int = Field(..., ge=0, le=100, description="Maximum relative humidity in %")
+    precipitation: float = Field(..., ge=0, description="Total precipitation in mm")
+    precipitation_hours: int = Field(..., ge=0, description="Hours with precipitation")
+    evapotranspiration: float = Field(..., description="Total evapotranspiration in mm")
+    surface_pressure_mean: float = Field(..., gt=0, description="Mean surface pressure in hPa")
+    extreme_heat: bool = Field(..., description="Maximum and minimum temperature reach the local heat thresholds")
+    heat_wave: bool = Field(..., description="Part of a run of consecutive extreme heat days")
+
+
+class DailyWeatherSummary(EncodedModel):
+    """Daily aggregates for a date range, encoded like ColumnarMeteoData (one column or CSV row per day)"""
+    days: list[DailySummary] = Field(..., description="One summary per day")
+
+    def encode(self, encoding: Encoding = 'json') -> str:
+        if encoding == 'json':
+            return self.model_dump_json()
+        fields = list(DailySummary.model_fields)
+        rows = [[day.day.isoformat(), *(getattr(day, name) for name in fields[1:])] for day in self.days]
+        if encoding == 'columns':
+            return json.dumps({name: [row[index] for row in rows] for index, name in enumerate(fields)},
+                              separators=(',', ':'))
+        if encoding == 'csv':
+            return _csv(fields, rows)
+        raise ValueError(f"Unknown encoding {encoding}")
+
+
+class ExtremeWeatherThresholds(BaseModel):
+    """Local thresholds used to detect extreme weather episodes"""
+    heat_max_temperature: float = Field(..., description="Daily maximum temperature of an extreme heat day in °C")
+    heat_min_temperature: float = Field(..., description="Daily minimum temperature of an extreme heat day in °C")
+    heat_wave_min_days: int = Field(..., ge=1, description="Consecutive extreme heat days of a heat wave")
+    tropical_night_temperature: float = Field(..., description="Night (20:00-08:00) minimum temperature of a tropical night in °C")
+    heavy_precipitation_daily: float = Field(..., ge=0, description="Daily precipitation of a heavy precipitation day in mm")
+    heavy_precipitation_hourly: float = Field(..., ge=0, description="Hourly precipitation of a heavy precipitation day in mm")
+
+
+class WeatherEpisode(BaseModel):
+    """Run of consecutive days meeting the thresholds of one kind of extreme weather"""
+    kind: Literal['heat_wave', 'tropical_nights', 'heavy_precipitation'] = Field(..., description="Kind of episode")
+    start: date = Field(..., description="First day (for tropical nights, the evening of the first night)")
+    end: date = Field(..., description="Last day (for tropical nights, the evening of the last night)")
+    days: int = Field(..., ge=1, description="Days (or nights) in the episode")
+    temperature_max: float = Field(..., description="Highest temperature of the episode days in °C")
+    night_temperature_min: float | None = Field(..., description="Lowest night temperature of the episode in °C, "
+                                                                 "null when a night is not fully in the range")
+    precipitation: float = Field(..., ge=0, description="Total precipitation of the episode days in mm")
+
+
+class ExtremeWeatherReport(EncodedModel):
+    """Extreme weather episodes of a date range, encoded like DailyWeatherSummary (one column or CSV row per episode)"""
+    thresholds: ExtremeWeatherThresholds = Field(..., description="Thresholds used for the detection")
+    episodes: list[WeatherEpisode] = Field(..., description="Episodes sorted by start day")
+
+    def encode(self, encoding: Encoding = 'json') -> str:
+        """The 'csv' encoding starts with a `# thresholds: name=value, ...` line, then one row per episode"""
+        if encoding == 'json':
+            return self.model_dump_json()
+        fields = list(WeatherEpisode.model_fields)
+        rows = [list(episode.model_dump(mode='json').values()) for episode in self.episodes]
+        if encoding == 'columns':
+            return json.dumps({
+                'thresholds': self.thresholds.model_dump(),
+                **{name: [row[index] for row in rows] for index, name in enumerate(fields)}
+            }, separators=(',', ':'))
+        if encoding == 'csv':
+            thresholds = ', '.join(f"{name}={value}" for name, value in self.thresholds.model_dump().items())
+            return f"# thresholds: {thresholds}\n" + _csv(fields, rows)
+        raise ValueError(f"Unknown encoding {encoding}")
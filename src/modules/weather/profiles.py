@@ -0,0 +1,63 @@
+import logging
+from typing import Any, Iterable
+
+from pydantic import BaseModel, ConfigDict
+
+logger = logging.getLogger(__name__)
+
+# Weather tools of one location, the same names locally (Tools) and on the MCP server, plus the current time
+# the agent needs to turn "tomorrow" or "the next 5 days" into dates
+WEATHER_TOOLS = frozenset({'current_time', 'get_hourly_weather_data', 'get_daily_weather_summary', 'get_extreme_weather'})
+
+
+def tool_name(agent_tool: Any) -> str:
+    """Name of a tool as the model sees it: decorated and MCP tools carry it, strands_tools modules are named after it"""
+    return getattr(agent_tool, 'tool_name', None) or agent_tool.__name__.rsplit('.', 1)[-1]
+
+
+class ToolProfile(BaseModel):
+    """
+    Named set of tools an agent is given.
+    Notes:
+        - The spec of every tool is sent on every model call, a profile keeps the ones the command needs and spares
+          the model detours through tools that do not help it (python_repl, think).
+        - `tools=None` keeps every available tool.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    description: str
+    tools: frozenset[str] | None = None
+
+    def select(self, agent_tools: Iterable[Any]) -> list:
+        """The tools of `agent_tools` in this profile, in their order"""
+        agent_tools = list(agent_tools)
+        if self.tools is None:
+            return agent_tools
+        selected = [agent_tool for agent_tool in agent_tools if tool_name(agent_tool) in self.tools]
+        missing = self.tools - {tool_name(agent_tool) for agent_tool in selected}
+        if missing:
+            logger.warning(f"[ToolProfile.select] Tools of the {self.name} profile not available: {', '.join(sorted(missing))}")
+        return selected
+
+
+TOOL_PROFILES = {profile.name: profile for profile in [
+    ToolProfile(
+        name='full',
+        description='every general purpose tool (calculator, think, python_repl, file_write, current_time) and weather tool'),
+    ToolProfile(
+        name='weather',
+        description='the weather tools and current_time, for agents whose answer is the report',
+        tools=WEATHER_TOOLS),
+    ToolProfile(
+        name='writer',
+        description='the weather profile plus file_write, for agents saving their reports',
+        tools=WEATHER_TOOLS | {'file_write'}),
+]}
+
+
+def get_tool_profile(name: str) -> ToolProfile:
+    try:
+        return TOOL_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown tool profile {name!r}, expected one of: {', '.join(TOOL_PROFILES)}") from None
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from pydantic import BaseModel
+
+from settings import WEATHER_MODEL_UPDATE_INTERVAL, WEATHER_RESPONSE_CACHE_SIZE
+
+
+class CachedResponse(BaseModel):
+    """Serialized tool response, `etag` identifies the body"""
+    body: str
+    etag: str
+    expires_at: float | None = None
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized tool responses, used by the MCP server.
+    Notes:
+        - Values are the JSON text sent to the client, a hit skips the fetch and the pydantic serialization.
+        - Responses reaching into the future expire at the next Open-Meteo model update (the next multiple of
+          `update_interval` seconds), responses that only cover the past do not expire.
+        - At most `max_entries` responses are kept, least recently used ones are dropped first.
+    """
+
+    def __init__(self,
+                 max_entries: int = WEATHER_RESPONSE_CACHE_SIZE,
+                 update_interval: int = WEATHER_MODEL_UPDATE_INTERVAL):
+        self.max_entries = max_entries
+        self.update_interval = update_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def next_update(self, now: float) -> float:
+        return (now // self.update_interval + 1) * self.update_interval
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None and response.expires_at is not None and response.expires_at <= time.time():
+                del self._entries[key]
+                response = None
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: Hashable, body: str, immutable: bool = False) -> CachedResponse:
+        response = CachedResponse(
+            body=body,
+            etag=hashlib.sha256(body.encode()).hexdigest()[:32],
+            expires_at=None if immutable else self.next_update(time.time()))
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': sum(len(response.body) for response in self._entries.values()),
+            }
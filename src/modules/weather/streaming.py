@@ -0,0 +1,93 @@
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, TextIO
+
+from strands import Agent
+from strands.agent import AgentResult
+
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Line that starts a report in a streamed answer, e.g. <!-- file: forecast_0.md -->
+REPORT_MARKER = re.compile(r'^\s*<!--\s*file:\s*([\w.-]+\.md)\s*-->\s*$')
+
+
+class ReportWriter:
+    """
+    Split a streamed answer into report files.
+    Notes:
+        - Each report starts with a REPORT_MARKER line naming its file, the text before the first marker is dropped.
+        - A report is written to `output` as soon as the next marker (or the end of the answer) shows it is complete.
+        - Chunks can split lines and markers anywhere, only whole lines are inspected.
+    """
+
+    def __init__(self, output: Path, on_report: Callable[[Path], None] | None = None):
+        self.output = output
+        self.on_report = on_report
+        self.written: list[Path] = []
+        self._name: str | None = None
+        self._lines: list[str] = []
+        self._partial = ''
+
+    def feed(self, text: str):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+
+    def close(self) -> list[Path]:
+        if self._partial:
+            self._line(self._partial)
+            self._partial = ''
+        self._flush()
+        return self.written
+
+    def _line(self, line: str):
+        marker = REPORT_MARKER.match(line)
+        if marker:
+            self._flush()
+            self._name = marker.group(1)
+        elif self._name is not None:
+            self._lines.append(line)
+
+    def _flush(self):
+        if self._name is None:
+            return
+        path = self.output.joinpath(self._name)
+        with tracer.start_as_current_span('weather.write_report', attributes={'weather.report': self._name}):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('\n'.join(self._lines).strip() + '\n', encoding='utf-8')
+        self.written.append(path)
+        logger.info(f"[ReportWriter] Wrote {path}")
+        if self.on_report:
+            self.on_report(path)
+        self._name, self._lines = None, []
+
+
+async def stream_reports(agent: Agent, prompt: str | list[dict], writer: ReportWriter, out: TextIO = sys.stdout) -> AgentResult:
+    """
+    Run the agent through its async event stream, echoing the text to `out` and feeding it to `writer`.
+    Notes:
+        - The agent should be built with `quiet=True`, the text is printed here and not by its callback handler.
+        - The time to the first text chunk is logged, it is what the user waits for before seeing any output.
+    """
+    start = time.perf_counter()
+    first_output = None
+    result = None
+    async for event in agent.stream_async(prompt):
+        if event.get('data'):
+            if first_output is None:
+                first_output = time.perf_counter() - start
+                logger.info(f"[stream_reports] First output after {first_output:.2f}s")
+            out.write(event['data'])
+            out.flush()
+            writer.feed(event['data'])
+        if 'result' in event:
+            result = event['result']
+    writer.close()
+    logger.info(f"[stream_reports] Finished after {time.perf_counter() - start:.2f}s, {len(writer.written)} reports written")
+    return result
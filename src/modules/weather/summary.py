@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from core.tracing import tracer
+from modules.weather.models import ColumnarMeteoData, DailySummary, DailyWeatherSummary
+from settings import HEAT_MAX_TEMPERATURE, HEAT_MIN_TEMPERATURE, HEAT_WAVE_MIN_DAYS
+
+PRECIPITATION_THRESHOLD = 0.1
+
+
+def to_frame(data: ColumnarMeteoData) -> pd.DataFrame:
+    """Hourly DataFrame indexed by time, built straight from the column buffers (no per-reading objects)"""
+    return pd.DataFrame(
+        {name: np.frombuffer(values, dtype=values.typecode) for name, values in data.columns.items()},
+        index=pd.DatetimeIndex(data.time, name='time'))
+
+
+def runs(flags: pd.Series, min_days: int = 1) -> pd.Series:
+    """Label each flagged day with the id of its run of consecutive flagged days, runs shorter than `min_days` are dropped"""
+    ids = (flags != flags.shift()).cumsum()[flags]
+    return ids[ids.map(ids.value_counts()) >= min_days]
+
+
+def heat_wave_days(extreme_heat: pd.Series, min_days: int) -> pd.Series:
+    """
+    Flag the days that belong to a run of at least `min_days` consecutive extreme heat days.
+    Notes:
+        - `extreme_heat` is indexed by day. A calendar day without readings breaks a run, as in
+          detect_extreme_weather, so both tools report the same heat waves.
+    """
+    days = pd.DatetimeIndex(extreme_heat.index)
+    calendar = extreme_heat.set_axis(days).asfreq('D', fill_value=False)
+    return pd.Series(days.isin(runs(calendar, min_days).index), index=extreme_heat.index)
+
+
+@tracer.start_as_current_span('weather.daily_summary')
+def daily_summary(data: ColumnarMeteoData,
+                  max_temperature: float = HEAT_MAX_TEMPERATURE,
+                  min_temperature: float = HEAT_MIN_TEMPERATURE,
+                  min_days: int = HEAT_WAVE_MIN_DAYS) -> DailyWeatherSummary:
+    """
+    Aggregate hourly readings into one DailySummary per day.
+    Notes:
+        - A day has extreme heat when its maximum reaches `max_temperature` and its minimum reaches `min_temperature`.
+        - Heat wave days are extreme heat days inside a run of at least `min_days` consecutive calendar days within
+          the requested range.
+    """
+    if not len(data):
+        return DailyWeatherSummary(days=[])
+
+    frame = to_frame(data)
+    frame['wet'] = frame['precipitation'] >= PRECIPITATION_THRESHOLD
+    daily = frame.groupby(frame.index.date).agg(
+        hours=('temperature', 'size'),
+        temperature_max=('temperature', 'max'),
+        temperature_min=('temperature', 'min'),
+        temperature_mean=('temperature', 'mean'),
+        apparent_temperature_max=('apparent_temperature', 'max'),
+        humidity_min=('humidity', 'min'),
+        humidity_max=('humidity', 'max'),
+        precipitation=('precipitation', 'sum'),
+        precipitation_hours=('wet', 'sum'),
+        evapotranspiration=('evapotranspiration', 'sum'),
+        surface_pressure_mean=('surface_pressure', 'mean'),
+    ).round(1)
+    daily['extreme_heat'] = (daily['temperature_max'] >= max_temperature) & (daily['temperature_min'] >= min_temperature)
+    daily['heat_wave'] = heat_wave_days(daily['extreme_heat'], min_days)
+
+    return DailyWeatherSummary(days=[
+        DailySummary(day=day, **row) for day, row in zip(daily.index, daily.to_dict('records'))
+    ])
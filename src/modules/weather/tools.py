@@ -1,74 +1,314 @@
+import asyncio
 import logging
-from datetime import datetime, date
-from typing import List
+from collections import defaultdict
+from datetime import datetime, date, time
+from typing import List, Sequence
 
-import requests
+from opentelemetry import trace
 from strands import tool
 
+from core.tracing import tracer
+from modules.weather.cache import Segment, get_cache, merge_segments
+from modules.weather.client import async_client, client
 from modules.weather.models import (
-    TemperatureReading, HumidityReading, ApparentTemperatureReading,
-    PrecipitationReading, EvapotranspirationReading, SurfacePressureReading, MeteoData)
+    ColumnarMeteoData, DailyWeatherSummary, Encoding, ExtremeWeatherReport, HourlyVariable, Location, MeteoDataBatch)
+from modules.weather.singleflight import AsyncSingleFlight, SingleFlight
+from settings import WEATHER_API_URL, WEATHER_BATCH_SIZE, WEATHER_TOOL_ENCODING
 
 logger = logging.getLogger(__name__)
 
+# summary and detection (pandas) are imported by the tools that aggregate, most commands never load them
 
-def get_hourly_weather_data_tool(latitude: float, longitude: float, from_date: date, to_date: date) -> MeteoData:
+# Concurrent identical requests share one upstream fetch
+weather_flight = SingleFlight()
+async_weather_flight = AsyncSingleFlight()
+
+# MeteoData field -> Open-Meteo hourly variable
+HOURLY_VARIABLES = {
+    'temperature': 'temperature_2m',
+    'humidity': 'relative_humidity_2m',
+    'apparent_temperature': 'apparent_temperature',
+    'precipitation': 'precipitation',
+    'evapotranspiration': 'evapotranspiration',
+    'surface_pressure': 'surface_pressure',
+    'wind_speed': 'wind_speed_10m',
+    'wind_direction': 'wind_direction_10m',
+}
+
+
+def upstream_variables(variables: Sequence[str] | None = None) -> list[str]:
     """
-    Get hourly weather data for a specific date range.
+    Open-Meteo hourly variables of the MeteoData fields in `variables`, in HOURLY_VARIABLES order.
+    Notes:
+        - None (or an empty list) selects every variable.
+    """
+    if not variables:
+        return list(HOURLY_VARIABLES.values())
+    unknown = set(variables) - set(HOURLY_VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown hourly variables {sorted(unknown)}, expected some of {list(HOURLY_VARIABLES)}")
+    return [variable for field, variable in HOURLY_VARIABLES.items() if field in variables]
+
+
+@tracer.start_as_current_span('weather.parse_hourly_weather_data')
+def parse_hourly_weather_data(data: dict) -> ColumnarMeteoData:
+    """
+    Decode an Open-Meteo response into a ColumnarMeteoData object in a single pass.
+    Notes:
+        - The time axis is parsed once and shared by every hourly column.
+        - Each column is copied once into a compact array and validated as a whole.
+        - Only the variables present in the response become columns.
+
+    Returns:
+        ColumnarMeteoData: Object containing the decoded weather readings
+    """
+    hourly = data['hourly']
+    return ColumnarMeteoData(
+        time=[datetime.fromisoformat(iso) for iso in hourly['time']],
+        columns={field: hourly[variable] for field, variable in HOURLY_VARIABLES.items() if variable in hourly})
+
+
+def _format_range(start: datetime, end: datetime) -> tuple[str, str, str]:
+    """Whole-day ranges are expressed as dates, partial days as hours"""
+    if start.time() == time.min and end.time() == time(hour=23):
+        return 'date', start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+    return 'hour', start.isoformat(timespec='minutes'), end.isoformat(timespec='minutes')
+
+
+def hourly_weather_url(latitude: float | Sequence[float], longitude: float | Sequence[float],
+                       variables: list[str], start: datetime, end: datetime) -> str:
+    """
+    Build the Open-Meteo URL for the hourly variables in [start, end].
     Notes:
-        - The response is a MeteoData object containing lists of readings for temperature, humidity,
-          apparent temperature, precipitation, evapotranspiration, and surface pressure.
-        - Each reading has a timestamp and a value.
+        - Whole-day ranges are requested with start_date/end_date, partial days with start_hour/end_hour.
+        - Several locations can be requested at once with sequences of latitudes and longitudes.
+    """
+    unit, first, last = _format_range(start, end)
+    if isinstance(latitude, Sequence):
+        latitude, longitude = ','.join(map(str, latitude)), ','.join(map(str, longitude))
+    return (f"{WEATHER_API_URL}?"
+            f"latitude={latitude}&"
+            f"longitude={longitude}&"
+            f"hourly={','.join(variables)}&"
+            f"start_{unit}={first}&"
+            f"end_{unit}={last}")
+
+
+def _log_fetch(start: datetime, end: datetime, data: dict):
+    _, first, last = _format_range(start, end)
+    logger.info(f"[get_hourly_weather_data] Fetched weather data from {first} to {last}. {len(data['hourly']['time'])} records found.")
+
+
+def fetch_hourly_weather_data(latitude: float, longitude: float, variables: list[str], start: datetime, end: datetime) -> dict:
+    """
+    Fetch the hourly variables for [start, end] from Open-Meteo.
 
     Returns:
-        MeteoData: Object containing weather readings for the specified date range
-    """
-
-    start_date = from_date.strftime('%Y-%m-%d')
-    end_date = to_date.strftime('%Y-%m-%d')
-    url = (f"https://api.open-meteo.com/v1/forecast?"
-           f"latitude={latitude}&"
-           f"longitude={longitude}&"
-           f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure&"
-           f"start_date={start_date}&"
-           f"end_date={end_date}")
-    response = requests.get(url)
-
-    meteo = MeteoData(
-        temperature=[],
-        humidity=[],
-        apparent_temperature=[],
-        precipitation=[],
-        evapotranspiration=[],
-        surface_pressure=[]
-    )
+        dict: Raw Open-Meteo response
+    """
+    response = client.get(hourly_weather_url(latitude, longitude, variables, start, end))
     data = response.json()
+    _log_fetch(start, end, data)
+    return data
+
+
+def fetch_hourly_weather_data_batch(locations: list[Location], variables: list[str], start: datetime, end: datetime) -> list[dict]:
+    """
+    Fetch the hourly variables for [start, end] for several locations in one Open-Meteo request.
 
-    weather_data_time = data['hourly']['time']
-
-    logger.info(f"[get_hourly_weather_data] Fetched weather data from {start_date} to {end_date}. {len(weather_data_time)} records found.")
-    for iso in weather_data_time:
-        time = datetime.fromisoformat(iso)
-        meteo.temperature.append(TemperatureReading(
-            time=time,
-            value=data['hourly']['temperature_2m'][data['hourly']['time'].index(iso)]))
-        meteo.humidity.append(HumidityReading(
-            time=time,
-            value=data['hourly']['relative_humidity_2m'][data['hourly']['time'].index(iso)]))
-        meteo.apparent_temperature.append(ApparentTemperatureReading(
-            time=time,
-            value=data['hourly']['apparent_temperature'][data['hourly']['time'].index(iso)]))
-        meteo.precipitation.append(PrecipitationReading(
-            time=time,
-            value=data['hourly']['precipitation'][data['hourly']['time'].index(iso)]))
-        meteo.evapotranspiration.append(EvapotranspirationReading(
-            time=time,
-            value=data['hourly']['evapotranspiration'][data['hourly']['time'].index(iso)]))
-        meteo.surface_pressure.append(SurfacePressureReading(
-            time=time,
-            value=data['hourly']['surface_pressure'][data['hourly']['time'].index(iso)]))
+    Returns:
+        list[dict]: Raw Open-Meteo response of every location, in the same order as `locations`
+    """
+    response = client.get(hourly_weather_url(
+        [location.latitude for location in locations], [location.longitude for location in locations],
+        variables, start, end))
+    data = response.json()
+    data = data if isinstance(data, list) else [data]
+
+    _, first, last = _format_range(start, end)
+    logger.info(f"[get_hourly_weather_data_batch] Fetched weather data for {len(locations)} locations from {first} to {last}.")
+    return data
+
+
+async def fetch_hourly_weather_data_async(latitude: float, longitude: float, variables: list[str], start: datetime, end: datetime) -> dict:
+    """Async version of fetch_hourly_weather_data"""
+    response = await async_client.get(hourly_weather_url(latitude, longitude, variables, start, end))
+    data = response.json()
+    _log_fetch(start, end, data)
+    return data
+
+
+def _hour_range(from_date: date, to_date: date) -> tuple[datetime, datetime]:
+    return datetime.combine(from_date, time.min), datetime.combine(to_date, time(hour=23))
+
+
+def _merge_and_store(latitude: float, longitude: float, variables: list[str],
+                     segments: list[Segment], fetched: list[Segment]) -> ColumnarMeteoData:
+    meteo = parse_hourly_weather_data(merge_segments(segments, variables))
+    cache = get_cache()
+    for segment in fetched:
+        cache.put(latitude, longitude, variables, segment.start, segment.end, segment.data)
     return meteo
 
+
+def get_hourly_weather_data_tool(latitude: float, longitude: float, from_date: date, to_date: date,
+                                 variables: Sequence[HourlyVariable] | None = None) -> ColumnarMeteoData:
+    """
+    Get hourly weather data for a specific date range.
+    Notes:
+        - The response is a ColumnarMeteoData object exposing lists of readings for the requested `variables`
+          (temperature, humidity, apparent temperature, precipitation, evapotranspiration, surface pressure,
+          wind speed and wind direction), all of them by default.
+        - Only the requested variables are asked to Open-Meteo (the `hourly` query parameter).
+        - Each reading has a timestamp and a value. It serializes exactly like MeteoData.
+        - Responses are cached on disk (see modules.weather.cache). Only the hours missing from the
+          cache are fetched, then merged with the cached rows. Cached responses with more variables are reused.
+        - Concurrent calls for the same location and range are coalesced into one (see weather_flight).
+
+    Returns:
+        ColumnarMeteoData: Object containing weather readings for the specified date range
+    """
+    variables = upstream_variables(variables)
+    return weather_flight.do(
+        (latitude, longitude, from_date, to_date, tuple(variables)),
+        _get_hourly_weather_data, latitude, longitude, from_date, to_date, variables)
+
+
+def _trace_segments(segments: list[Segment], fetched: list[Segment]):
+    trace.get_current_span().set_attributes({
+        'weather.cached_segments': len(segments) - len(fetched), 'weather.fetched_segments': len(fetched)})
+
+
+@tracer.start_as_current_span('weather.get_hourly_weather_data')
+def _get_hourly_weather_data(latitude: float, longitude: float, from_date: date, to_date: date,
+                             variables: list[str]) -> ColumnarMeteoData:
+    start, end = _hour_range(from_date, to_date)
+    segments = get_cache().lookup(latitude, longitude, variables, start, end)
+
+    fetched = [segment for segment in segments if segment.data is None]
+    _trace_segments(segments, fetched)
+    for segment in fetched:
+        data = fetch_hourly_weather_data(latitude, longitude, variables, segment.start, segment.end)
+        segment.data = {'hourly': data['hourly']}
+    return _merge_and_store(latitude, longitude, variables, segments, fetched)
+
+
+async def get_hourly_weather_data_tool_async(latitude: float, longitude: float, from_date: date, to_date: date,
+                                             variables: Sequence[HourlyVariable] | None = None) -> ColumnarMeteoData:
+    """
+    Async version of get_hourly_weather_data_tool for asyncio callers (FastMCP server).
+    Notes:
+        - Missing ranges are fetched concurrently with the async client.
+        - Cache reads and writes (SQLite) run in a worker thread, so the event loop is never blocked.
+        - Concurrent calls for the same location and range are coalesced into one (see async_weather_flight).
+
+    Returns:
+        ColumnarMeteoData: Object containing weather readings for the specified date range
+    """
+    variables = upstream_variables(variables)
+    return await async_weather_flight.do(
+        (latitude, longitude, from_date, to_date, tuple(variables)),
+        _get_hourly_weather_data_async, latitude, longitude, from_date, to_date, variables)
+
+
+@tracer.start_as_current_span('weather.get_hourly_weather_data')
+async def _get_hourly_weather_data_async(latitude: float, longitude: float, from_date: date, to_date: date,
+                                         variables: list[str]) -> ColumnarMeteoData:
+    start, end = _hour_range(from_date, to_date)
+    segments = await asyncio.to_thread(get_cache().lookup, latitude, longitude, variables, start, end)
+
+    fetched = [segment for segment in segments if segment.data is None]
+    _trace_segments(segments, fetched)
+    responses = await asyncio.gather(*(
+        fetch_hourly_weather_data_async(latitude, longitude, variables, segment.start, segment.end)
+        for segment in fetched))
+    for segment, data in zip(fetched, responses):
+        segment.data = {'hourly': data['hourly']}
+    return await asyncio.to_thread(_merge_and_store, latitude, longitude, variables, segments, fetched)
+
+
+@tracer.start_as_current_span('weather.get_hourly_weather_data_batch')
+def get_hourly_weather_data_batch_tool(locations: list[Location], from_date: date, to_date: date,
+                                       variables: Sequence[HourlyVariable] | None = None) -> dict[Location, ColumnarMeteoData]:
+    """
+    Get hourly weather data for several locations and the same date range.
+    Notes:
+        - Locations missing the same hours are packed into one upstream request (comma-separated
+          coordinates), in chunks of WEATHER_BATCH_SIZE locations.
+        - Cached hours and the requested `variables` work per location exactly as in get_hourly_weather_data_tool.
+
+    Returns:
+        dict[Location, ColumnarMeteoData]: Weather readings per location
+    """
+    variables = upstream_variables(variables)
+    start, end = _hour_range(from_date, to_date)
+    cache = get_cache()
+    segments = {
+        location: cache.lookup(location.latitude, location.longitude, variables, start, end)
+        for location in dict.fromkeys(locations)}
+    fetched = {
+        location: [segment for segment in location_segments if segment.data is None]
+        for location, location_segments in segments.items()}
+
+    gaps: dict[tuple[datetime, datetime], list[tuple[Location, Segment]]] = defaultdict(list)
+    for location, missing in fetched.items():
+        for segment in missing:
+            gaps[(segment.start, segment.end)].append((location, segment))
+
+    for (gap_start, gap_end), missing in gaps.items():
+        for offset in range(0, len(missing), WEATHER_BATCH_SIZE):
+            chunk = missing[offset:offset + WEATHER_BATCH_SIZE]
+            responses = fetch_hourly_weather_data_batch([location for location, _ in chunk], variables, gap_start, gap_end)
+            for (_, segment), data in zip(chunk, responses, strict=True):
+                segment.data = {'hourly': data['hourly']}
+
+    return {
+        location: _merge_and_store(location.latitude, location.longitude, variables, segments[location], fetched[location])
+        for location in segments}
+
+
+def get_daily_weather_summary_tool(latitude: float, longitude: float, from_date: date, to_date: date) -> DailyWeatherSummary:
+    """
+    Get one summary per day (temperature extremes, humidity, precipitation, heat flags) for a date range.
+    Notes:
+        - Aggregated from get_hourly_weather_data_tool, so it shares its cache and request coalescing.
+        - All the variables are fetched, not only the aggregated ones: the summary is the first call of a forecast
+          and its cached response then serves every hourly request that follows, whatever its variables.
+        - A few hundred bytes per day instead of 24 readings of every variable, far fewer LLM input tokens.
+
+    Returns:
+        DailyWeatherSummary: One DailySummary per day of the range
+    """
+    from modules.weather.summary import daily_summary
+    return daily_summary(get_hourly_weather_data_tool(latitude, longitude, from_date, to_date))
+
+
+async def get_daily_weather_summary_tool_async(latitude: float, longitude: float, from_date: date, to_date: date) -> DailyWeatherSummary:
+    """Async version of get_daily_weather_summary_tool for asyncio callers (FastMCP server)"""
+    from modules.weather.summary import daily_summary
+    return daily_summary(await get_hourly_weather_data_tool_async(latitude, longitude, from_date, to_date))
+
+
+def get_extreme_weather_tool(latitude: float, longitude: float, from_date: date, to_date: date) -> ExtremeWeatherReport:
+    """
+    Detect heat waves, tropical nights and heavy precipitation episodes in a date range.
+    Notes:
+        - Computed from get_hourly_weather_data_tool with the local thresholds of detection.DEFAULT_THRESHOLDS.
+        - The model reads the episodes instead of scanning the hourly data for consecutive days itself.
+
+    Returns:
+        ExtremeWeatherReport: The thresholds and the detected episodes
+    """
+    from modules.weather.detection import detect_extreme_weather
+    return detect_extreme_weather(get_hourly_weather_data_tool(latitude, longitude, from_date, to_date))
+
+
+async def get_extreme_weather_tool_async(latitude: float, longitude: float, from_date: date, to_date: date) -> ExtremeWeatherReport:
+    """Async version of get_extreme_weather_tool for asyncio callers (FastMCP server)"""
+    from modules.weather.detection import detect_extreme_weather
+    return detect_extreme_weather(await get_hourly_weather_data_tool_async(latitude, longitude, from_date, to_date))
+
+
 class Tools:
     def __init__(self, latitude: float, longitude: float):
         self.latitude = latitude
@@ -76,12 +316,91 @@ class Tools:
 
     def get_tools(self) -> List[tool]:
         @tool
-        def get_hourly_weather_data(from_date: date, to_date: date) -> MeteoData:
+        def get_hourly_weather_data(from_date: date, to_date: date, variables: list[HourlyVariable] | None = None,
+                                    encoding: Encoding = WEATHER_TOOL_ENCODING) -> ColumnarMeteoData:
+            """
+            Get hourly weather data: temperature, humidity, apparent temperature, precipitation,
+            evapotranspiration, surface pressure, wind speed and wind direction.
+
+            Args:
+                from_date: First day of the range
+                to_date: Last day of the range
+                variables: Variables to return, ask only for the ones the answer needs (all of them when omitted)
+                encoding: 'columns' (a time index plus one array per variable), 'csv' (one row per hour)
+                    or 'json' (one object with time and value per reading)
+            """
             return get_hourly_weather_data_tool(
+                latitude=self.latitude,
+                longitude=self.longitude,
+                from_date=from_date,
+                to_date=to_date,
+                variables=variables
+            ).encoded(encoding)
+
+        @tool
+        def get_hourly_weather_data_batch(locations: list[Location], from_date: date, to_date: date,
+                                          variables: list[HourlyVariable] | None = None,
+                                          encoding: Encoding = WEATHER_TOOL_ENCODING) -> MeteoDataBatch:
+            """
+            Get hourly weather data for several locations at once.
+
+            Args:
+                locations: Locations (latitude, longitude and optional name) to get weather data for
+                from_date: First day of the range
+                to_date: Last day of the range
+                variables: Variables to return, ask only for the ones the answer needs (all of them when omitted)
+                encoding: 'columns' (a time index plus one array per variable), 'csv' (one row per hour)
+                    or 'json' (one object with time and value per reading)
+            """
+            return MeteoDataBatch.from_mapping(get_hourly_weather_data_batch_tool(
+                locations=locations,
+                from_date=from_date,
+                to_date=to_date,
+                variables=variables
+            )).encoded(encoding)
+
+        @tool
+        def get_daily_weather_summary(from_date: date, to_date: date,
+                                      encoding: Encoding = WEATHER_TOOL_ENCODING) -> DailyWeatherSummary:
+            """
+            Get daily weather aggregates: maximum, minimum and mean temperature, maximum apparent temperature,
+            humidity range, total precipitation and rainy hours, evapotranspiration, mean surface pressure,
+            and precomputed extreme heat and heat wave flags. Prefer it to the hourly data for daily forecasts.
+
+            Args:
+                from_date: First day of the range
+                to_date: Last day of the range
+                encoding: 'columns' (one array per aggregate), 'csv' (one row per day)
+                    or 'json' (one object per day)
+            """
+            return get_daily_weather_summary_tool(
+                latitude=self.latitude,
+                longitude=self.longitude,
+                from_date=from_date,
+                to_date=to_date
+            ).encoded(encoding)
+
+        @tool
+        def get_extreme_weather(from_date: date, to_date: date,
+                                encoding: Encoding = WEATHER_TOOL_ENCODING) -> ExtremeWeatherReport:
+            """
+            Get the extreme weather episodes of a date range, detected with local thresholds: heat waves
+            (consecutive extreme heat days), tropical nights (night minimum above the threshold) and heavy
+            precipitation days. Each episode has its first and last day, its length, the highest temperature,
+            the lowest night temperature and the total precipitation. No episodes means no extreme weather.
+
+            Args:
+                from_date: First day of the range
+                to_date: Last day of the range
+                encoding: 'columns' (thresholds plus one array per episode field), 'csv' (a thresholds line, then
+                    one row per episode)
+                    or 'json' (thresholds plus one object per episode)
+            """
+            return get_extreme_weather_tool(
                 latitude=self.latitude,
                 longitude=self.longitude,
                 from_date=from_date,
                 to_date=to_date
-            )
+            ).encoded(encoding)
 
-        return [get_hourly_weather_data, ]
+        return [get_hourly_weather_data, get_hourly_weather_data_batch, get_daily_weather_summary, get_extreme_weather, ]
@@ -0,0 +1,75 @@
+from pydantic import BaseModel, Field
+from strands.agent import AgentResult
+
+
+class CacheUsageHandler:
+    """
+    Strands callback handler adding up the prompt cache tokens reported by Bedrock for one agent.
+    Notes:
+        - Strands only accumulates input and output tokens, the cache counters are read from the raw metadata events.
+        - Bedrock does not count cached tokens in `inputTokens`, they are read (hit) or written (miss) separately.
+    """
+
+    def __init__(self):
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+
+    def __call__(self, **kwargs):
+        usage = (kwargs.get('event') or {}).get('metadata', {}).get('usage')
+        if usage:
+            self.cache_read_tokens += usage.get('cacheReadInputTokens', 0)
+            self.cache_write_tokens += usage.get('cacheWriteInputTokens', 0)
+
+
+class CallUsage(BaseModel):
+    """Tokens and wall time of one agent invocation"""
+    name: str = Field(..., description="What the call produced, e.g. the report file name")
+    input_tokens: int = Field(..., ge=0, description="Input tokens over every model call of the invocation")
+    output_tokens: int = Field(..., ge=0, description="Output tokens over every model call of the invocation")
+    cache_read_tokens: int = Field(0, ge=0, description="Input tokens read from the prompt cache")
+    cache_write_tokens: int = Field(0, ge=0, description="Input tokens written to the prompt cache")
+    seconds: float = Field(..., ge=0, description="Wall time of the invocation")
+
+    @classmethod
+    def from_result(cls, name: str, result: AgentResult, seconds: float,
+                    cache_usage: CacheUsageHandler | None = None) -> 'CallUsage':
+        usage = result.metrics.accumulated_usage
+        return cls(
+            name=name,
+            input_tokens=usage['inputTokens'],
+            output_tokens=usage['outputTokens'],
+            cache_read_tokens=cache_usage.cache_read_tokens if cache_usage else 0,
+            cache_write_tokens=cache_usage.cache_write_tokens if cache_usage else 0,
+            seconds=seconds)
+
+
+class RunUsage(BaseModel):
+    """Agent calls of one forecast run and its wall time (calls may overlap, so it is not their sum)"""
+    mode: str = Field(..., description="How the forecast was generated, e.g. 'single' or 'fan_out'")
+    calls: list[CallUsage] = Field(..., description="One entry per agent invocation")
+    seconds: float = Field(..., ge=0, description="Wall time of the run")
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(call.input_tokens for call in self.calls)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(call.output_tokens for call in self.calls)
+
+    @property
+    def cache_read_tokens(self) -> int:
+        return sum(call.cache_read_tokens for call in self.calls)
+
+    @property
+    def cache_write_tokens(self) -> int:
+        return sum(call.cache_write_tokens for call in self.calls)
+
+    def table(self) -> str:
+        rows = [f"{'call':<20} {'input tok':>10} {'output tok':>11} {'cache read':>11} {'cache write':>12} {'seconds':>8}"]
+        rows += [f"{call.name:<20} {call.input_tokens:>10} {call.output_tokens:>11} {call.cache_read_tokens:>11} "
+                 f"{call.cache_write_tokens:>12} {call.seconds:>8.1f}"
+                 for call in self.calls]
+        rows.append(f"{f'total ({self.mode})':<20} {self.input_tokens:>10} {self.output_tokens:>11} "
+                    f"{self.cache_read_tokens:>11} {self.cache_write_tokens:>12} {self.seconds:>8.1f}")
+        return '\n'.join(rows)
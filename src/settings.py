@@ -11,11 +11,16 @@ DEBUG = os.getenv('DEBUG', 'False') == 'True'
 
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
+TRACING = os.getenv('TRACING', 'True') == 'True'
+TRACE_EXPORTER = os.getenv('TRACE_EXPORTER', 'none')
+TRACE_PATH = os.getenv('TRACE_PATH', str(BASE_DIR.joinpath('.cache', 'traces.jsonl')))
+
 AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', False)
 AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', False)
 AWS_PROFILE_NAME = os.getenv('AWS_PROFILE_NAME', False)
 AWS_REGION = os.getenv('AWS_REGION')
 AWS_ASSUME_ROLE = os.getenv('AWS_ASSUME_ROLE', False)
+AWS_CREDENTIALS_REFRESH_MARGIN = 300
 
 IA_MODEL = "eu.anthropic.claude-sonnet-4-20250514-v1:0"
 IA_TEMPERATURE = 0.3
@@ -25,6 +30,34 @@ BYPASS_TOOL_CONSENT = os.getenv('BYPASS_TOOL_CONSENT', 'False') == 'True'
 MY_LATITUDE = float(os.getenv('MY_LATITUDE'))
 MY_LONGITUDE = float(os.getenv('MY_LONGITUDE'))
 
+MCP_SERVER_URL = os.getenv('MCP_SERVER_URL', 'http://127.0.0.1:8888/mcp/')
+
 LLM_READ_TIMEOUT = 300
 LLM_CONNECT_TIMEOUT = 60
 LLM_MAX_ATTEMPTS = 10
+LLM_PROMPT_CACHE = os.getenv('LLM_PROMPT_CACHE', 'True') == 'True'
+LLM_CACHE = os.getenv('LLM_CACHE', 'True') == 'True'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', str(BASE_DIR.joinpath('.cache', 'llm.sqlite3')))
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 3600))
+
+WEATHER_API_URL = os.getenv('WEATHER_API_URL', 'https://api.open-meteo.com/v1/forecast')
+WEATHER_READ_TIMEOUT = 30
+WEATHER_CONNECT_TIMEOUT = 5
+WEATHER_MAX_ATTEMPTS = 3
+WEATHER_POOL_SIZE = 10
+WEATHER_BATCH_SIZE = 50
+WEATHER_TOOL_ENCODING = os.getenv('WEATHER_TOOL_ENCODING', 'columns')
+
+WEATHER_CACHE_PATH = os.getenv('WEATHER_CACHE_PATH', str(BASE_DIR.joinpath('.cache', 'weather.sqlite3')))
+WEATHER_CACHE_MAX_BYTES = int(os.getenv('WEATHER_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+WEATHER_CACHE_FUTURE_TTL = int(os.getenv('WEATHER_CACHE_FUTURE_TTL', 900))
+
+HEAT_MAX_TEMPERATURE = float(os.getenv('HEAT_MAX_TEMPERATURE', 34))
+HEAT_MIN_TEMPERATURE = float(os.getenv('HEAT_MIN_TEMPERATURE', 20))
+HEAT_WAVE_MIN_DAYS = int(os.getenv('HEAT_WAVE_MIN_DAYS', 3))
+TROPICAL_NIGHT_TEMPERATURE = float(os.getenv('TROPICAL_NIGHT_TEMPERATURE', 20))
+HEAVY_PRECIPITATION_DAILY = float(os.getenv('HEAVY_PRECIPITATION_DAILY', 20))
+HEAVY_PRECIPITATION_HOURLY = float(os.getenv('HEAVY_PRECIPITATION_HOURLY', 10))
+
+WEATHER_MODEL_UPDATE_INTERVAL = int(os.getenv('WEATHER_MODEL_UPDATE_INTERVAL', 3600))
+WEATHER_RESPONSE_CACHE_SIZE = 256
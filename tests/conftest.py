@@ -0,0 +1,17 @@
+"""Shared fixtures for the test suite"""
+import pytest
+
+from modules.weather.cache import setup_cache
+from modules.weather.llm_cache import setup_llm_cache
+
+
+@pytest.fixture(autouse=True)
+def forecast_cache():
+    """Isolate every test with an empty in-memory forecast cache"""
+    return setup_cache(path=':memory:')
+
+
+@pytest.fixture(autouse=True)
+def llm_cache():
+    """Isolate every test with an empty in-memory LLM response cache"""
+    return setup_llm_cache(path=':memory:')
@@ -0,0 +1,163 @@
+"""Unit tests for AWS sessions and assumed-role credentials"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from core import aws
+from core.aws import (
+    AssumeRoleCredentialProvider, get_aws_session, get_shared_aws_session, reset_shared_aws_session, setup_aws_conf)
+
+ROLE_ARN = 'arn:aws:iam::123456789012:role/weather'
+
+
+def stubbed_sts(*expires_in: float) -> tuple:
+    """STS client answering one assume_role call per entry, token-1, token-2, ..."""
+    client = boto3.client('sts', region_name='eu-west-1', aws_access_key_id='AKIAROOT', aws_secret_access_key='root')
+    stubber = Stubber(client)
+    for index, seconds in enumerate(expires_in, start=1):
+        stubber.add_response('assume_role', {
+            'Credentials': {
+                'AccessKeyId': f"ASIAEXAMPLEKEY{index:04}",
+                'SecretAccessKey': f"secret-{index}",
+                'SessionToken': f"token-{index}",
+                'Expiration': datetime.now(timezone.utc) + timedelta(seconds=seconds),
+            }
+        }, {'RoleArn': ROLE_ARN, 'RoleSessionName': 'AssumeRoleSession'})
+    stubber.activate()
+    return client, stubber
+
+
+@pytest.fixture
+def assumed_role():
+    """Configure an assumed role and restore the default configuration afterwards"""
+    previous = aws.conf.model_copy()
+    setup_aws_conf(assume_role=ROLE_ARN, region='eu-west-1', access_key_id='AKIAROOT', secret_access_key='root')
+    yield aws.conf
+    aws.conf = previous
+    reset_shared_aws_session()
+
+
+class TestAssumeRoleCredentialProvider:
+    """Test cases for AssumeRoleCredentialProvider class"""
+
+    def test_role_is_assumed_once(self):
+        """Test that valid credentials are served without calling STS again"""
+        client, stubber = stubbed_sts(3600)
+        provider = AssumeRoleCredentialProvider(ROLE_ARN, client)
+
+        try:
+            credentials = provider.get_credentials()
+            assert provider.get_credentials() is credentials
+            assert credentials.get_frozen_credentials().token == 'token-1'
+            assert provider.assumed == 1
+            stubber.assert_no_pending_responses()
+        finally:
+            provider.stop()
+
+    def test_concurrent_first_use(self):
+        """Test that threads asking for credentials at the same time share one assume_role"""
+        client, _ = stubbed_sts(3600)
+        provider = AssumeRoleCredentialProvider(ROLE_ARN, client)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(provider.get_credentials())) for _ in range(8)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            provider.stop()
+
+        assert provider.assumed == 1
+        assert all(result is results[0] for result in results)
+
+    def test_background_refresh(self):
+        """Test that credentials are renewed in the background and swapped in without calling STS"""
+        client, stubber = stubbed_sts(2.5, 3600)
+        provider = AssumeRoleCredentialProvider(ROLE_ARN, client, refresh_margin=2)
+
+        try:
+            credentials = provider.get_credentials()
+            deadline = time.monotonic() + 3
+            while provider.assumed < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert provider.assumed == 2
+            assert credentials.get_frozen_credentials().token == 'token-1'
+
+            time.sleep(0.6)
+            assert credentials.get_frozen_credentials().token == 'token-2'
+            assert provider.assumed == 2
+            stubber.assert_no_pending_responses()
+        finally:
+            provider.stop()
+
+    def test_refresh_without_prefetch_calls_sts(self):
+        """Test that expiring credentials are renewed on access when nothing was prefetched"""
+        client, stubber = stubbed_sts(1, 3600)
+        provider = AssumeRoleCredentialProvider(ROLE_ARN, client, refresh_margin=4)
+
+        credentials = provider.get_credentials()
+        provider.stop()
+
+        assert credentials.get_frozen_credentials().token == 'token-2'
+        assert provider.assumed == 2
+        stubber.assert_no_pending_responses()
+
+
+class TestAwsSession:
+    """Test cases for get_aws_session and get_shared_aws_session functions"""
+
+    def test_sessions_share_the_provider(self, assumed_role):
+        """Test that building sessions for the same role does not assume it again"""
+        client, stubber = stubbed_sts(3600)
+        with patch('core.aws.sts_client', return_value=client):
+            first = get_aws_session()
+            second = get_aws_session()
+
+        assert first is not second
+        assert first.get_credentials().get_frozen_credentials().token == 'token-1'
+        assert second.get_credentials() is first.get_credentials()
+        assert first.region_name == 'eu-west-1'
+        stubber.assert_no_pending_responses()
+
+    def test_provider_heads_the_credential_chain(self, assumed_role):
+        """Test that the provider is registered through botocore's credential chain, ahead of the environment"""
+        client, _ = stubbed_sts(3600)
+        with patch('core.aws.sts_client', return_value=client):
+            resolver = get_aws_session()._session.get_component('credential_provider')
+            provider = aws.get_credential_provider()
+
+        assert resolver.providers[resolver.providers.index(provider) + 1].METHOD == 'env'
+
+    def test_refresh_margin_from_conf(self, assumed_role):
+        """Test that the provider renews the credentials with the margin of the configuration"""
+        setup_aws_conf(credentials_refresh_margin=120)
+        client, _ = stubbed_sts()
+        with patch('core.aws.sts_client', return_value=client):
+            assert aws.get_credential_provider().refresh_margin == 120
+
+    def test_shared_session_is_reused(self, assumed_role):
+        """Test that the shared session is built once"""
+        client, _ = stubbed_sts(3600)
+        with patch('core.aws.sts_client', return_value=client):
+            assert get_shared_aws_session() is get_shared_aws_session()
+
+    def test_setup_drops_the_session(self, assumed_role):
+        """Test that changing the configuration builds a new session and stops the background refresh"""
+        client, _ = stubbed_sts(3600, 3600)
+        with patch('core.aws.sts_client', return_value=client):
+            first = get_shared_aws_session()
+            first.get_credentials()
+            provider = aws.get_credential_provider()
+            setup_aws_conf(region='us-east-1')
+            second = get_shared_aws_session()
+
+        assert first is not second
+        assert second.region_name == 'us-east-1'
+        assert not provider._thread.is_alive()
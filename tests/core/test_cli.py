@@ -0,0 +1,127 @@
+"""Unit tests for the lazy CLI group"""
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from unittest.mock import patch
+
+from core.cli import LazyGroup, cli
+from core.tracing import SpanSummary
+
+SRC_DIR = Path(__file__).resolve().parents[2].joinpath('src')
+
+COMMAND_MODULE = '''
+import click
+
+
+@click.command(help='Say hello')
+@click.option('--name', default='world')
+def run(name):
+    print(f"hello {name}")
+'''
+
+
+@pytest.fixture
+def lazy_group(tmp_path, monkeypatch):
+    """Group with one lazy command defined in a module that has not been imported"""
+    tmp_path.joinpath('lazy_hello.py').write_text(COMMAND_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'lazy_hello', raising=False)
+
+    @click.group(cls=LazyGroup)
+    def group():
+        pass
+
+    group.add_lazy_command('lazy_hello:run', name='hello')
+    return group
+
+
+class TestLazyGroup:
+    """Test cases for LazyGroup class"""
+
+    def test_help_does_not_import_commands(self, lazy_group):
+        """Test that the command list is shown without importing the command module"""
+        result = CliRunner().invoke(lazy_group, ['--help'])
+
+        assert result.exit_code == 0
+        assert 'hello' in result.output
+        assert 'lazy_hello' not in sys.modules
+
+    def test_command_is_imported_when_invoked(self, lazy_group):
+        """Test that invoking a command imports and runs it"""
+        result = CliRunner().invoke(lazy_group, ['hello', '--name', 'Bilbao'])
+
+        assert result.exit_code == 0
+        assert result.output == 'hello Bilbao\n'
+        assert 'lazy_hello' in sys.modules
+
+    def test_unknown_command(self, lazy_group):
+        """Test that an unregistered command is still a usage error"""
+        result = CliRunner().invoke(lazy_group, ['forecast'])
+
+        assert result.exit_code == 2
+        assert "No such command 'forecast'" in result.output
+
+    def test_registered_commands(self):
+        """Test that the project commands are registered without being imported"""
+        from commands import setup_commands
+        setup_commands(cli)
+
+        assert cli.list_commands(click.Context(cli)) == ['check_weather', 'forecast', 'forecast_batch']
+
+
+class TestTracingOptions:
+    """Test cases for the tracing options of the cli group"""
+
+    def test_defaults_come_from_the_application(self, monkeypatch):
+        """Test that the tracing defaults are taken from the default map the application sets"""
+        monkeypatch.setitem(cli.commands, 'noop', click.Command('noop', callback=lambda: None))
+        default_map = {'trace': True, 'trace_exporter': 'file', 'trace_path': 'spans.jsonl'}
+
+        with patch('core.tracing.setup_tracing', return_value=SpanSummary()) as setup_tracing:
+            result = CliRunner().invoke(cli, ['noop'], default_map=default_map)
+
+        assert result.exit_code == 0
+        setup_tracing.assert_called_once_with('file', 'spans.jsonl')
+
+    def test_off_by_default(self, monkeypatch):
+        """Test that without application defaults nothing is traced"""
+        monkeypatch.setitem(cli.commands, 'noop', click.Command('noop', callback=lambda: None))
+
+        with patch('core.tracing.setup_tracing') as setup_tracing:
+            result = CliRunner().invoke(cli, ['noop'])
+
+        assert result.exit_code == 0
+        setup_tracing.assert_not_called()
+
+
+class TestStartup:
+    """Test cases for the imports of a fresh CLI process"""
+
+    def test_help_skips_the_agent_stack(self):
+        """Test that `cli.py --help` imports neither the commands nor strands, boto3 or pandas"""
+        script = ("import runpy, sys\n"
+                  "sys.argv = ['cli.py', '--help']\n"
+                  "try:\n"
+                  "    runpy.run_path('cli.py', run_name='__main__')\n"
+                  "except SystemExit:\n"
+                  "    pass\n"
+                  "print(sorted(name for name in ['commands.forecast', 'strands', 'boto3', 'pandas'] if name in sys.modules))")
+
+        result = subprocess.run([sys.executable, '-c', script], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+
+        assert result.stdout.splitlines()[-1] == '[]'
+
+    def test_agent_factory_defers_the_agent_stack(self):
+        """Test that importing modules.weather.main loads neither strands, boto3 nor the tracing SDK"""
+        script = ("import sys\n"
+                  "import modules.weather.main\n"
+                  "print(sorted(name for name in ['strands', 'boto3', 'botocore', 'opentelemetry.sdk', 'pandas']"
+                  " if name in sys.modules))")
+
+        result = subprocess.run([sys.executable, '-c', script], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+
+        assert result.stdout.splitlines()[-1] == '[]'
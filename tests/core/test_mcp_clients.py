@@ -0,0 +1,102 @@
+"""Unit tests for the persistent MCP client sessions"""
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from fastmcp import Context, FastMCP
+from mcp.shared.memory import create_client_server_memory_streams
+
+from core.mcp_clients import MCPClientManager
+
+URL = 'http://weather.test/mcp/'
+
+
+def weather_server() -> FastMCP:
+    server = FastMCP("Test Weather")
+
+    @server.tool
+    def ping() -> str:
+        return 'pong'
+
+    @server.tool
+    async def enable_forecast(ctx: Context) -> str:
+        server.tool(forecast)
+        await ctx.send_tool_list_changed()
+        return 'enabled'
+
+    def forecast() -> str:
+        return 'sunny'
+
+    return server
+
+
+def memory_transport(server: FastMCP):
+    """Transport factory connecting every client to `server` through in-memory streams"""
+    def factory(url: str):
+        @asynccontextmanager
+        async def transport():
+            async with create_client_server_memory_streams() as (client_streams, server_streams):
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(lambda: server._mcp_server.run(
+                        *server_streams, server._mcp_server.create_initialization_options()))
+                    yield client_streams
+                    tg.cancel_scope.cancel()
+        return transport
+    return factory
+
+
+@pytest.fixture
+def manager():
+    manager = MCPClientManager(transport_factory=memory_transport(weather_server()))
+    yield manager
+    manager.close()
+
+
+class TestMCPClientManager:
+    """Test cases for MCPClientManager class"""
+
+    def test_session_and_tools_are_reused(self, manager):
+        """Test that repeated prompts skip the handshake and the tool listing"""
+        first = manager.list_tools(URL)
+        second = manager.list_tools(URL)
+
+        assert [tool.tool_name for tool in first] == ['ping', 'enable_forecast']
+        assert [tool.tool_name for tool in second] == ['ping', 'enable_forecast']
+        assert manager.stats() == {'sessions': 1, 'handshakes': 1, 'tool_listings': 1}
+
+    def test_tools_are_callable(self, manager):
+        """Test that cached tools call the server through the open session"""
+        manager.list_tools(URL)
+
+        result = manager.get_client(URL).call_tool_sync('tool-1', 'ping')
+
+        assert result['status'] == 'success'
+        assert result['content'] == [{'text': 'pong'}]
+
+    def test_tool_list_changed_invalidates_the_cache(self, manager):
+        """Test that a tools/list_changed notification makes the next call list the tools again"""
+        manager.list_tools(URL)
+
+        manager.get_client(URL).call_tool_sync('tool-1', 'enable_forecast')
+        tools = manager.list_tools(URL)
+
+        assert 'forecast' in [tool.tool_name for tool in tools]
+        assert manager.stats() == {'sessions': 1, 'handshakes': 1, 'tool_listings': 2}
+
+    def test_closed_session_is_reopened(self, manager):
+        """Test that a session that is no longer running is opened again"""
+        manager.get_client(URL).stop(None, None, None)
+
+        tools = manager.list_tools(URL)
+
+        assert len(tools) == 2
+        assert manager.stats()['handshakes'] == 2
+
+    def test_close(self, manager):
+        """Test that close stops every session"""
+        client = manager.get_client(URL)
+
+        manager.close()
+
+        assert not client.is_active()
+        assert manager.stats()['sessions'] == 0
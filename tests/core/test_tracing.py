@@ -0,0 +1,119 @@
+"""Unit tests for the tracing summary"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+from core.tracing import FileSpanExporter, SpanSummary, in_current_context
+
+
+@pytest.fixture
+def traced():
+    """Tracer of a private provider (the global one is never installed in tests) and its summary"""
+    summary = SpanSummary()
+    provider = TracerProvider()
+    provider.add_span_processor(summary)
+    return provider.get_tracer('test'), summary
+
+
+class TestSpanSummary:
+    """Test cases for SpanSummary class"""
+
+    def test_rows_nest_like_the_traces(self, traced):
+        """Test that spans are added up per path of names, parents first"""
+        tracer, summary = traced
+        with tracer.start_as_current_span('forecast'):
+            with tracer.start_as_current_span('invoke_agent'):
+                for cycle in ['1b2c', '3d4e']:
+                    with tracer.start_as_current_span(f'Cycle {cycle}'):
+                        with tracer.start_as_current_span('Model invoke', attributes={
+                                'gen_ai.usage.input_tokens': 100, 'gen_ai.usage.output_tokens': 10}):
+                            pass
+            with tracer.start_as_current_span('open_meteo.get'):
+                pass
+
+        rows = summary.rows()
+
+        assert [row.path for row in rows] == [
+            ('forecast',),
+            ('forecast', 'invoke_agent'),
+            ('forecast', 'invoke_agent', 'Cycle'),
+            ('forecast', 'invoke_agent', 'Cycle', 'Model invoke'),
+            ('forecast', 'open_meteo.get'),
+        ]
+        model = rows[3]
+        assert (model.calls, model.input_tokens, model.output_tokens) == (2, 200, 20)
+        assert model.seconds >= model.max_seconds > 0
+
+    def test_recursive_spans_are_merged(self, traced):
+        """Test that a span named like its parent is counted in the parent's row"""
+        tracer, summary = traced
+        with tracer.start_as_current_span('Cycle 1'):
+            with tracer.start_as_current_span('Cycle 2'):
+                with tracer.start_as_current_span('Tool: file_write'):
+                    pass
+
+        assert [(row.path, row.calls) for row in summary.rows()] == [
+            (('Cycle',), 2), (('Cycle', 'Tool: file_write'), 1)]
+
+    def test_table(self, traced):
+        """Test that the table indents every row by its depth"""
+        tracer, summary = traced
+        with tracer.start_as_current_span('check_weather'):
+            with tracer.start_as_current_span('mcp.list_tools'):
+                pass
+
+        lines = summary.table().splitlines()
+
+        assert lines[0].split() == ['span', 'calls', 'seconds', 'max', 'input', 'tok', 'output', 'tok']
+        assert lines[1].startswith('check_weather ')
+        assert lines[2].startswith('  mcp.list_tools ')
+
+    def test_clear(self, traced):
+        """Test that clear drops the collected spans"""
+        tracer, summary = traced
+        with tracer.start_as_current_span('forecast'):
+            pass
+
+        summary.clear()
+
+        assert summary.rows() == []
+
+
+class TestInCurrentContext:
+    """Test cases for in_current_context function"""
+
+    def test_thread_pool_spans_nest_under_the_caller(self, traced):
+        """Test that spans started in worker threads keep the caller's span as parent"""
+        tracer, summary = traced
+
+        def report(name: str):
+            with tracer.start_as_current_span('weather.report'):
+                return name
+
+        with tracer.start_as_current_span('forecast'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                assert list(executor.map(in_current_context(report), ['a', 'b'])) == ['a', 'b']
+
+        assert [(row.path, row.calls) for row in summary.rows()] == [
+            (('forecast',), 1), (('forecast', 'weather.report'), 2)]
+
+
+class TestFileSpanExporter:
+    """Test cases for FileSpanExporter class"""
+
+    def test_spans_are_written_on_shutdown(self, tmp_path):
+        """Test that spans still queued when the provider shuts down reach the file, which is then closed"""
+        path = tmp_path.joinpath('traces', 'spans.jsonl')
+        exporter = FileSpanExporter(path)
+        provider = TracerProvider(shutdown_on_exit=False)
+        provider.add_span_processor(BatchSpanProcessor(exporter, schedule_delay_millis=60000))
+        with provider.get_tracer('test').start_as_current_span('forecast'):
+            pass
+
+        provider.shutdown()
+
+        assert [json.loads(line)['name'] for line in path.read_text().splitlines()] == ['forecast']
+        assert exporter.file.closed
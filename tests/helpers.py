@@ -0,0 +1,65 @@
+"""Test doubles and data builders shared by the test modules"""
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from modules.weather.models import ColumnarMeteoData
+
+
+def fake_open_meteo(url):
+    """Stand-in for OpenMeteoClient.get that answers any range (and any number of locations) with one synthetic row per hour
+    of the requested variables (all of them when the URL has no `hourly`)"""
+    params = {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+    latitudes = params['latitude'].split(',')
+    if 'start_hour' in params:
+        start, end = datetime.fromisoformat(params['start_hour']), datetime.fromisoformat(params['end_hour'])
+    else:
+        start = datetime.fromisoformat(params['start_date'])
+        end = datetime.fromisoformat(params['end_date']) + timedelta(hours=23)
+    hours = [start + timedelta(hours=h) for h in range(int((end - start) / timedelta(hours=1)) + 1)]
+    response = Mock()
+    variables = {
+        'temperature_2m': lambda latitude: [float(latitude) + hour.day * 100 + hour.hour for hour in hours],
+        'relative_humidity_2m': lambda latitude: [60 for _ in hours],
+        'apparent_temperature': lambda latitude: [20.0 for _ in hours],
+        'precipitation': lambda latitude: [0.0 for _ in hours],
+        'evapotranspiration': lambda latitude: [0.1 for _ in hours],
+        'surface_pressure': lambda latitude: [1013.0 for _ in hours],
+        'wind_speed_10m': lambda latitude: [12.5 for _ in hours],
+        'wind_direction_10m': lambda latitude: [270 for _ in hours],
+    }
+    response.json.return_value = [{
+        'hourly': {
+            'time': [hour.strftime('%Y-%m-%dT%H:%M') for hour in hours],
+            **{variable: variables[variable](latitude) for variable in params.get('hourly', ','.join(variables)).split(',')}
+        }
+    } for latitude in latitudes]
+    if len(latitudes) == 1:
+        response.json.return_value = response.json.return_value[0]
+    return response
+
+
+def hourly_data(temperature: list[float], precipitation: list[float] | None = None, humidity: list[int] | None = None,
+                start: datetime = datetime(2025, 7, 1)) -> ColumnarMeteoData:
+    """Hourly data from `start` with the given series, the apparent temperature follows the temperature"""
+    count = len(temperature)
+    return ColumnarMeteoData(time=[start + timedelta(hours=hour) for hour in range(count)], columns={
+        'temperature': temperature,
+        'humidity': humidity or [50] * count,
+        'apparent_temperature': temperature,
+        'precipitation': precipitation or [0.0] * count,
+        'evapotranspiration': [0.1] * count,
+        'surface_pressure': [1013.0] * count,
+    })
+
+
+def daily_temperatures(days: list[tuple[float, float]]) -> list[float]:
+    """Hourly temperatures going from each day's minimum (00:00) to its maximum (12:00)"""
+    return [low + (high - low) * (1 - abs(hour - 12) / 12) for low, high in days for hour in range(24)]
+
+
+def without_day(data: ColumnarMeteoData, day: int) -> ColumnarMeteoData:
+    """`data` without the readings of one day of the month"""
+    kept = [index for index, time in enumerate(data.time) if time.day != day]
+    return ColumnarMeteoData(time=[data.time[index] for index in kept],
+                             columns={name: [values[index] for index in kept] for name, values in data.columns.items()})
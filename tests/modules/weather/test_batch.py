@@ -0,0 +1,182 @@
+"""Unit tests for the multi-site forecast batch"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from modules.weather.batch import forecast_sites, prefetch_weather, read_locations, report_path, report_paths
+from modules.weather.models import Location
+
+
+SITES = [Location(name=f"Site {i}", latitude=40.0 + i, longitude=-3.0) for i in range(6)]
+
+
+class TestReadLocations:
+    """Test cases for read_locations function"""
+
+    def test_reads_csv(self, tmp_path):
+        """Test that every row becomes a validated Location"""
+        path = tmp_path / 'sites.csv'
+        path.write_text("name,latitude,longitude\nBilbao,43.26,-2.93\n,41.38,2.17\n")
+
+        assert read_locations(path) == [
+            Location(name='Bilbao', latitude=43.26, longitude=-2.93),
+            Location(latitude=41.38, longitude=2.17),
+        ]
+
+    def test_invalid_coordinates(self, tmp_path):
+        """Test that out of range coordinates are rejected"""
+        path = tmp_path / 'sites.csv'
+        path.write_text("name,latitude,longitude\nNowhere,95,0\n")
+
+        with pytest.raises(ValueError):
+            read_locations(path)
+
+    def test_duplicate_site(self, tmp_path):
+        """Test that a site repeated in another row is rejected instead of getting a single report"""
+        path = tmp_path / 'sites.csv'
+        path.write_text("name,latitude,longitude\nBilbao,43.26,-2.93\nMadrid,40.42,-3.7\nBilbao,43.26,-2.93\n")
+
+        with pytest.raises(ValueError, match='lines 2 and 4'):
+            read_locations(path)
+
+
+class TestReportPath:
+    """Test cases for report_path function"""
+
+    def test_named_location(self, tmp_path):
+        """Test that the site name is turned into a file name"""
+        assert report_path(tmp_path, Location(name='San Sebastián / Donostia', latitude=43.3, longitude=-2.0)) \
+               == tmp_path / 'san-sebasti-n-donostia.md'
+
+    def test_unnamed_location(self, tmp_path):
+        """Test that unnamed sites use their coordinates"""
+        assert report_path(tmp_path, Location(latitude=43.3, longitude=-2.0)) == tmp_path / '43-3-2-0.md'
+
+
+class TestReportPaths:
+    """Test cases for report_paths function"""
+
+    def test_colliding_names(self, tmp_path):
+        """Test that sites whose names give the same file name get their own file, suffixed with their position"""
+        locations = [
+            Location(name='Sant Joan', latitude=41.0, longitude=2.0),
+            Location(name='Bilbao', latitude=43.26, longitude=-2.93),
+            Location(name='Sant-Joan', latitude=39.0, longitude=3.0),
+        ]
+
+        assert report_paths(tmp_path, locations) == {
+            locations[0]: tmp_path / 'sant-joan.md',
+            locations[1]: tmp_path / 'bilbao.md',
+            locations[2]: tmp_path / 'sant-joan-3.md',
+        }
+
+    def test_suffixed_name_already_taken(self, tmp_path):
+        """Test that a suffixed name taken by another site is suffixed again"""
+        locations = [
+            Location(name='x', latitude=41.0, longitude=2.0),
+            Location(name='x-3', latitude=42.0, longitude=2.0),
+            Location(name='X', latitude=43.0, longitude=2.0),
+        ]
+
+        paths = report_paths(tmp_path, locations)
+
+        assert paths[locations[1]] == tmp_path / 'x-3.md'
+        assert paths[locations[2]] == tmp_path / 'x-3-3.md'
+        assert len(set(paths.values())) == len(locations)
+
+
+class TestPrefetchWeather:
+    """Test cases for prefetch_weather function"""
+
+    def test_failed_prefetch_is_logged(self, caplog):
+        """Test that a failed prefetch does not stop the batch, the sites then fetch their own data"""
+        with patch('modules.weather.batch.get_hourly_weather_data_batch_tool', side_effect=RuntimeError('timeout')):
+            prefetch_weather(SITES, days=3)
+
+        assert 'timeout' in caplog.text
+
+
+class TestForecastSites:
+    """Test cases for forecast_sites function"""
+
+    def test_runs_sites_concurrently(self, tmp_path):
+        """Test that the batch takes about the time of the slowest site, not the sum of all"""
+        def forecast(location):
+            time.sleep(0.2)
+            return f"# {location.name}"
+
+        start = time.perf_counter()
+        results = forecast_sites(SITES, forecast, output=tmp_path, concurrency=len(SITES))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2 * len(SITES) / 2
+        assert set(results) == set(SITES)
+        for location, path in results.items():
+            assert path.read_text() == f"# {location.name}"
+
+    def test_concurrency_cap(self, tmp_path):
+        """Test that no more than `concurrency` sites run at the same time"""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def forecast(location):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return 'report'
+
+        forecast_sites(SITES, forecast, output=tmp_path, concurrency=2)
+
+        assert peak == 2
+
+    def test_reports_written_as_they_complete(self, tmp_path):
+        """Test that a fast site's report is on disk while a slow site is still running"""
+        release = threading.Event()
+        seen_fast_report = []
+
+        def forecast(location):
+            if location is SITES[0]:
+                seen_fast_report.append(release.wait(timeout=2) and report_path(tmp_path, SITES[1]).exists())
+                return 'slow'
+            return 'fast'
+
+        def watch():
+            path = report_path(tmp_path, SITES[1])
+            while not path.exists():
+                time.sleep(0.01)
+            release.set()
+
+        watcher = threading.Thread(target=watch)
+        watcher.start()
+        forecast_sites(SITES[:2], forecast, output=tmp_path, concurrency=2)
+        watcher.join()
+
+        assert seen_fast_report == [True]
+
+    def test_failed_site_does_not_stop_the_batch(self, tmp_path):
+        """Test that a failing site is reported and the other reports are still written"""
+        def forecast(location):
+            if location is SITES[0]:
+                raise RuntimeError('throttled')
+            return 'report'
+
+        results = forecast_sites(SITES, forecast, output=tmp_path, concurrency=3)
+
+        assert isinstance(results[SITES[0]], RuntimeError)
+        assert all(results[location].exists() for location in SITES[1:])
+
+    def test_colliding_names_keep_every_report(self, tmp_path):
+        """Test that sites whose names give the same file name do not overwrite each other's report"""
+        locations = [Location(name='Sant Joan', latitude=41.0, longitude=2.0),
+                     Location(name='Sant-Joan', latitude=39.0, longitude=3.0)]
+
+        results = forecast_sites(locations, lambda location: f"# {location.latitude}", output=tmp_path, concurrency=2)
+
+        assert sorted(path.read_text() for path in results.values()) == ['# 39.0', '# 41.0']
@@ -0,0 +1,152 @@
+"""Unit tests for the forecast cache"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from modules.weather.cache import ForecastCache, merge_segments, plan_segments, utc_now
+
+VARIABLES = ['temperature_2m', 'precipitation']
+PAST_START = datetime(2025, 7, 1, 0, 0)
+PAST_END = datetime(2025, 7, 1, 23, 0)
+DATA = {'hourly': {'time': ['2025-07-01T00:00'], 'temperature_2m': [20.5], 'precipitation': [0.0]}}
+
+
+def cached(cache: ForecastCache, *key) -> dict | None:
+    """Data of the entry serving the whole range of `key` (latitude, longitude, variables, start, end), None otherwise"""
+    segments = cache.lookup(*key)
+    return segments[0].data if len(segments) == 1 else None
+
+
+class TestForecastCache:
+    """Test cases for ForecastCache class"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.cache = ForecastCache(path=':memory:', max_bytes=1024 * 1024, future_ttl=60)
+
+    def test_miss_then_hit(self):
+        """Test that a stored range is returned and counted"""
+        assert cached(self.cache, 1.0, 2.0, VARIABLES, PAST_START, PAST_END) is None
+
+        self.cache.put(1.0, 2.0, VARIABLES, PAST_START, PAST_END, DATA)
+
+        assert cached(self.cache, 1.0, 2.0, VARIABLES, PAST_START, PAST_END) == DATA
+        stats = self.cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_key_includes_location_variables_and_range(self):
+        """Test that a different location, more variables or a longer range is not served by the entry"""
+        self.cache.put(1.0, 2.0, VARIABLES, PAST_START, PAST_END, DATA)
+
+        assert cached(self.cache, 1.5, 2.0, VARIABLES, PAST_START, PAST_END) is None
+        assert cached(self.cache, 1.0, 2.0, [*VARIABLES, 'wind_speed_10m'], PAST_START, PAST_END) is None
+        assert cached(self.cache, 1.0, 2.0, VARIABLES, PAST_START, PAST_END + timedelta(days=1)) is None
+        assert cached(self.cache, 1.0, 2.0, VARIABLES[:1], PAST_START, PAST_END) == DATA
+
+    def test_past_range_never_expires(self):
+        """Test that ranges ending in the past are immutable"""
+        self.cache.put(1.0, 2.0, VARIABLES, PAST_START, PAST_END, DATA)
+
+        with patch('modules.weather.cache.time.time', return_value=4102444800):
+            assert cached(self.cache, 1.0, 2.0, VARIABLES, PAST_START, PAST_END) == DATA
+
+    def test_future_range_expires(self):
+        """Test that ranges reaching into the future expire after the TTL"""
+        start = utc_now().replace(minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=2)
+        self.cache.put(1.0, 2.0, VARIABLES, start, end, DATA)
+
+        assert cached(self.cache, 1.0, 2.0, VARIABLES, start, end) == DATA
+        with patch('modules.weather.cache.time.time', return_value=4102444800):
+            assert cached(self.cache, 1.0, 2.0, VARIABLES, start, end) is None
+        assert self.cache.stats()['entries'] == 0
+
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used entries are evicted when the cache is full"""
+        size = len('{"hourly":{"time":["2025-07-01T00:00"],"temperature_2m":[20.5],"precipitation":[0.0]}}')
+        cache = ForecastCache(path=':memory:', max_bytes=size * 2, future_ttl=60)
+        days = [PAST_START + timedelta(days=d) for d in range(3)]
+
+        with patch('modules.weather.cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put(1.0, 2.0, VARIABLES, days[0], days[0], DATA)
+            cache.put(1.0, 2.0, VARIABLES, days[1], days[1], DATA)
+            cached(cache, 1.0, 2.0, VARIABLES, days[0], days[0])
+            cache.put(1.0, 2.0, VARIABLES, days[2], days[2], DATA)
+
+        assert cache.stats()['evictions'] == 1
+        assert cached(cache, 1.0, 2.0, VARIABLES, days[1], days[1]) is None
+        assert cached(cache, 1.0, 2.0, VARIABLES, days[0], days[0]) == DATA
+        assert cached(cache, 1.0, 2.0, VARIABLES, days[2], days[2]) == DATA
+
+    def test_persistent_across_instances(self, tmp_path):
+        """Test that entries survive a new cache instance on the same file"""
+        path = tmp_path.joinpath('cache', 'weather.sqlite3')
+        ForecastCache(path=path).put(1.0, 2.0, VARIABLES, PAST_START, PAST_END, DATA)
+
+        assert cached(ForecastCache(path=path), 1.0, 2.0, VARIABLES, PAST_START, PAST_END) == DATA
+
+
+def day(d: int, hour: int = 0) -> datetime:
+    return datetime(2025, 7, d, hour)
+
+
+class TestPlanSegments:
+    """Test cases for hour-granular range splitting"""
+
+    def test_no_coverage_is_one_gap(self):
+        """Test that an empty cache yields a single missing segment"""
+        segments = plan_segments([], day(1), day(5, 23))
+
+        assert [(s.start, s.end, s.data) for s in segments] == [(day(1), day(5, 23), None)]
+
+    def test_overlap_at_start(self):
+        """Test that a cached prefix leaves only the tail missing"""
+        segments = plan_segments([(day(1), day(5, 23), DATA)], day(3), day(8, 23))
+
+        assert [(s.start, s.end, s.data is None) for s in segments] == [
+            (day(3), day(5, 23), False), (day(6), day(8, 23), True)]
+
+    def test_gaps_between_entries(self):
+        """Test that holes between and around cached entries are reported"""
+        segments = plan_segments([(day(2), day(2, 11), DATA), (day(4), day(4, 23), DATA)], day(1), day(5, 23))
+
+        assert [(s.start, s.end, s.data is None) for s in segments] == [
+            (day(1), day(1, 23), True), (day(2), day(2, 11), False), (day(2, 12), day(3, 23), True),
+            (day(4), day(4, 23), False), (day(5), day(5, 23), True)]
+
+    def test_overlapping_entries_do_not_duplicate_hours(self):
+        """Test that overlapping entries are split into disjoint segments, preferring the longest"""
+        short, long, longest = {'name': 'short'}, {'name': 'long'}, {'name': 'longest'}
+        segments = plan_segments(
+            [(day(1), day(2, 23), short), (day(2), day(4, 23), long), (day(2), day(6, 23), longest)],
+            day(1), day(6, 23))
+
+        assert [(s.start, s.end, s.data['name']) for s in segments] == [
+            (day(1), day(2, 23), 'short'), (day(3), day(6, 23), 'longest')]
+
+
+class TestMergeSegments:
+    """Test cases for merging cached and fetched rows"""
+
+    def test_rows_are_clipped_and_ordered(self):
+        """Test that each segment only contributes the rows inside its own range"""
+        first = {'hourly': {'time': ['2025-07-01T22:00', '2025-07-01T23:00', '2025-07-02T00:00'],
+                            'temperature_2m': [1.0, 2.0, 99.0]}}
+        second = {'hourly': {'time': ['2025-07-02T00:00', '2025-07-02T01:00'], 'temperature_2m': [3.0, 4.0]}}
+        segments = plan_segments([(day(1), day(1, 23), first), (day(2), day(2, 1), second)], day(1, 22), day(2, 1))
+
+        merged = merge_segments(segments, ['temperature_2m'])
+
+        assert merged['hourly']['time'] == [
+            '2025-07-01T22:00', '2025-07-01T23:00', '2025-07-02T00:00', '2025-07-02T01:00']
+        assert merged['hourly']['temperature_2m'] == [1.0, 2.0, 3.0, 4.0]
+
+    def test_repeated_local_hour_is_kept(self):
+        """Test that a repeated local hour (DST fall back) inside one segment is not collapsed"""
+        data = {'hourly': {'time': ['2025-10-26T01:00', '2025-10-26T02:00', '2025-10-26T02:00', '2025-10-26T03:00'],
+                           'temperature_2m': [1.0, 2.0, 2.5, 3.0]}}
+        segments = plan_segments([(datetime(2025, 10, 26), datetime(2025, 10, 26, 23), data)],
+                                 datetime(2025, 10, 26), datetime(2025, 10, 26, 23))
+
+        assert merge_segments(segments, ['temperature_2m'])['hourly']['temperature_2m'] == [1.0, 2.0, 2.5, 3.0]
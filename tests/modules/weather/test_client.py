@@ -0,0 +1,131 @@
+"""Unit tests for the Open-Meteo HTTP client"""
+import asyncio
+
+import httpx
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from modules.weather.client import AsyncOpenMeteoClient, OpenMeteoClient
+
+
+class TestOpenMeteoClient:
+    """Test cases for OpenMeteoClient class"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.client = OpenMeteoClient(read_timeout=7, connect_timeout=2, max_attempts=4, pool_size=3)
+
+    def test_session_is_pooled_with_retries(self):
+        """Test that the session adapter is configured from the constructor"""
+        adapter = self.client.session.get_adapter('https://api.open-meteo.com/v1/forecast')
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
+
+    def test_at_least_one_attempt(self):
+        """Test that a client without attempts is rejected"""
+        with pytest.raises(ValueError):
+            OpenMeteoClient(max_attempts=0)
+
+    def test_get_uses_timeouts_and_records_latency(self):
+        """Test that every request is bounded by the timeouts and timed"""
+        response = Mock()
+        with patch.object(self.client.session, 'get', return_value=response) as mock_get:
+            assert self.client.get('https://example.org/forecast') is response
+
+        mock_get.assert_called_once_with('https://example.org/forecast', timeout=(2, 7))
+        response.raise_for_status.assert_called_once()
+        stats = self.client.stats()
+        assert stats['requests'] == 1
+        assert stats['errors'] == 0
+        assert stats['max_ms'] >= 0
+
+    def test_get_counts_errors(self):
+        """Test that failed requests are re-raised and counted"""
+        with patch.object(self.client.session, 'get', side_effect=requests.ConnectTimeout()):
+            with pytest.raises(requests.ConnectTimeout):
+                self.client.get('https://example.org/forecast')
+
+        assert self.client.stats()['errors'] == 1
+        assert self.client.stats()['requests'] == 1
+
+    def test_stats_percentiles(self):
+        """Test latency percentiles over recorded requests"""
+        self.client.latencies.extend([0.010, 0.020, 0.030, 0.040, 1.0])
+
+        stats = self.client.stats()
+
+        assert stats['p50_ms'] == pytest.approx(30.0)
+        assert stats['max_ms'] == pytest.approx(1000.0)
+
+
+class TestAsyncOpenMeteoClient:
+    """Test cases for AsyncOpenMeteoClient class"""
+
+    def get(self, client: AsyncOpenMeteoClient, handler) -> httpx.Response:
+        async def run():
+            client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await client.get('https://example.org/forecast')
+            finally:
+                await client.aclose()
+        return asyncio.run(run())
+
+    def test_get_records_latency(self):
+        """Test a successful request"""
+        client = AsyncOpenMeteoClient()
+
+        response = self.get(client, lambda request: httpx.Response(200, json={'hourly': {}}))
+
+        assert response.json() == {'hourly': {}}
+        assert client.stats()['requests'] == 1
+        assert client.stats()['errors'] == 0
+
+    @patch('modules.weather.client.BACKOFF_FACTOR', 0)
+    def test_retries_server_errors(self):
+        """Test that 5xx responses are retried up to max_attempts"""
+        client = AsyncOpenMeteoClient(max_attempts=3)
+        statuses = iter([503, 502, 200])
+
+        response = self.get(client, lambda request: httpx.Response(next(statuses), json={}))
+
+        assert response.status_code == 200
+
+    @patch('modules.weather.client.BACKOFF_FACTOR', 0)
+    def test_raises_after_last_attempt(self):
+        """Test that the last failed response is raised and counted"""
+        client = AsyncOpenMeteoClient(max_attempts=2)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            self.get(client, lambda request: httpx.Response(503, json={}))
+        assert client.stats()['errors'] == 1
+
+    @patch('modules.weather.client.BACKOFF_FACTOR', 0)
+    def test_connection_errors_share_the_attempts(self):
+        """Test that connection errors and 5xx responses are retried within one budget of max_attempts"""
+        client = AsyncOpenMeteoClient(max_attempts=3)
+        requests_made = 0
+
+        def handler(request):
+            nonlocal requests_made
+            requests_made += 1
+            if requests_made == 1:
+                raise httpx.ConnectError('connection refused')
+            return httpx.Response(503, json={})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            self.get(client, handler)
+        assert requests_made == 3
+
+    def test_transport_does_not_retry(self):
+        """Test that the pooled transport leaves retries to get, so attempts are not multiplied"""
+        client = AsyncOpenMeteoClient(max_attempts=3)
+
+        assert client.http._transport._pool._retries == 0
+
+    def test_at_least_one_attempt(self):
+        """Test that a client without attempts is rejected"""
+        with pytest.raises(ValueError):
+            AsyncOpenMeteoClient(max_attempts=0)
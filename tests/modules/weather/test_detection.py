@@ -0,0 +1,154 @@
+"""Unit tests for the extreme weather detection"""
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from modules.weather.detection import DEFAULT_THRESHOLDS, daily_indicators, detect_extreme_weather, runs
+from modules.weather.models import ExtremeWeatherThresholds
+from modules.weather.summary import to_frame
+from tests.helpers import daily_temperatures, hourly_data, without_day
+
+THRESHOLDS = ExtremeWeatherThresholds(
+    heat_max_temperature=34, heat_min_temperature=20, heat_wave_min_days=3,
+    tropical_night_temperature=20, heavy_precipitation_daily=20, heavy_precipitation_hourly=10)
+
+
+class TestDetectExtremeWeather:
+    """Test cases for detect_extreme_weather function"""
+
+    def test_heat_wave(self):
+        """Test that only runs of enough consecutive extreme heat days are heat waves"""
+        data = hourly_data(daily_temperatures(
+            [(22.0, 36.0), (17.0, 30.0), (21.0, 35.0), (22.0, 37.0), (23.0, 38.0), (18.0, 36.0)]))
+
+        heat_waves = [episode for episode in detect_extreme_weather(data, THRESHOLDS).episodes
+                      if episode.kind == 'heat_wave']
+
+        assert len(heat_waves) == 1
+        assert heat_waves[0].start == date(2025, 7, 3)
+        assert heat_waves[0].end == date(2025, 7, 5)
+        assert heat_waves[0].days == 3
+        assert heat_waves[0].temperature_max == 38.0
+
+    def test_tropical_nights(self):
+        """Test that nights run from 20:00 to 08:00 and partial nights are not evaluated"""
+        temperature = [15.0] * 24 * 4
+        # Night of July 1st (20:00 to 07:00) and July 2nd stay above 20 °C
+        for hour in range(20, 20 + 2 * 24 - 12):
+            temperature[hour] = 22.0
+        # The last evening is warm but its night is not in the range
+        for hour in range(3 * 24 + 20, 4 * 24):
+            temperature[hour] = 25.0
+
+        tropical = [episode for episode in detect_extreme_weather(hourly_data(temperature), THRESHOLDS).episodes
+                    if episode.kind == 'tropical_nights']
+
+        assert len(tropical) == 1
+        assert (tropical[0].start, tropical[0].end, tropical[0].days) == (date(2025, 7, 1), date(2025, 7, 2), 2)
+        assert tropical[0].night_temperature_min == 22.0
+
+    def test_heavy_precipitation(self):
+        """Test that a heavy day is detected by its total or by one intense hour"""
+        precipitation = [0.0] * 24 * 4
+        precipitation[5:10] = [5.0] * 5  # July 1st: 25 mm in 5 hours
+        precipitation[24 * 2 + 3] = 12.0  # July 3rd: one 12 mm hour
+        precipitation[24 * 3:24 * 3 + 4] = [4.0] * 4  # July 4th: 16 mm
+
+        heavy = [episode for episode in detect_extreme_weather(hourly_data([15.0] * 24 * 4, precipitation),
+                                                                THRESHOLDS).episodes
+                 if episode.kind == 'heavy_precipitation']
+
+        assert [(episode.start, episode.days, episode.precipitation) for episode in heavy] == [
+            (date(2025, 7, 1), 1, 25.0), (date(2025, 7, 3), 1, 12.0)]
+
+    def test_gaps_split_runs(self):
+        """Test that a day without readings breaks a run of consecutive days"""
+        temperature = daily_temperatures([(22.0, 36.0)] * 4)
+        data = without_day(hourly_data(temperature), 3)
+
+        thresholds = THRESHOLDS.model_copy(update={'heat_wave_min_days': 2})
+        heat_waves = [episode for episode in detect_extreme_weather(data, thresholds).episodes
+                      if episode.kind == 'heat_wave']
+
+        assert [(episode.start, episode.days) for episode in heat_waves] == [(date(2025, 7, 1), 2)]
+
+    def test_episodes_are_sorted(self):
+        """Test that episodes of every kind are sorted by start day"""
+        precipitation = [0.0] * 24 * 5
+        precipitation[10] = 30.0
+        data = hourly_data(daily_temperatures([(15.0, 25.0), (22.0, 36.0), (22.0, 36.0), (22.0, 36.0), (15.0, 25.0)]),
+                           precipitation)
+
+        report = detect_extreme_weather(data, THRESHOLDS)
+
+        assert [episode.kind for episode in report.episodes][:2] == ['heavy_precipitation', 'heat_wave']
+        assert report.episodes == sorted(report.episodes, key=lambda episode: episode.start)
+
+    def test_no_extreme_weather(self):
+        """Test that a mild range has no episodes"""
+        report = detect_extreme_weather(hourly_data(daily_temperatures([(12.0, 24.0)] * 7)), THRESHOLDS)
+
+        assert report.episodes == []
+        assert report.thresholds == THRESHOLDS
+
+    def test_empty(self):
+        """Test that no readings give no episodes"""
+        data = hourly_data([])
+
+        assert detect_extreme_weather(data).episodes == []
+        assert detect_extreme_weather(data).thresholds == DEFAULT_THRESHOLDS
+
+    @pytest.mark.parametrize('encoding', ['json', 'columns', 'csv'])
+    def test_encodings(self, encoding):
+        """Test that every encoding carries the episodes"""
+        report = detect_extreme_weather(hourly_data(daily_temperatures([(22.0, 36.0)] * 3)), THRESHOLDS)
+
+        text = str(report.encoded(encoding))
+
+        if encoding == 'csv':
+            thresholds, header, *rows = text.splitlines()
+            assert thresholds.startswith('# thresholds: heat_max_temperature=')
+            assert 'heat_wave_min_days=3' in thresholds
+            assert rows[0].startswith('heat_wave,2025-07-01,2025-07-03,3,36.0')
+        else:
+            assert json.loads(text)['thresholds']['heat_wave_min_days'] == 3
+
+
+class TestDailyIndicators:
+    """Test cases for daily_indicators function"""
+
+    def test_night_minimum(self):
+        """Test that the night minimum of a day comes from its evening and the next morning"""
+        temperature = [25.0] * 48
+        temperature[19] = 5.0
+        temperature[23] = 18.0
+        temperature[24 + 7] = 16.0
+        temperature[24 + 8] = 5.0
+
+        daily = daily_indicators(to_frame(hourly_data(temperature)))
+
+        assert daily['night_temperature_min'].iloc[0] == 16.0
+        assert pd.isna(daily['night_temperature_min'].iloc[1])
+
+
+class TestRuns:
+    """Test cases for runs function"""
+
+    @pytest.mark.parametrize('flags, min_days, expected', [
+        ([True, True, False, True], 1, [0, 1, 3]),
+        ([True, True, False, True], 2, [0, 1]),
+        ([False, False], 1, []),
+    ])
+    def test_runs(self, flags, min_days, expected):
+        """Test that only flagged days of long enough runs are labelled"""
+        labels = runs(pd.Series(flags), min_days)
+
+        assert labels.index.tolist() == expected
+
+    def test_runs_have_distinct_labels(self):
+        """Test that days of the same run share a label and separate runs do not"""
+        labels = runs(pd.Series([True, True, False, True]))
+
+        assert labels[0] == labels[1] != labels[3]
@@ -0,0 +1,253 @@
+"""Unit tests for the LLM response cache"""
+import asyncio
+import json
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from strands import tool
+from strands.models import Model
+
+from modules.weather.cache import get_cache
+from modules.weather.llm_cache import LLMResponseCache, ToolFingerprint, replay_digest, request_key, tool_fingerprints
+from modules.weather.main import ai, clear_shared_agent_resources
+from tests.helpers import fake_open_meteo
+
+MESSAGE = {'role': 'assistant', 'content': [{'text': 'Sunny'}]}
+
+
+class WeatherModel(Model):
+    """Model that reads the hourly weather of July 1st (or calls `tool_name`), then answers"""
+
+    def __init__(self, tool_name: str = 'get_hourly_weather_data', tool_input: dict | None = None):
+        self.calls = 0
+        self.tool_name = tool_name
+        self.tool_input = tool_input or {'from_date': '2025-07-01', 'to_date': '2025-07-01'}
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {'model_id': 'weather-model', 'temperature': 0.3}
+
+    def structured_output(self, output_model, prompt, **kwargs):
+        raise NotImplementedError
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls += 1
+        yield {'messageStart': {'role': 'assistant'}}
+        if messages[-1]['role'] == 'user' and not any('toolResult' in block for block in messages[-1]['content']):
+            yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': f'tool-{self.calls}', 'name': self.tool_name}}}}
+            yield {'contentBlockDelta': {'delta': {'toolUse': {'input': json.dumps(self.tool_input)}}}}
+            yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use'}}
+        else:
+            yield {'contentBlockDelta': {'delta': {'text': 'Tomorrow will be sunny'}}}
+            yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'end_turn'}}
+        yield {'metadata': {'usage': {'inputTokens': 10, 'outputTokens': 5, 'totalTokens': 15}, 'metrics': {'latencyMs': 1}}}
+
+
+def humid_open_meteo(url):
+    """fake_open_meteo with a different relative humidity"""
+    response = fake_open_meteo(url)
+    body = response.json.return_value
+    for location in body if isinstance(body, list) else [body]:
+        location['hourly']['relative_humidity_2m'] = [90 for _ in location['hourly']['time']]
+    return response
+
+
+loops = []
+
+
+@tool
+async def loop_tool(day: str) -> str:
+    """Weather of `day`, recording the event loop it runs on"""
+    loops.append(asyncio.get_running_loop())
+    if day == 'unknown':
+        raise RuntimeError('Open-Meteo timeout')
+    return f"Sunny on {day}"
+
+
+def fingerprint(day: str) -> ToolFingerprint:
+    return ToolFingerprint(
+        name='loop_tool', input={'day': day}, digest=asyncio.run(replay_digest(loop_tool, {'day': day})) or 'abc')
+
+
+@pytest.fixture(autouse=True)
+def shared_resources():
+    """Start every test without cached tools"""
+    clear_shared_agent_resources()
+    yield
+    clear_shared_agent_resources()
+
+
+class TestLLMResponseCache:
+    """Test cases for LLMResponseCache class"""
+
+    def test_put_and_get(self):
+        """Test that an answer is stored with its tool fingerprints"""
+        cache = LLMResponseCache(path=':memory:')
+        fingerprint = ToolFingerprint(name='get_hourly_weather_data', input={'from_date': '2025-07-01'}, digest='abc')
+
+        cache.put('key', MESSAGE, [fingerprint])
+
+        answer = cache.get('key')
+        assert answer.message == MESSAGE
+        assert answer.tools == [fingerprint]
+        assert str(answer.to_result()) == 'Sunny\n'
+
+    def test_entries_expire(self):
+        """Test that an entry is not returned after its TTL"""
+        cache = LLMResponseCache(path=':memory:', ttl=60)
+        cache.put('key', MESSAGE, [])
+
+        with patch('modules.weather.llm_cache.time.time', return_value=time.time() + 61):
+            assert cache.get('key') is None
+
+    def test_persistent(self, tmp_path):
+        """Test that entries survive across processes"""
+        LLMResponseCache(path=tmp_path / 'llm.sqlite3').put('key', MESSAGE, [])
+
+        assert LLMResponseCache(path=tmp_path / 'llm.sqlite3').get('key').message == MESSAGE
+
+    def test_missing_tool_is_stale(self):
+        """Test that an answer based on a tool that is no longer available is not used"""
+        cache = LLMResponseCache(path=':memory:')
+        cache.put('key', MESSAGE, [ToolFingerprint(name='gone', input={}, digest='abc')])
+
+        assert cache.lookup('key', {}) is None
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'stale': 1, 'entries': 0}
+
+    def test_replays_share_one_loop(self):
+        """Test that the tool calls of an entry are replayed on a single event loop"""
+        cache = LLMResponseCache(path=':memory:')
+        cache.put('key', MESSAGE, [fingerprint('2025-07-01'), fingerprint('2025-07-02')])
+        loops.clear()
+
+        assert cache.lookup('key', {'loop_tool': loop_tool}).message == MESSAGE
+        assert len(loops) == 2 and loops[0] is loops[1]
+
+    def test_lookup_from_running_loop(self):
+        """Test that lookup works when called from code already running an event loop"""
+        cache = LLMResponseCache(path=':memory:')
+        cache.put('key', MESSAGE, [fingerprint('2025-07-01')])
+
+        async def lookup():
+            return cache.lookup('key', {'loop_tool': loop_tool})
+
+        assert asyncio.run(lookup()).message == MESSAGE
+        assert cache.stats()['hits'] == 1
+
+    def test_failed_replay_is_a_miss(self):
+        """Test that a tool failing on replay is a miss and keeps the entry"""
+        cache = LLMResponseCache(path=':memory:')
+        cache.put('key', MESSAGE, [fingerprint('unknown')])
+
+        assert cache.lookup('key', {'loop_tool': loop_tool}) is None
+        assert cache.stats() == {'hits': 0, 'misses': 1, 'stale': 0, 'entries': 1}
+
+
+class TestRequestKey:
+    """Test cases for request_key function"""
+
+    def test_key_inputs(self):
+        """Test that the model, the prompts, the day and the tools change the key"""
+        config = {'model_id': 'model', 'temperature': 0.3}
+        key = request_key(config, 'system', 'user', date(2025, 7, 1))
+
+        assert key == request_key({**config, 'max_tokens': 10}, 'system', 'user', date(2025, 7, 1))
+        assert key != request_key({**config, 'temperature': 0.5}, 'system', 'user', date(2025, 7, 1))
+        assert key != request_key(config, 'system', 'user!', date(2025, 7, 1))
+        assert key != request_key(config, 'system', 'user', date(2025, 7, 2))
+        assert key != request_key(config, 'system', 'user', date(2025, 7, 1), ['current_time'])
+        assert (request_key(config, 'system', 'user', date(2025, 7, 1), ['think', 'current_time'])
+                == request_key(config, 'system', 'user', date(2025, 7, 1), ['current_time', 'think']))
+
+
+class TestToolFingerprints:
+    """Test cases for tool_fingerprints function"""
+
+    def test_successful_data_tool_calls(self):
+        """Test that only successful calls to the given tools are fingerprinted"""
+        messages = [
+            {'role': 'user', 'content': [{'text': 'forecast'}]},
+            {'role': 'assistant', 'content': [
+                {'toolUse': {'toolUseId': '1', 'name': 'get_hourly_weather_data', 'input': {'from_date': '2025-07-01'}}},
+                {'toolUse': {'toolUseId': '2', 'name': 'current_time', 'input': {}}},
+                {'toolUse': {'toolUseId': '3', 'name': 'get_hourly_weather_data', 'input': {'from_date': 'bad'}}},
+            ]},
+            {'role': 'user', 'content': [
+                {'toolResult': {'toolUseId': '1', 'status': 'success', 'content': [{'text': 'data'}]}},
+                {'toolResult': {'toolUseId': '2', 'status': 'success', 'content': [{'text': 'now'}]}},
+                {'toolResult': {'toolUseId': '3', 'status': 'error', 'content': [{'text': 'Error'}]}},
+            ]},
+        ]
+
+        fingerprints = tool_fingerprints(messages, {'get_hourly_weather_data'})
+
+        assert [(fingerprint.name, fingerprint.input) for fingerprint in fingerprints] == [
+            ('get_hourly_weather_data', {'from_date': '2025-07-01'})]
+
+
+class TestCachedAi:
+    """Test cases for ai function with the LLM response cache"""
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_identical_request_skips_the_model(self, mock_get, llm_cache):
+        """Test that a repeated request is answered from the cache after checking the weather data"""
+        model = WeatherModel()
+
+        first = ai('system', 'forecast', bedrock_model=model, quiet=True)
+        second = ai('system', 'forecast', bedrock_model=model, quiet=True)
+
+        assert model.calls == 2
+        assert str(second) == str(first) == 'Tomorrow will be sunny\n'
+        assert second.metrics.accumulated_usage['inputTokens'] == 0
+        assert llm_cache.stats()['hits'] == 1
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_new_weather_data_calls_the_model(self, mock_get, llm_cache):
+        """Test that the cached answer is not used when a tool result changed"""
+        model = WeatherModel()
+        ai('system', 'forecast', bedrock_model=model, quiet=True)
+
+        get_cache().clear()
+        mock_get.side_effect = humid_open_meteo
+        ai('system', 'forecast', bedrock_model=model, quiet=True)
+
+        assert model.calls == 4
+        assert llm_cache.stats()['stale'] == 1
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_bypass(self, mock_get, llm_cache):
+        """Test that use_cache=False always calls the model"""
+        model = WeatherModel()
+
+        ai('system', 'forecast', bedrock_model=model, quiet=True, use_cache=False)
+        ai('system', 'forecast', bedrock_model=model, quiet=True, use_cache=False)
+
+        assert model.calls == 4
+        assert llm_cache.stats()['entries'] == 0
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_other_prompt_misses(self, mock_get, llm_cache):
+        """Test that another prompt is not answered from the cache"""
+        model = WeatherModel()
+
+        ai('system', 'forecast', bedrock_model=model, quiet=True)
+        ai('system', 'forecast for tomorrow', bedrock_model=model, quiet=True)
+
+        assert model.calls == 4
+        assert llm_cache.stats()['misses'] == 2
+
+    def test_side_effects_are_not_cached(self, tmp_path, llm_cache):
+        """Test that a run writing a file is not stored, the file would not be written again"""
+        model = WeatherModel('file_write', {'path': str(tmp_path / 'forecast.md'), 'content': 'sunny'})
+
+        with patch.dict('os.environ', {'BYPASS_TOOL_CONSENT': 'true'}):
+            ai('system', 'forecast', bedrock_model=model, quiet=True)
+
+        assert (tmp_path / 'forecast.md').read_text() == 'sunny'
+        assert llm_cache.stats()['entries'] == 0
@@ -0,0 +1,234 @@
+"""Unit tests for the agent factory"""
+import threading
+from datetime import date
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.validate import validate_parameters
+from strands.models import Model
+
+from modules.weather.main import (
+    ai, ai_fan_out, ai_mcp, clear_shared_agent_resources, get_agent, get_bedrock_model, get_shared_bedrock_model,
+    get_weather_tools, user_message)
+from modules.weather.usage import CacheUsageHandler, CallUsage
+from tests.helpers import fake_open_meteo
+
+
+@pytest.fixture(autouse=True)
+def shared_resources():
+    """Start every test without cached models or tools"""
+    clear_shared_agent_resources()
+    yield
+    clear_shared_agent_resources()
+
+
+class FakeModel(Model):
+    """Model answering every prompt with a fixed report, one input token per prompt word"""
+
+    def __init__(self, answer: str = '# ☀️ Report'):
+        self.answer = answer
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    def structured_output(self, output_model, prompt, **kwargs):
+        raise NotImplementedError
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        prompt = messages[-1]['content'][0]['text']
+        with self._lock:
+            self.prompts.append(prompt)
+        words = len(prompt.split())
+        yield {'messageStart': {'role': 'assistant'}}
+        yield {'contentBlockDelta': {'delta': {'text': self.answer}}}
+        yield {'contentBlockStop': {}}
+        yield {'messageStop': {'stopReason': 'end_turn'}}
+        yield {'metadata': {'usage': {'inputTokens': words, 'outputTokens': 3, 'totalTokens': words + 3},
+                            'metrics': {'latencyMs': 1}}}
+
+
+def fake_session() -> boto3.Session:
+    return boto3.Session(aws_access_key_id='AKIAEXAMPLE', aws_secret_access_key='secret', region_name='eu-west-1')
+
+
+class StubBedrockClient:
+    """bedrock-runtime stand-in validating every ConverseStream request against the botocore service model"""
+
+    def __init__(self, client, usages: list[dict]):
+        self.meta = client.meta
+        self.input_shape = client.meta.service_model.operation_model('ConverseStream').input_shape
+        self.requests: list[dict] = []
+        self.usages = iter(usages)
+
+    def converse_stream(self, **request):
+        validate_parameters(request, self.input_shape)
+        self.requests.append(request)
+        usage = next(self.usages)
+        return {'stream': [
+            {'messageStart': {'role': 'assistant'}},
+            {'contentBlockDelta': {'delta': {'text': 'Sunny'}, 'contentBlockIndex': 0}},
+            {'contentBlockStop': {'contentBlockIndex': 0}},
+            {'messageStop': {'stopReason': 'end_turn'}},
+            {'metadata': {'usage': {'inputTokens': 20, 'outputTokens': 5, 'totalTokens': 25, **usage},
+                          'metrics': {'latencyMs': 100}}},
+        ]}
+
+
+def stubbed_model(usages: list[dict], prompt_cache: bool = True):
+    model = get_bedrock_model(session=fake_session(), prompt_cache=prompt_cache)
+    model.client = StubBedrockClient(model.client, usages)
+    return model
+
+
+class TestSharedBedrockModel:
+    """Test cases for get_shared_bedrock_model function"""
+
+    @patch('core.aws.get_shared_aws_session')
+    def test_model_is_reused(self, shared_session):
+        """Test that agents share one model (and botocore client) per configuration"""
+        shared_session.return_value = fake_session()
+
+        first = get_shared_bedrock_model()
+
+        assert get_shared_bedrock_model() is first
+        assert get_shared_bedrock_model(max_pool_connections=50) is not first
+
+    @patch('core.aws.get_shared_aws_session')
+    def test_model_follows_session_renewal(self, shared_session):
+        """Test that a renewed session builds a new model"""
+        shared_session.return_value = fake_session()
+        first = get_shared_bedrock_model()
+
+        shared_session.return_value = fake_session()
+
+        assert get_shared_bedrock_model() is not first
+
+
+class TestGetAgent:
+    """Test cases for get_agent function"""
+
+    @patch('core.aws.get_shared_aws_session')
+    def test_agents_share_model_and_tools(self, shared_session):
+        """Test that only the conversation is new on every call"""
+        shared_session.return_value = fake_session()
+
+        first = get_agent('system')
+        second = get_agent('system')
+
+        assert first is not second
+        assert first.model is second.model
+        assert shared_session.call_count == 2
+        assert get_weather_tools.cache_info().hits == 1
+
+    def test_tool_profile(self):
+        """Test that the agent is only given the tools of its profile"""
+        agent = get_agent('system', bedrock_model=FakeModel(), tool_profile='weather')
+
+        assert sorted(agent.tool_names) == [
+            'current_time', 'get_daily_weather_summary', 'get_extreme_weather', 'get_hourly_weather_data']
+
+    def test_full_tool_profile(self):
+        """Test that the default profile keeps every general purpose and weather tool"""
+        agent = get_agent('system', bedrock_model=FakeModel())
+
+        assert {'calculator', 'think', 'python_repl', 'file_write', 'get_hourly_weather_data_batch'} <= set(agent.tool_names)
+
+    def test_tools_per_location(self):
+        """Test that tools are cached per location"""
+        assert get_weather_tools(43.26, -2.93) is get_weather_tools(43.26, -2.93)
+        assert get_weather_tools(43.26, -2.93) is not get_weather_tools(41.38, 2.17)
+
+
+class TestAiMcp:
+    """Test cases for ai_mcp function"""
+
+    @patch('core.mcp_clients.mcp_clients.list_tools', return_value=[])
+    @patch('modules.weather.main.get_shared_bedrock_model')
+    def test_given_model(self, shared_model, list_tools):
+        """Test that a given model is used instead of the shared BedrockModel"""
+        model = FakeModel('Sunny')
+
+        result = ai_mcp('system', 'What will the weather be like tomorrow?', bedrock_model=model, quiet=True)
+
+        assert str(result) == 'Sunny\n'
+        assert model.prompts == ['What will the weather be like tomorrow?']
+        shared_model.assert_not_called()
+
+
+class TestAiFanOut:
+    """Test cases for ai_fan_out function"""
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_one_call_per_report(self, mock_get, tmp_path):
+        """Test that the data is fetched once and every report has its own small call"""
+        model = FakeModel()
+
+        usage = ai_fan_out('system', days=3, output=tmp_path, start=date(2025, 7, 1), bedrock_model=model)
+
+        mock_get.assert_called_once()
+        assert [call.name for call in usage.calls] == ['forecast_0.md', 'forecast_1.md', 'forecast_2.md', 'index.md']
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['forecast_0.md', 'forecast_1.md', 'forecast_2.md', 'index.md']
+        assert tmp_path.joinpath('forecast_1.md').read_text() == '# ☀️ Report\n'
+        assert usage.input_tokens == sum(call.input_tokens for call in usage.calls)
+        assert usage.output_tokens == 12
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_day_prompts_only_carry_their_day(self, mock_get, tmp_path):
+        """Test that a daily prompt embeds the hourly data of its day only"""
+        model = FakeModel()
+
+        ai_fan_out('system', days=3, output=tmp_path, start=date(2025, 7, 1), bedrock_model=model)
+
+        day_prompt = next(prompt for prompt in model.prompts if 'forecast day 1,' in prompt)
+        assert '2025-07-02T23:00' in day_prompt
+        assert '2025-07-01T' not in day_prompt
+        assert '2025-07-03T' not in day_prompt
+        index_prompt = next(prompt for prompt in model.prompts if 'general report' in prompt)
+        assert '2025-07-01T' not in index_prompt
+        assert '2025-07-03' in index_prompt
+
+
+class TestPromptCache:
+    """Test cases for the Bedrock prompt cache checkpoints"""
+
+    def test_checkpoints_follow_the_static_prefix(self):
+        """Test that tools, system prompt and user prompt each end with a cache checkpoint"""
+        model = stubbed_model([{'cacheWriteInputTokens': 3000}])
+
+        ai('system', 'forecast', bedrock_model=model, quiet=True)
+
+        request = model.client.requests[0]
+        assert request['toolConfig']['tools'][-1] == {'cachePoint': {'type': 'default'}}
+        assert all('toolSpec' in entry for entry in request['toolConfig']['tools'][:-1])
+        assert request['system'] == [{'text': 'system'}, {'cachePoint': {'type': 'default'}}]
+        assert request['messages'][0]['content'] == [{'text': 'forecast'}, {'cachePoint': {'type': 'default'}}]
+
+    def test_cache_tokens_are_recorded(self):
+        """Test that cache reads and writes of every model call are added up per run"""
+        model = stubbed_model([{'cacheWriteInputTokens': 3000}, {'cacheReadInputTokens': 3000}])
+        first, second = CacheUsageHandler(), CacheUsageHandler()
+
+        ai('system', 'forecast', bedrock_model=model, quiet=True, cache_usage=first, use_cache=False)
+        result = ai('system', 'forecast', bedrock_model=model, quiet=True, cache_usage=second, use_cache=False)
+
+        assert (first.cache_read_tokens, first.cache_write_tokens) == (0, 3000)
+        assert (second.cache_read_tokens, second.cache_write_tokens) == (3000, 0)
+        usage = CallUsage.from_result('forecast', result, 1.0, second)
+        assert (usage.input_tokens, usage.cache_read_tokens) == (20, 3000)
+
+    def test_disabled(self):
+        """Test that no checkpoint is sent with prompt caching disabled"""
+        model = stubbed_model([{}], prompt_cache=False)
+
+        get_agent('system', bedrock_model=model, quiet=True)(user_message('forecast', prompt_cache=False))
+
+        request = model.client.requests[0]
+        assert request['system'] == [{'text': 'system'}]
+        assert request['messages'][0]['content'] == [{'text': 'forecast'}]
+        assert 'cachePoint' not in request['toolConfig']['tools'][-1]
@@ -1,8 +1,10 @@
 """Unit tests for weather models"""
 import pytest
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 from pydantic import ValidationError
 
+from benchmarks.common import estimate_tokens
 from modules.weather.models import (
     TemperatureReading,
     HumidityReading,
@@ -10,7 +12,10 @@ from modules.weather.models import (
     PrecipitationReading,
     EvapotranspirationReading,
     SurfacePressureReading,
-    MeteoData
+    WindDirectionReading,
+    MeteoData,
+    ColumnarMeteoData,
+    EncodedModel
 )
 
 
@@ -306,3 +311,169 @@ class TestMeteoData:
                 evapotranspiration=[],
                 surface_pressure=[]
             )
+
+
+class TestColumnarMeteoData:
+    """Test cases for ColumnarMeteoData model"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.time = [datetime(2025, 7, 12, 14, 0), datetime(2025, 7, 12, 15, 0)]
+        self.columns = {
+            'temperature': [25.0, 26.0],
+            'humidity': [60, 58],
+            'apparent_temperature': [27.0, 28.5],
+            'precipitation': [0.0, 1.2],
+            'evapotranspiration': [2.5, 3.1],
+            'surface_pressure': [1013.25, 1012.8]
+        }
+
+    def test_readings_are_materialized_on_access(self):
+        """Test that columns are exposed as reading objects"""
+        meteo_data = ColumnarMeteoData(time=self.time, columns=self.columns)
+
+        assert len(meteo_data.temperature) == 2
+        assert isinstance(meteo_data.temperature[1], TemperatureReading)
+        assert meteo_data.temperature[1].time == self.time[1]
+        assert meteo_data.temperature[1].value == 26.0
+        assert isinstance(meteo_data.humidity[0].value, int)
+        assert [r.value for r in meteo_data.precipitation] == [0.0, 1.2]
+        assert meteo_data.surface_pressure[-1].value == 1012.8
+
+    def test_json_matches_meteo_data(self):
+        """Test that JSON output is identical to the MeteoData one, without the variables not requested"""
+        meteo_data = ColumnarMeteoData(time=self.time, columns=self.columns)
+
+        assert meteo_data.model_dump_json() == meteo_data.to_meteo_data().model_dump_json(exclude_none=True)
+        assert str(meteo_data) == meteo_data.model_dump_json()
+
+    def test_json_schema_matches_meteo_data(self):
+        """Test that the serialization schema is the MeteoData one"""
+        assert (ColumnarMeteoData.model_json_schema(mode='serialization') ==
+                MeteoData.model_json_schema(mode='serialization'))
+
+    def test_round_trip_from_meteo_data(self):
+        """Test conversion from and to MeteoData"""
+        meteo_data = ColumnarMeteoData(time=self.time, columns=self.columns).to_meteo_data()
+
+        assert ColumnarMeteoData.from_meteo_data(meteo_data).to_meteo_data() == meteo_data
+
+    def test_column_length_mismatch_invalid(self):
+        """Test validation error when a column does not match the time axis"""
+        self.columns['temperature'] = [25.0]
+        with pytest.raises(ValidationError):
+            ColumnarMeteoData(time=self.time, columns=self.columns)
+
+    def test_requested_columns_only(self):
+        """Test that any subset of the variables is valid, kept in the MeteoData field order"""
+        meteo_data = ColumnarMeteoData(time=self.time, columns={
+            'wind_direction': [270, 280], 'precipitation': [0.0, 1.2]})
+
+        assert list(meteo_data.columns) == ['precipitation', 'wind_direction']
+        assert meteo_data.humidity is None
+        assert isinstance(meteo_data.wind_direction[0], WindDirectionReading)
+        assert meteo_data.encode('csv').splitlines()[0] == 'time,precipitation,wind_direction'
+        assert meteo_data.to_meteo_data().temperature is None
+        assert ColumnarMeteoData.from_meteo_data(meteo_data.to_meteo_data()) == meteo_data
+
+    def test_unknown_column_invalid(self):
+        """Test validation error when a column is not a MeteoData field"""
+        self.columns['uv_index'] = [5.0, 6.0]
+        with pytest.raises(ValidationError):
+            ColumnarMeteoData(time=self.time, columns=self.columns)
+
+    def test_reading_constraints_enforced(self):
+        """Test that reading model constraints are applied to whole columns"""
+        for name, values in [('humidity', [60, 101]), ('humidity', [60, 65.7]),
+                             ('precipitation', [0.0, -1.0]), ('surface_pressure', [0.0, 1012.8]),
+                             ('wind_speed', [-1.0, 5.0]), ('wind_direction', [90, 361]),
+                             ('temperature', [25.0, None])]:
+            columns = {**self.columns, name: values}
+            with pytest.raises(ValidationError):
+                ColumnarMeteoData(time=self.time, columns=columns)
+
+
+class TestColumnarMeteoDataEncoding:
+    """Test cases for the ColumnarMeteoData tool encodings"""
+
+    def setup_method(self):
+        """Set up a 7 day hourly fetch"""
+        start = datetime(2025, 7, 1)
+        self.time = [start + timedelta(hours=hour) for hour in range(7 * 24)]
+        self.data = ColumnarMeteoData(time=self.time, columns={
+            'temperature': [20.0 + hour % 24 / 2 for hour in range(len(self.time))],
+            'humidity': [40 + hour % 50 for hour in range(len(self.time))],
+            'apparent_temperature': [21.5 + hour % 24 / 2 for hour in range(len(self.time))],
+            'precipitation': [0.0 if hour % 10 else 1.2 for hour in range(len(self.time))],
+            'evapotranspiration': [0.35] * len(self.time),
+            'surface_pressure': [1013.2] * len(self.time),
+        })
+
+    @pytest.mark.parametrize('encoding', ['columns', 'csv'])
+    def test_compact_encodings_are_three_times_smaller(self, encoding):
+        """Test that a 7 day fetch is at least 3x smaller in bytes and tokens than the JSON readings"""
+        as_json = self.data.encode('json')
+        compact = self.data.encode(encoding)
+
+        assert len(as_json) >= 3 * len(compact)
+        assert estimate_tokens(as_json) >= 3 * estimate_tokens(compact)
+
+    def test_columns_round_trip(self):
+        """Test that the columns encoding carries every reading"""
+        columns = json.loads(self.data.encode('columns'))
+
+        assert columns['time'][:2] == ['2025-07-01T00:00', '2025-07-01T01:00']
+        for name, values in self.data.columns.items():
+            assert columns[name] == list(values)
+
+    def test_csv_round_trip(self):
+        """Test that the csv encoding has a header and one row per hour"""
+        header, *rows = self.data.encode('csv').splitlines()
+
+        assert header == 'time,' + ','.join(self.data.columns)
+        assert len(rows) == len(self.time)
+        assert [float(row.split(',')[1]) for row in rows] == list(self.data.columns['temperature'])
+
+    def test_str_uses_selected_encoding(self):
+        """Test that the tool result text follows the selected encoding"""
+        assert str(self.data) == self.data.encode('json')
+        assert str(self.data.encoded('csv')) == self.data.encode('csv')
+
+    def test_for_day(self):
+        """Test that one day of readings is sliced from the time axis"""
+        day = self.data.for_day(datetime(2025, 7, 3).date())
+
+        assert len(day) == 24
+        assert day.time[0] == datetime(2025, 7, 3)
+        assert list(day.columns['humidity']) == list(self.data.columns['humidity'][48:72])
+        assert len(self.data.for_day(datetime(2025, 8, 1).date())) == 0
+
+    def test_unknown_encoding(self):
+        """Test that an unknown encoding is rejected"""
+        with pytest.raises(ValueError):
+            self.data.encode('xml')
+
+
+class TestEncodedModel:
+    """Test cases for EncodedModel class"""
+
+    def test_encode_is_required(self):
+        """Test that a tool output without encode cannot be built"""
+        class Report(EncodedModel):
+            text: str
+
+        with pytest.raises(TypeError):
+            Report(text='sunny')
+
+    def test_str_uses_the_chosen_encoding(self):
+        """Test that encoded returns a copy rendered with its encoding, the original keeps json"""
+        class Report(EncodedModel):
+            text: str
+
+            def encode(self, encoding='json'):
+                return f"{encoding}:{self.text}"
+
+        report = Report(text='sunny')
+
+        assert str(report.encoded('csv')) == 'csv:sunny'
+        assert str(report) == 'json:sunny'
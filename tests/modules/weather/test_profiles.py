@@ -0,0 +1,68 @@
+"""Unit tests for the tool profiles"""
+import logging
+
+import pytest
+from strands import tool
+
+from modules.weather.profiles import TOOL_PROFILES, ToolProfile, get_tool_profile, tool_name
+
+
+@tool
+def get_hourly_weather_data(from_date: str, to_date: str) -> str:
+    """Get hourly weather data"""
+    return ''
+
+
+@tool
+def think(thought: str) -> str:
+    """Think"""
+    return thought
+
+
+class TestToolProfile:
+    """Test cases for ToolProfile class"""
+
+    def test_select(self):
+        """Test that only the tools of the profile are kept, in their order"""
+        from strands_tools import file_write, python_repl
+        profile = ToolProfile(name='test', description='test', tools=frozenset({'file_write', 'get_hourly_weather_data'}))
+
+        assert profile.select([python_repl, get_hourly_weather_data, think, file_write]) == [get_hourly_weather_data, file_write]
+
+    def test_select_everything(self):
+        """Test that a profile without tools keeps every tool"""
+        assert ToolProfile(name='test', description='test').select([think, get_hourly_weather_data]) == [
+            think, get_hourly_weather_data]
+
+    def test_missing_tools_are_logged(self, caplog):
+        """Test that the tools of the profile not available are reported"""
+        profile = ToolProfile(name='test', description='test', tools=frozenset({'think', 'current_time'}))
+
+        with caplog.at_level(logging.WARNING, logger='modules.weather.profiles'):
+            assert profile.select([think]) == [think]
+
+        assert 'Tools of the test profile not available: current_time' in caplog.text
+
+
+class TestToolName:
+    """Test cases for tool_name function"""
+
+    def test_names(self):
+        """Test the name of decorated tools and of strands_tools modules"""
+        from strands_tools import current_time, file_write
+
+        assert [tool_name(think), tool_name(current_time), tool_name(file_write)] == ['think', 'current_time', 'file_write']
+
+
+class TestGetToolProfile:
+    """Test cases for get_tool_profile function"""
+
+    def test_profiles(self):
+        """Test that the command profiles only differ in file_write"""
+        assert get_tool_profile('writer').tools - get_tool_profile('weather').tools == {'file_write'}
+        assert get_tool_profile('full') is TOOL_PROFILES['full']
+
+    def test_unknown_profile(self):
+        """Test that an unknown profile lists the known ones"""
+        with pytest.raises(ValueError, match="Unknown tool profile 'minimal', expected one of: full, weather, writer"):
+            get_tool_profile('minimal')
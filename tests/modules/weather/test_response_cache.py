@@ -0,0 +1,55 @@
+"""Unit tests for the serialized response cache"""
+from unittest.mock import patch
+
+from modules.weather.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache class"""
+
+    def test_hit_returns_the_same_body(self):
+        """Test that a stored response is served with its etag"""
+        cache = ResponseCache()
+        stored = cache.put('key', '{"temperature":[]}')
+
+        assert cache.get('key') == stored
+        assert stored.etag == ResponseCache().put('other', '{"temperature":[]}').etag
+        assert cache.stats()['hits'] == 1
+
+    def test_miss(self):
+        """Test that an unknown key is a miss"""
+        cache = ResponseCache()
+
+        assert cache.get('key') is None
+        assert cache.stats()['misses'] == 1
+
+    def test_expires_at_next_model_update(self):
+        """Test that responses reaching into the future expire at the next update boundary"""
+        cache = ResponseCache(update_interval=3600)
+        with patch('modules.weather.response_cache.time.time', return_value=7200 + 1800):
+            response = cache.put('key', 'body')
+        assert response.expires_at == 3 * 3600
+
+        with patch('modules.weather.response_cache.time.time', return_value=3 * 3600 - 1):
+            assert cache.get('key') is not None
+        with patch('modules.weather.response_cache.time.time', return_value=3 * 3600):
+            assert cache.get('key') is None
+        assert cache.stats()['entries'] == 0
+
+    def test_immutable_responses_do_not_expire(self):
+        """Test that past-only responses have no expiry"""
+        cache = ResponseCache()
+
+        assert cache.put('key', 'body', immutable=True).expires_at is None
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache keeps at most max_entries responses"""
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', 'a')
+        cache.put('b', 'b')
+        cache.get('a')
+        cache.put('c', 'c')
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.stats()['evictions'] == 1
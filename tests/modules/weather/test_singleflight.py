@@ -0,0 +1,124 @@
+"""Unit tests for request coalescing"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from modules.weather.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight class"""
+
+    def run_concurrently(self, flight: SingleFlight, func, count: int = 5) -> list:
+        results = [None] * count
+
+        def worker(index):
+            try:
+                results[index] = flight.do('key', func)
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    @staticmethod
+    def wait_for_waiters(flight: SingleFlight, count: int = 4):
+        """Keep the call in flight until `count` callers are waiting on it"""
+        deadline = time.monotonic() + 5
+        while flight.coalesced < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that callers arriving while a call is in flight get its result"""
+        flight = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            self.wait_for_waiters(flight)
+            return object()
+
+        results = self.run_concurrently(flight, slow)
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+    def test_errors_are_shared(self):
+        """Test that every waiting caller receives the same exception"""
+        flight = SingleFlight()
+
+        def failing():
+            self.wait_for_waiters(flight)
+            raise ValueError('upstream failed')
+
+        results = self.run_concurrently(flight, failing)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.executions == 1
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test that a finished call is not reused"""
+        flight = SingleFlight()
+
+        assert flight.do('key', lambda: 1) == 1
+        assert flight.do('key', lambda: 2) == 2
+        assert flight.stats()['coalesced'] == 0
+
+    def test_different_keys_run_separately(self):
+        """Test that only identical keys are coalesced"""
+        flight = SingleFlight()
+
+        assert flight.do('a', lambda: 'a') == 'a'
+        assert flight.do('b', lambda: 'b') == 'b'
+        assert flight.executions == 2
+
+
+class TestAsyncSingleFlight:
+    """Test cases for AsyncSingleFlight class"""
+
+    def test_concurrent_coroutines_share_one_task(self):
+        """Test that concurrent coroutines await one shared execution"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return object()
+
+        async def run():
+            return await asyncio.gather(*(flight.do('key', slow) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that the shared task survives the cancellation of one caller"""
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def run():
+            first = asyncio.ensure_future(flight.do('key', slow))
+            second = asyncio.ensure_future(flight.do('key', slow))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(run()) == 'done'
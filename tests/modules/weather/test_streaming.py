@@ -0,0 +1,92 @@
+"""Unit tests for the streamed forecast reports"""
+import asyncio
+import io
+
+from modules.weather.streaming import ReportWriter, stream_reports
+
+ANSWER = ("I have all the data.\n"
+          "<!-- file: forecast_0.md -->\n# ☀️ Today\nSunny\n"
+          "<!-- file: forecast_1.md -->\n# 🌧️ Tomorrow\nRain\n"
+          "<!-- file: index.md -->\n# Summary\nMixed week")
+
+
+def chunks(text: str, size: int) -> list[str]:
+    return [text[offset:offset + size] for offset in range(0, len(text), size)]
+
+
+class FakeAgent:
+    """Agent whose event stream yields the answer in small chunks"""
+
+    def __init__(self, answer: str, size: int = 7):
+        self.chunks = chunks(answer, size)
+        self.sent = 0
+
+    async def stream_async(self, prompt):
+        yield {'init_event_loop': True}
+        for chunk in self.chunks:
+            self.sent += 1
+            yield {'data': chunk}
+            await asyncio.sleep(0)
+        yield {'result': 'done'}
+
+
+class TestReportWriter:
+    """Test cases for ReportWriter class"""
+
+    def test_reports_are_split_on_markers(self, tmp_path):
+        """Test that every marker starts a file and the preamble is dropped"""
+        writer = ReportWriter(tmp_path)
+        for chunk in chunks(ANSWER, 5):
+            writer.feed(chunk)
+
+        written = writer.close()
+
+        assert [path.name for path in written] == ['forecast_0.md', 'forecast_1.md', 'index.md']
+        assert tmp_path.joinpath('forecast_0.md').read_text() == '# ☀️ Today\nSunny\n'
+        assert tmp_path.joinpath('index.md').read_text() == '# Summary\nMixed week\n'
+
+    def test_report_is_written_when_complete(self, tmp_path):
+        """Test that a report is on disk as soon as the next one starts"""
+        writer = ReportWriter(tmp_path)
+
+        writer.feed("<!-- file: forecast_0.md -->\nSunny\n<!-- file: fore")
+        assert not tmp_path.joinpath('forecast_0.md').exists()
+
+        writer.feed("cast_1.md -->\n")
+        assert tmp_path.joinpath('forecast_0.md').read_text() == 'Sunny\n'
+        assert not tmp_path.joinpath('forecast_1.md').exists()
+
+    def test_marker_must_be_a_file_name(self, tmp_path):
+        """Test that markers with paths are plain text"""
+        writer = ReportWriter(tmp_path)
+        writer.feed("<!-- file: index.md -->\n<!-- file: ../escape.md -->\nEnd\n")
+
+        writer.close()
+
+        assert not tmp_path.parent.joinpath('escape.md').exists()
+        assert tmp_path.joinpath('index.md').read_text() == '<!-- file: ../escape.md -->\nEnd\n'
+
+    def test_no_markers(self, tmp_path):
+        """Test that an answer without markers writes nothing"""
+        writer = ReportWriter(tmp_path)
+        writer.feed("No reports today")
+
+        assert writer.close() == []
+
+
+class TestStreamReports:
+    """Test cases for stream_reports function"""
+
+    def test_text_is_echoed_and_reports_written_while_streaming(self, tmp_path):
+        """Test that reports are written before the stream ends and the text is printed as it arrives"""
+        agent = FakeAgent(ANSWER)
+        sent_when_written = {}
+        writer = ReportWriter(tmp_path, on_report=lambda path: sent_when_written.setdefault(path.name, agent.sent))
+        out = io.StringIO()
+
+        result = asyncio.run(stream_reports(agent, 'prompt', writer, out=out))
+
+        assert result == 'done'
+        assert out.getvalue() == ANSWER
+        assert sent_when_written['forecast_0.md'] < sent_when_written['forecast_1.md'] < len(agent.chunks)
+        assert sent_when_written['index.md'] == len(agent.chunks)
@@ -0,0 +1,84 @@
+"""Unit tests for the daily weather summary"""
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from modules.weather.models import ColumnarMeteoData
+from modules.weather.summary import daily_summary, heat_wave_days
+from tests.helpers import daily_temperatures, hourly_data, without_day
+
+
+class TestDailySummary:
+    """Test cases for daily_summary function"""
+
+    def test_daily_aggregates(self):
+        """Test the aggregates of one day"""
+        hours = range(48)
+        summary = daily_summary(hourly_data(
+            daily_temperatures([(18.0, 30.0), (15.0, 25.0)]),
+            precipitation=[0.5 if hour % 24 in (6, 7) else 0.0 for hour in hours],
+            humidity=[40 + hour % 24 for hour in hours]))
+
+        assert [day.day for day in summary.days] == [date(2025, 7, 1), date(2025, 7, 2)]
+        first = summary.days[0]
+        assert first.hours == 24
+        assert first.temperature_max == 30.0
+        assert first.temperature_min == 18.0
+        assert first.apparent_temperature_max == 30.0
+        assert first.humidity_min == 40
+        assert first.humidity_max == 63
+        assert first.precipitation == 1.0
+        assert first.precipitation_hours == 2
+        assert first.evapotranspiration == 2.4
+        assert first.surface_pressure_mean == 1013.0
+
+    def test_partial_day(self):
+        """Test that a day with missing hours reports how many were aggregated"""
+        data = hourly_data(daily_temperatures([(18.0, 30.0)]))
+        partial = ColumnarMeteoData(time=data.time[:10], columns={name: values[:10] for name, values in data.columns.items()})
+
+        assert daily_summary(partial).days[0].hours == 10
+
+    def test_heat_flags(self):
+        """Test that only runs of enough consecutive extreme heat days are heat waves"""
+        summary = daily_summary(
+            hourly_data(daily_temperatures(
+                [(22.0, 36.0), (17.0, 30.0), (21.0, 35.0), (22.0, 37.0), (23.0, 38.0), (18.0, 36.0)])),
+            max_temperature=34, min_temperature=20, min_days=3)
+
+        assert [day.extreme_heat for day in summary.days] == [True, False, True, True, True, False]
+        assert [day.heat_wave for day in summary.days] == [False, False, True, True, True, False]
+
+    def test_gaps_split_heat_waves(self):
+        """Test that a day without readings breaks a heat wave, as in detect_extreme_weather"""
+        data = without_day(hourly_data(daily_temperatures([(22.0, 36.0)] * 4)), 3)
+
+        summary = daily_summary(data, max_temperature=34, min_temperature=20, min_days=2)
+
+        assert [(day.day.day, day.heat_wave) for day in summary.days] == [(1, True), (2, True), (4, False)]
+
+    def test_empty(self):
+        """Test that no readings give no days"""
+        assert daily_summary(ColumnarMeteoData(time=[], columns={name: [] for name in hourly_data([]).columns})).days == []
+
+    def test_serialized_size(self):
+        """Test that the summary is much smaller than the hourly readings"""
+        data = hourly_data(daily_temperatures([(18.0, 30.0)] * 5))
+
+        assert len(str(daily_summary(data))) * 10 < len(str(data))
+
+
+class TestHeatWaveDays:
+    """Test cases for heat_wave_days function"""
+
+    @pytest.mark.parametrize('flags, expected', [
+        ([True, True, True], [True, True, True]),
+        ([True, True, False, True, True], [False, False, False, False, False]),
+        ([False, True, True, True, True, False], [False, True, True, True, True, False]),
+    ])
+    def test_runs(self, flags, expected):
+        """Test that flags are kept only inside long enough runs"""
+        days = [date(2025, 7, 1) + timedelta(days=index) for index in range(len(flags))]
+
+        assert heat_wave_days(pd.Series(flags, index=days), min_days=3).tolist() == expected
@@ -1,10 +1,19 @@
 """Unit tests for weather tools"""
+import asyncio
+import json
+import threading
+import time
+
 import pytest
-from datetime import datetime, date
-from unittest.mock import Mock, patch
+from datetime import datetime, date, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+from urllib.parse import parse_qs, urlparse
 
-from modules.weather.tools import Tools
-from modules.weather.models import MeteoData
+from modules.weather.tools import (
+    HOURLY_VARIABLES, Tools, async_weather_flight, get_hourly_weather_data_batch_tool, get_hourly_weather_data_tool,
+    get_hourly_weather_data_tool_async, parse_hourly_weather_data, upstream_variables, weather_flight)
+from modules.weather.models import ColumnarMeteoData, Location, MeteoDataBatch
+from tests.helpers import fake_open_meteo
 
 
 class TestTools:
@@ -25,7 +34,7 @@ class TestTools:
         """Test that get_tools returns a list"""
         tools = self.tools_instance.get_tools()
         assert isinstance(tools, list)
-        assert len(tools) == 1
+        assert len(tools) == 4
     
     def test_get_tools_function_name(self):
         """Test that the returned tool has the correct function name"""
@@ -33,7 +42,7 @@ class TestTools:
         tool_function = tools[0]
         assert tool_function.__name__ == "get_hourly_weather_data"
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_success(self, mock_get):
         """Test successful API call and data processing"""
         # Setup mock response
@@ -49,7 +58,9 @@ class TestTools:
                 'apparent_temperature': [27.0, 28.5],
                 'precipitation': [0.0, 1.2],
                 'evapotranspiration': [2.5, 3.1],
-                'surface_pressure': [1013.25, 1012.8]
+                'surface_pressure': [1013.25, 1012.8],
+                'wind_speed_10m': [10.5, 10.5],
+                'wind_direction_10m': [180, 180]
             }
         }
         mock_get.return_value = mock_response
@@ -69,14 +80,14 @@ class TestTools:
             f"https://api.open-meteo.com/v1/forecast?"
             f"latitude={self.latitude}&"
             f"longitude={self.longitude}&"
-            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure&"
+            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure,wind_speed_10m,wind_direction_10m&"
             f"start_date=2025-07-12&"
             f"end_date=2025-07-12"
         )
         mock_get.assert_called_once_with(expected_url)
         
         # Verify result type and structure
-        assert isinstance(result, MeteoData)
+        assert isinstance(result, ColumnarMeteoData)
         assert len(result.temperature) == 2
         assert len(result.humidity) == 2
         assert len(result.apparent_temperature) == 2
@@ -105,7 +116,7 @@ class TestTools:
         assert result.temperature[0].time == expected_time1
         assert result.temperature[1].time == expected_time2
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_empty_response(self, mock_get):
         """Test handling of empty API response"""
         # Setup mock response with empty data
@@ -118,7 +129,9 @@ class TestTools:
                 'apparent_temperature': [],
                 'precipitation': [],
                 'evapotranspiration': [],
-                'surface_pressure': []
+                'surface_pressure': [],
+                'wind_speed_10m': [],
+                'wind_direction_10m': []
             }
         }
         mock_get.return_value = mock_response
@@ -133,8 +146,8 @@ class TestTools:
         
         result = get_hourly_weather_data(from_date=from_date, to_date=to_date)
         
-        # Verify result is empty but valid MeteoData
-        assert isinstance(result, MeteoData)
+        # Verify result is empty but valid ColumnarMeteoData
+        assert isinstance(result, ColumnarMeteoData)
         assert len(result.temperature) == 0
         assert len(result.humidity) == 0
         assert len(result.apparent_temperature) == 0
@@ -142,7 +155,7 @@ class TestTools:
         assert len(result.evapotranspiration) == 0
         assert len(result.surface_pressure) == 0
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_single_reading(self, mock_get):
         """Test processing of single weather reading"""
         # Setup mock response with single reading
@@ -155,7 +168,9 @@ class TestTools:
                 'apparent_temperature': [27.0],
                 'precipitation': [0.0],
                 'evapotranspiration': [2.5],
-                'surface_pressure': [1013.25]
+                'surface_pressure': [1013.25],
+                'wind_speed_10m': [10.5],
+                'wind_direction_10m': [180]
             }
         }
         mock_get.return_value = mock_response
@@ -190,7 +205,7 @@ class TestTools:
         expected_time = datetime(2025, 7, 12, 14, 0)
         assert result.temperature[0].time == expected_time
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_different_coordinates(self, mock_get):
         """Test API call with different coordinates"""
         # Setup mock response
@@ -203,7 +218,9 @@ class TestTools:
                 'apparent_temperature': [22.0],
                 'precipitation': [5.0],
                 'evapotranspiration': [1.8],
-                'surface_pressure': [1020.0]
+                'surface_pressure': [1020.0],
+                'wind_speed_10m': [10.5],
+                'wind_direction_10m': [180]
             }
         }
         mock_get.return_value = mock_response
@@ -228,17 +245,17 @@ class TestTools:
             f"https://api.open-meteo.com/v1/forecast?"
             f"latitude={different_lat}&"
             f"longitude={different_lon}&"
-            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure&"
+            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure,wind_speed_10m,wind_direction_10m&"
             f"start_date=2025-07-12&"
             f"end_date=2025-07-12"
         )
         mock_get.assert_called_once_with(expected_url)
         
         # Verify result
-        assert isinstance(result, MeteoData)
+        assert isinstance(result, ColumnarMeteoData)
         assert result.temperature[0].value == 20.0
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_date_range(self, mock_get):
         """Test API call with different date range"""
         # Setup mock response
@@ -251,7 +268,9 @@ class TestTools:
                 'apparent_temperature': [25.0],
                 'precipitation': [2.5],
                 'evapotranspiration': [2.0],
-                'surface_pressure': [1015.0]
+                'surface_pressure': [1015.0],
+                'wind_speed_10m': [10.5],
+                'wind_direction_10m': [180]
             }
         }
         mock_get.return_value = mock_response
@@ -271,16 +290,16 @@ class TestTools:
             f"https://api.open-meteo.com/v1/forecast?"
             f"latitude={self.latitude}&"
             f"longitude={self.longitude}&"
-            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure&"
+            f"hourly=temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,evapotranspiration,surface_pressure,wind_speed_10m,wind_direction_10m&"
             f"start_date=2025-07-10&"
             f"end_date=2025-07-15"
         )
         mock_get.assert_called_once_with(expected_url)
         
         # Verify result
-        assert isinstance(result, MeteoData)
+        assert isinstance(result, ColumnarMeteoData)
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     @patch('modules.weather.tools.logger')
     def test_get_hourly_weather_data_logging(self, mock_logger, mock_get):
         """Test that logging is called correctly"""
@@ -294,7 +313,9 @@ class TestTools:
                 'apparent_temperature': [27.0, 28.5],
                 'precipitation': [0.0, 1.2],
                 'evapotranspiration': [2.5, 3.1],
-                'surface_pressure': [1013.25, 1012.8]
+                'surface_pressure': [1013.25, 1012.8],
+                'wind_speed_10m': [10.5, 10.5],
+                'wind_direction_10m': [180, 180]
             }
         }
         mock_get.return_value = mock_response
@@ -316,7 +337,7 @@ class TestTools:
         assert "2025-07-12" in log_call_args
         assert "2 records found" in log_call_args
     
-    @patch('modules.weather.tools.requests.get')
+    @patch('modules.weather.client.OpenMeteoClient.get')
     def test_get_hourly_weather_data_extreme_values(self, mock_get):
         """Test handling of extreme weather values"""
         # Setup mock response with extreme values
@@ -329,7 +350,9 @@ class TestTools:
                 'apparent_temperature': [-45.0],  # Extreme apparent cold
                 'precipitation': [100.0],  # Heavy precipitation
                 'evapotranspiration': [0.0],  # No evapotranspiration
-                'surface_pressure': [950.0]  # Low pressure
+                'surface_pressure': [950.0],  # Low pressure
+                'wind_speed_10m': [10.5],
+                'wind_direction_10m': [180]
             }
         }
         mock_get.return_value = mock_response
@@ -352,6 +375,33 @@ class TestTools:
         assert result.evapotranspiration[0].value == 0.0
         assert result.surface_pressure[0].value == 950.0
     
+    @patch('modules.weather.client.OpenMeteoClient.get')
+    def test_get_hourly_weather_data_cached(self, mock_get, forecast_cache):
+        """Test that a repeated range is served from the cache"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            'hourly': {
+                'time': ['2025-07-12T14:00'],
+                'temperature_2m': [25.5],
+                'relative_humidity_2m': [60],
+                'apparent_temperature': [27.0],
+                'precipitation': [0.0],
+                'evapotranspiration': [2.5],
+                'surface_pressure': [1013.25],
+                'wind_speed_10m': [10.5],
+                'wind_direction_10m': [180]
+            }
+        }
+        mock_get.return_value = mock_response
+
+        get_hourly_weather_data = self.tools_instance.get_tools()[0]
+        first = get_hourly_weather_data(from_date=date(2025, 7, 12), to_date=date(2025, 7, 12))
+        second = get_hourly_weather_data(from_date=date(2025, 7, 12), to_date=date(2025, 7, 12))
+
+        mock_get.assert_called_once()
+        assert second == first
+        assert forecast_cache.stats()['hits'] == 1
+
     def test_tools_with_negative_coordinates(self):
         """Test Tools initialization with negative coordinates"""
         negative_lat = -34.6037
@@ -367,3 +417,333 @@ class TestTools:
         
         assert tools_instance.latitude == 0.0
         assert tools_instance.longitude == 0.0
+
+
+class TestParseHourlyWeatherData:
+    """Test cases for the single-pass Open-Meteo decoder"""
+
+    def test_parse_keeps_row_alignment(self):
+        """Test that every column is aligned with the shared time axis"""
+        data = {
+            'hourly': {
+                'time': ['2025-07-12T14:00', '2025-07-12T15:00', '2025-07-12T16:00'],
+                'temperature_2m': [25.5, 26.0, 26.5],
+                'relative_humidity_2m': [60, 58, 56],
+                'apparent_temperature': [27.0, 28.5, 29.0],
+                'precipitation': [0.0, 1.2, 0.4],
+                'evapotranspiration': [2.5, 3.1, 3.3],
+                'surface_pressure': [1013.25, 1012.8, 1012.1],
+                'wind_speed_10m': [10.5, 10.5, 10.5],
+                'wind_direction_10m': [180, 180, 180]
+            }
+        }
+
+        result = parse_hourly_weather_data(data)
+
+        assert [r.time for r in result.surface_pressure] == [
+            datetime(2025, 7, 12, 14, 0), datetime(2025, 7, 12, 15, 0), datetime(2025, 7, 12, 16, 0)]
+        assert [r.value for r in result.humidity] == [60, 58, 56]
+        assert result.precipitation[2].value == 0.4
+
+    def test_parse_rejects_misaligned_columns(self):
+        """Test that a column shorter than the time axis is rejected"""
+        data = {
+            'hourly': {
+                'time': ['2025-07-12T14:00', '2025-07-12T15:00'],
+                'temperature_2m': [25.5],
+                'relative_humidity_2m': [60, 58],
+                'apparent_temperature': [27.0, 28.5],
+                'precipitation': [0.0, 1.2],
+                'evapotranspiration': [2.5, 3.1],
+                'surface_pressure': [1013.25, 1012.8],
+                'wind_speed_10m': [10.5, 10.5],
+                'wind_direction_10m': [180, 180]
+            }
+        }
+
+        with pytest.raises(ValueError):
+            parse_hourly_weather_data(data)
+
+
+def requested_range(call):
+    params = parse_qs(urlparse(call.args[0]).query)
+    if 'start_hour' in params:
+        return params['start_hour'][0], params['end_hour'][0]
+    return params['start_date'][0], params['end_date'][0]
+
+
+class TestRangeSplitting:
+    """Test cases for partial cache hits and range merging"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.get_hourly_weather_data = Tools(latitude=0.0, longitude=-1.98).get_tools()[0]
+
+    def assert_contiguous(self, result, from_date, to_date):
+        expected = [datetime.combine(from_date, datetime.min.time()) + timedelta(hours=h)
+                    for h in range(((to_date - from_date).days + 1) * 24)]
+        assert [reading.time for reading in result.temperature] == expected
+        assert [reading.value for reading in result.temperature] == [
+            float(time.day * 100 + time.hour) for time in expected]
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_overlap_fetches_only_missing_days(self, mock_get, forecast_cache):
+        """Test that 3 -> 8 July after 1 -> 5 July only fetches 6 -> 8 July"""
+        self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 5))
+        result = self.get_hourly_weather_data(from_date=date(2025, 7, 3), to_date=date(2025, 7, 8))
+
+        assert [requested_range(call) for call in mock_get.call_args_list] == [
+            ('2025-07-01', '2025-07-05'), ('2025-07-06', '2025-07-08')]
+        self.assert_contiguous(result, date(2025, 7, 3), date(2025, 7, 8))
+        assert forecast_cache.stats()['partial_hits'] == 1
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_covered_range_is_a_full_hit(self, mock_get, forecast_cache):
+        """Test that a range inside cached ranges needs no request"""
+        self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 5))
+        result = self.get_hourly_weather_data(from_date=date(2025, 7, 2), to_date=date(2025, 7, 4))
+
+        assert mock_get.call_count == 1
+        self.assert_contiguous(result, date(2025, 7, 2), date(2025, 7, 4))
+        assert forecast_cache.stats()['hits'] == 1
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_gap_between_cached_ranges(self, mock_get):
+        """Test that only the hole between two cached ranges is fetched"""
+        self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 2))
+        self.get_hourly_weather_data(from_date=date(2025, 7, 5), to_date=date(2025, 7, 6))
+        result = self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 6))
+
+        assert requested_range(mock_get.call_args_list[-1]) == ('2025-07-03', '2025-07-04')
+        assert mock_get.call_count == 3
+        self.assert_contiguous(result, date(2025, 7, 1), date(2025, 7, 6))
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_partial_day_gap_uses_hour_range(self, mock_get, forecast_cache):
+        """Test that a gap not aligned to days is requested with start_hour/end_hour"""
+        data = fake_open_meteo(
+            'https://x/?latitude=0.0&longitude=-1.98&start_hour=2025-07-01T00:00&end_hour=2025-07-01T11:00').json()
+        forecast_cache.put(0.0, -1.98, list(HOURLY_VARIABLES.values()),
+                           datetime(2025, 7, 1, 0), datetime(2025, 7, 1, 11), data)
+
+        result = self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 1))
+
+        assert requested_range(mock_get.call_args) == ('2025-07-01T12:00', '2025-07-01T23:00')
+        self.assert_contiguous(result, date(2025, 7, 1), date(2025, 7, 1))
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_dst_boundary(self, mock_get):
+        """Test merging across the European DST switches (timestamps are GMT, every day has 24 hours)"""
+        self.get_hourly_weather_data(from_date=date(2025, 3, 30), to_date=date(2025, 3, 30))
+        spring = self.get_hourly_weather_data(from_date=date(2025, 3, 29), to_date=date(2025, 3, 31))
+        self.get_hourly_weather_data(from_date=date(2025, 10, 26), to_date=date(2025, 10, 26))
+        autumn = self.get_hourly_weather_data(from_date=date(2025, 10, 25), to_date=date(2025, 10, 27))
+
+        self.assert_contiguous(spring, date(2025, 3, 29), date(2025, 3, 31))
+        self.assert_contiguous(autumn, date(2025, 10, 25), date(2025, 10, 27))
+        assert [requested_range(call) for call in mock_get.call_args_list] == [
+            ('2025-03-30', '2025-03-30'), ('2025-03-29', '2025-03-29'), ('2025-03-31', '2025-03-31'),
+            ('2025-10-26', '2025-10-26'), ('2025-10-25', '2025-10-25'), ('2025-10-27', '2025-10-27')]
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_short_dst_day_is_not_refetched(self, mock_get, forecast_cache):
+        """Test that a cached day with a skipped local hour still counts as covered"""
+        data = fake_open_meteo('https://x/?latitude=0.0&longitude=-1.98&start_date=2025-03-30&end_date=2025-03-30').json()
+        for rows in data['hourly'].values():
+            del rows[2]
+        forecast_cache.put(0.0, -1.98, list(HOURLY_VARIABLES.values()),
+                           datetime(2025, 3, 30, 0), datetime(2025, 3, 30, 23), data)
+
+        result = self.get_hourly_weather_data(from_date=date(2025, 3, 30), to_date=date(2025, 3, 30))
+
+        mock_get.assert_not_called()
+        assert len(result) == 23
+        assert datetime(2025, 3, 30, 2) not in [reading.time for reading in result.temperature]
+
+
+class TestHourlyVariables:
+    """Test cases for the selection of hourly variables"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.get_hourly_weather_data = Tools(latitude=0.0, longitude=-1.98).get_tools()[0]
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_variables_are_pushed_down(self, mock_get):
+        """Test that only the requested variables are asked to Open-Meteo and returned"""
+        result = self.get_hourly_weather_data(
+            from_date=date(2025, 7, 1), to_date=date(2025, 7, 1), variables=['precipitation', 'temperature'])
+
+        assert parse_qs(urlparse(mock_get.call_args.args[0]).query)['hourly'] == ['temperature_2m,precipitation']
+        assert list(result.columns) == ['temperature', 'precipitation']
+        assert result.humidity is None
+        assert result.encode('csv').splitlines()[0] == 'time,temperature,precipitation'
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_wind(self, mock_get):
+        """Test that wind speed and direction are fetched with every variable by default"""
+        result = self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 1))
+
+        assert list(result.columns) == list(HOURLY_VARIABLES)
+        assert (result.wind_speed[0].value, result.wind_direction[0].value) == (12.5, 270)
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_cached_superset_is_reused(self, mock_get, forecast_cache):
+        """Test that a cached response with more variables serves a narrower request, not the other way round"""
+        self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 2), variables=['precipitation'])
+        self.get_hourly_weather_data(from_date=date(2025, 7, 1), to_date=date(2025, 7, 2))
+        result = self.get_hourly_weather_data(
+            from_date=date(2025, 7, 2), to_date=date(2025, 7, 2), variables=['wind_speed', 'temperature'])
+
+        assert mock_get.call_count == 2
+        assert list(result.columns) == ['temperature', 'wind_speed']
+        assert len(result) == 24
+
+    def test_unknown_variable(self):
+        """Test that an unknown variable is rejected before any request"""
+        with pytest.raises(ValueError, match="Unknown hourly variables \\['uv_index'\\]"):
+            upstream_variables(['temperature', 'uv_index'])
+
+    def test_tool_spec_lists_the_variables(self):
+        """Test that the model sees the variables it can ask for"""
+        spec = json.dumps(self.get_hourly_weather_data.tool_spec)
+
+        assert all(f'"{variable}"' in spec for variable in HOURLY_VARIABLES)
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_batch_variables(self, mock_get):
+        """Test that the batch tool pushes the variables down too"""
+        get_batch = Tools(latitude=0.0, longitude=0.0).get_tools()[1]
+        locations = [Location(latitude=1.0, longitude=-1.0, name='a'), Location(latitude=2.0, longitude=-1.0, name='b')]
+
+        result = get_batch(locations=locations, from_date=date(2025, 7, 1), to_date=date(2025, 7, 1),
+                           variables=['wind_speed'], encoding='csv')
+
+        assert parse_qs(urlparse(mock_get.call_args.args[0]).query)['hourly'] == ['wind_speed_10m']
+        header, first, *_ = str(result).splitlines()
+        assert header == 'name,latitude,longitude,time,wind_speed'
+        assert first == 'a,1.0,-1.0,2025-07-01T00:00,12.5'
+
+
+class TestGetHourlyWeatherDataAsync:
+    """Test cases for the async weather data path"""
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_async_matches_sync(self, mock_get, forecast_cache):
+        """Test that the async path returns the same data as the sync one"""
+        result = asyncio.run(get_hourly_weather_data_tool_async(
+            latitude=43.32, longitude=-1.98, from_date=date(2025, 7, 1), to_date=date(2025, 7, 2)))
+
+        mock_get.assert_awaited_once()
+        assert requested_range(mock_get.call_args) == ('2025-07-01', '2025-07-02')
+        forecast_cache.clear()
+        with patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo):
+            expected = get_hourly_weather_data_tool(
+                latitude=43.32, longitude=-1.98, from_date=date(2025, 7, 1), to_date=date(2025, 7, 2))
+        assert result == expected
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_async_fetches_gaps_concurrently(self, mock_get, forecast_cache):
+        """Test that every missing range is fetched and stored"""
+        with patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo):
+            get_hourly_weather_data_tool(latitude=43.32, longitude=-1.98,
+                                         from_date=date(2025, 7, 3), to_date=date(2025, 7, 3))
+
+        result = asyncio.run(get_hourly_weather_data_tool_async(
+            latitude=43.32, longitude=-1.98, from_date=date(2025, 7, 1), to_date=date(2025, 7, 5)))
+
+        assert sorted(requested_range(call) for call in mock_get.call_args_list) == [
+            ('2025-07-01', '2025-07-02'), ('2025-07-04', '2025-07-05')]
+        assert len(result) == 5 * 24
+        assert forecast_cache.stats()['entries'] == 3
+
+
+class TestRequestCoalescing:
+    """Test cases for coalescing identical in-flight requests"""
+
+    def test_threads_share_one_fetch(self):
+        """Test that concurrent identical calls from threads hit the API once"""
+        def slow_open_meteo(url):
+            time.sleep(0.2)
+            return fake_open_meteo(url)
+
+        coalesced = weather_flight.coalesced
+        results = []
+        with patch('modules.weather.client.OpenMeteoClient.get', side_effect=slow_open_meteo) as mock_get:
+            threads = [threading.Thread(target=lambda: results.append(get_hourly_weather_data_tool(
+                latitude=43.32, longitude=-1.98, from_date=date(2025, 7, 1), to_date=date(2025, 7, 2))))
+                for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_get.assert_called_once()
+        assert all(result is results[0] for result in results)
+        assert weather_flight.coalesced - coalesced == 3
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_coroutines_share_one_fetch(self, mock_get):
+        """Test that concurrent identical calls from coroutines hit the API once"""
+        async def run():
+            return await asyncio.gather(*(get_hourly_weather_data_tool_async(
+                latitude=43.32, longitude=-1.98, from_date=date(2025, 7, 1), to_date=date(2025, 7, 2))
+                for _ in range(4)))
+
+        coalesced = async_weather_flight.coalesced
+        results = asyncio.run(run())
+
+        mock_get.assert_awaited_once()
+        assert all(result is results[0] for result in results)
+        assert async_weather_flight.coalesced - coalesced == 3
+
+
+class TestBatchWeatherData:
+    """Test cases for multi-location batch fetches"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.locations = [Location(latitude=float(i), longitude=-1.0, name=f"site-{i}") for i in range(5)]
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_locations_are_packed_into_one_request(self, mock_get):
+        """Test that all coordinates are sent comma-separated in one request"""
+        result = get_hourly_weather_data_batch_tool(self.locations, date(2025, 7, 1), date(2025, 7, 1))
+
+        mock_get.assert_called_once()
+        params = parse_qs(urlparse(mock_get.call_args.args[0]).query)
+        assert params['latitude'] == ['0.0,1.0,2.0,3.0,4.0']
+        assert params['longitude'] == ['-1.0,-1.0,-1.0,-1.0,-1.0']
+        assert list(result) == self.locations
+        assert [result[location].temperature[0].value for location in self.locations] == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+    @patch('modules.weather.tools.WEATHER_BATCH_SIZE', 2)
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_locations_are_chunked(self, mock_get):
+        """Test that batches larger than WEATHER_BATCH_SIZE are split"""
+        result = get_hourly_weather_data_batch_tool(self.locations, date(2025, 7, 1), date(2025, 7, 1))
+
+        assert [parse_qs(urlparse(call.args[0]).query)['latitude'][0] for call in mock_get.call_args_list] == [
+            '0.0,1.0', '2.0,3.0', '4.0']
+        assert result[self.locations[4]].temperature[0].value == 104.0
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_cached_locations_are_not_fetched(self, mock_get):
+        """Test that only locations missing from the cache are requested"""
+        get_hourly_weather_data_tool(latitude=1.0, longitude=-1.0, from_date=date(2025, 7, 1), to_date=date(2025, 7, 1))
+
+        result = get_hourly_weather_data_batch_tool(self.locations[:3], date(2025, 7, 1), date(2025, 7, 1))
+
+        assert parse_qs(urlparse(mock_get.call_args.args[0]).query)['latitude'] == ['0.0,2.0']
+        assert result[self.locations[1]].temperature[0].value == 101.0
+
+    @patch('modules.weather.client.OpenMeteoClient.get', side_effect=fake_open_meteo)
+    def test_batch_tool_serializes_per_location(self, mock_get):
+        """Test that the Strands batch tool returns data keyed by location"""
+        get_batch = Tools(latitude=0.0, longitude=0.0).get_tools()[1]
+
+        result = get_batch(locations=self.locations[:2], from_date=date(2025, 7, 1), to_date=date(2025, 7, 1))
+
+        assert isinstance(result, MeteoDataBatch)
+        assert [item.location.name for item in result.items] == ['site-0', 'site-1']
+        assert '"location":{"latitude":0.0,"longitude":-1.0,"name":"site-0"}' in str(result)
@@ -0,0 +1,186 @@
+"""Unit tests for the FastMCP weather server"""
+import asyncio
+import json
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastmcp import Client
+
+import mcp_server
+from modules.weather.detection import DEFAULT_THRESHOLDS
+from modules.weather.response_cache import ResponseCache
+from tests.helpers import fake_open_meteo
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    """Give every test an empty response cache"""
+    cache = ResponseCache()
+    monkeypatch.setattr(mcp_server, 'response_cache', cache)
+    return cache
+
+
+async def call_weather(*ranges: tuple[date, date], encoding: str = 'json') -> list:
+    async with Client(mcp_server.mcp) as client:
+        return [
+            await client.call_tool('get_hourly_weather_data', {'from_date': start, 'to_date': end, 'encoding': encoding})
+            for start, end in ranges
+        ]
+
+
+class TestGetHourlyWeatherData:
+    """Test cases for the get_hourly_weather_data MCP tool"""
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_identical_calls_hit_the_response_cache(self, mock_get, response_cache):
+        """Test that a repeated range is served from the serialized response"""
+        first, second = asyncio.run(call_weather(
+            (date(2025, 7, 1), date(2025, 7, 2)), (date(2025, 7, 1), date(2025, 7, 2))))
+
+        mock_get.assert_awaited_once()
+        assert first.content[0].text == second.content[0].text
+        assert first.meta['etag'] == second.meta['etag']
+        assert len(json.loads(first.content[0].text)['temperature']) == 48
+        assert response_cache.stats()['hits'] == 1
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_past_ranges_do_not_expire(self, mock_get, response_cache):
+        """Test that a range in the past is stored without expiry"""
+        asyncio.run(call_weather((date(2025, 7, 1), date(2025, 7, 2))))
+
+        key = ('get_hourly_weather_data', mcp_server.MY_LATITUDE, mcp_server.MY_LONGITUDE,
+               date(2025, 7, 1), date(2025, 7, 2), 'json', ('variables', None))
+        assert response_cache.get(key).expires_at is None
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_encodings(self, mock_get, response_cache):
+        """Test that every encoding carries the same readings and is cached on its own"""
+        async def run():
+            return [(await call_weather((date(2025, 7, 1), date(2025, 7, 1)), encoding=encoding))[0].content[0].text
+                    for encoding in ('json', 'columns', 'csv')]
+
+        as_json, as_columns, as_csv = asyncio.run(run())
+
+        mock_get.assert_awaited_once()
+        temperatures = [reading['value'] for reading in json.loads(as_json)['temperature']]
+        assert json.loads(as_columns)['temperature'] == temperatures
+        assert [float(row.split(',')[1]) for row in as_csv.splitlines()[1:]] == temperatures
+        assert response_cache.stats()['entries'] == 3
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_concurrent_misses_serialize_once(self, mock_get, response_cache):
+        """Test that concurrent identical calls share one fetch and one serialization"""
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                return await asyncio.gather(*(
+                    client.call_tool('get_hourly_weather_data', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 1)})
+                    for _ in range(5)))
+
+        with patch.object(response_cache, 'put', wraps=response_cache.put) as put:
+            results = asyncio.run(run())
+
+        put.assert_called_once()
+        assert len({result.content[0].text for result in results}) == 1
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_variables(self, mock_get, response_cache):
+        """Test that only the requested variables are fetched and returned, in any order"""
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                return [await client.call_tool('get_hourly_weather_data', {
+                    'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 1), 'variables': variables, 'encoding': 'csv'})
+                    for variables in (['wind_direction', 'wind_speed'], ['wind_speed', 'wind_direction'])]
+
+        first, second = asyncio.run(run())
+
+        mock_get.assert_awaited_once()
+        assert 'hourly=wind_speed_10m,wind_direction_10m&' in mock_get.call_args.args[0]
+        assert first.content[0].text.splitlines()[0] == 'time,wind_speed,wind_direction'
+        assert second.content[0].text == first.content[0].text
+        assert response_cache.stats()['hits'] == 1
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_not_modified(self, mock_get, response_cache):
+        """Test that sending back the etag of an unchanged response returns a short note instead of the body"""
+        arguments = {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 1)}
+
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                first = await client.call_tool('get_hourly_weather_data', arguments)
+                unchanged = await client.call_tool(
+                    'get_hourly_weather_data', {**arguments, 'if_none_match': first.meta['etag']})
+                stale = await client.call_tool('get_hourly_weather_data', {**arguments, 'if_none_match': 'old'})
+                return first, unchanged, stale
+
+        first, unchanged, stale = asyncio.run(run())
+
+        assert unchanged.meta == {'etag': first.meta['etag'], 'not_modified': True}
+        assert unchanged.content[0].text.startswith('Not modified')
+        assert stale.content[0].text == first.content[0].text
+        assert 'not_modified' not in stale.meta
+
+
+class TestGetDailyWeatherSummary:
+    """Test cases for the get_daily_weather_summary MCP tool"""
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_daily_summary(self, mock_get):
+        """Test that the summary has one entry per day and is cached apart from the hourly data"""
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                summary = await client.call_tool(
+                    'get_daily_weather_summary', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 3), 'encoding': 'json'})
+                hourly = await client.call_tool(
+                    'get_hourly_weather_data', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 3), 'encoding': 'json'})
+                return summary, hourly
+
+        summary, hourly = asyncio.run(run())
+
+        mock_get.assert_awaited_once()
+        days = json.loads(summary.content[0].text)['days']
+        assert [day['day'] for day in days] == ['2025-07-01', '2025-07-02', '2025-07-03']
+        assert len(summary.content[0].text) * 10 < len(hourly.content[0].text)
+
+
+class TestGetExtremeWeather:
+    """Test cases for the get_extreme_weather MCP tool"""
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_extreme_weather(self, mock_get):
+        """Test that the report carries the thresholds used for the detection"""
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                return await client.call_tool(
+                    'get_extreme_weather', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 3), 'encoding': 'json'})
+
+        report = json.loads(asyncio.run(run()).content[0].text)
+
+        mock_get.assert_awaited_once()
+        assert set(report) == {'thresholds', 'episodes'}
+        assert report['thresholds']['heat_wave_min_days'] == DEFAULT_THRESHOLDS.heat_wave_min_days
+
+
+class TestWeatherStats:
+    """Test cases for the weather://stats MCP resource"""
+
+    @patch('modules.weather.client.AsyncOpenMeteoClient.get', new_callable=AsyncMock, side_effect=fake_open_meteo)
+    def test_stats_resource(self, mock_get):
+        """Test that cache statistics are readable as a resource"""
+        async def run():
+            async with Client(mcp_server.mcp) as client:
+                await client.call_tool('get_hourly_weather_data', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 1)})
+                await client.call_tool('get_hourly_weather_data', {'from_date': date(2025, 7, 1), 'to_date': date(2025, 7, 1)})
+                return await client.read_resource('weather://stats')
+
+        stats = json.loads(asyncio.run(run())[0].text)
+
+        assert stats['responses']['hits'] == 1
+        assert stats['responses']['misses'] == 1
+        assert stats['responses']['entries'] == 1
+        assert stats['forecasts']['entries'] == 1
+        assert set(stats['open_meteo']) == {'requests', 'errors', 'p50_ms', 'p99_ms', 'max_ms'}
+        assert set(stats['single_flight']) == {'responses', 'forecasts', 'forecasts_sync'}
+        assert stats['single_flight']['responses']['executions'] >= 1
+        assert stats['single_flight']['forecasts']['in_flight'] == 0
+        assert set(stats['single_flight']['forecasts_sync']) == {'executions', 'coalesced', 'in_flight'}